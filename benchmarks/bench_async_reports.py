@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent report requests through the sync and async controllers.
+
+Usage:
+    python -m benchmarks.bench_async_reports --concurrency 1 10 100
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from myapp.db.config import PROFILES
+from myapp.db.database import create_engine_from_config
+from myapp.db.async_database import create_async_engine_from_config
+from myapp.db.migrations import upgrade_schema
+from myapp.models.user import User
+from myapp.models.food_entry import FoodEntry
+from myapp.models.goal import Goal
+from myapp.controllers.report_controller import generate_user_report
+from myapp.controllers.aio.report_controller import generate_user_report as generate_user_report_async
+from myapp.controllers.food_controller import get_food_id
+
+START_DATE = date(2024, 1, 1)
+END_DATE = date(2024, 12, 31)
+
+
+def populate(engine, users: int, entries_per_day: int) -> list[int]:
+    session = sessionmaker(bind=engine)()
+    session.execute(insert(User), [{"name": f"user_{i}"} for i in range(users)])
+    user_ids = list(session.scalars(User.__table__.select().with_only_columns(User.id)))
+    session.execute(insert(Goal), [{"user_id": user_id, "daily": 2000, "weekly": 14000} for user_id in user_ids])
+    for user_id in user_ids:
+        session.execute(insert(FoodEntry), [
+            {"user_id": user_id, "food_id": get_food_id(session, f"Food {n}"), "calories": 100 + n * 50, "date": START_DATE + timedelta(days=day)}
+            for day in range(366)
+            for n in range(entries_per_day)
+        ])
+    session.commit()
+    session.close()
+    return user_ids
+
+
+def run_sync_sequential(factory, user_ids):
+    for user_id in user_ids:
+        with factory() as db:
+            generate_user_report(db, user_id, START_DATE, END_DATE)
+
+
+def run_sync_threads(factory, user_ids):
+    def one(user_id):
+        with factory() as db:
+            return generate_user_report(db, user_id, START_DATE, END_DATE)
+
+    with ThreadPoolExecutor(max_workers=len(user_ids)) as pool:
+        list(pool.map(one, user_ids))
+
+
+async def run_async(factory, user_ids):
+    async def one(user_id):
+        async with factory() as db:
+            return await generate_user_report_async(db, user_id, START_DATE, END_DATE)
+
+    await asyncio.gather(*(one(user_id) for user_id in user_ids))
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--entries-per-day", type=int, default=3)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "bench.db")
+    config = replace(PROFILES["prod"], url=f"sqlite:///{db_path}", pool_size=max(args.concurrency), max_overflow=0)
+    engine = create_engine_from_config(config)
+    async_engine = create_async_engine_from_config(config)
+    try:
+        upgrade_schema(engine)
+        user_ids = populate(engine, max(args.concurrency), args.entries_per_day)
+        sync_factory = sessionmaker(bind=engine)
+        async_factory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+        print(f"{'requests':>8} {'sync seq (s)':>13} {'sync threads (s)':>17} {'async (s)':>10}")
+        for concurrency in args.concurrency:
+            ids = user_ids[:concurrency]
+            sequential = timed(lambda: run_sync_sequential(sync_factory, ids))
+            threaded = timed(lambda: run_sync_threads(sync_factory, ids))
+            concurrent = timed(lambda: asyncio.run(run_async(async_factory, ids)))
+            print(f"{concurrency:>8} {sequential:>13.4f} {threaded:>17.4f} {concurrent:>10.4f}")
+    finally:
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+        for name in os.listdir(tmp_dir):
+            os.unlink(os.path.join(tmp_dir, name))
+        os.rmdir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
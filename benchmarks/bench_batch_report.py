@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark reports for every user: per-user loop vs. batch queries vs. worker processes.
+
+Usage:
+    python -m benchmarks.bench_batch_report --users 10000 --days 30 --workers 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from myapp.db.database import Base
+import myapp.models.meal_plan
+from myapp.models.food_entry import FoodEntry
+from myapp.models.goal import Goal
+from myapp.models.user import User
+from myapp.controllers.report_controller import generate_user_report, generate_user_reports
+from myapp.controllers.batch_report_controller import generate_user_reports_parallel
+from myapp.controllers.food_controller import get_food_id
+
+START_DATE = date(2024, 1, 1)
+ENTRIES_PER_DAY = 3
+
+
+def populate(session, users: int, days: int) -> None:
+    """Insert `users` users, each with a goal and three entries a day."""
+    session.execute(insert(User), [{"name": f"user_{i}"} for i in range(users)])
+    user_ids = list(session.scalars(User.__table__.select().with_only_columns(User.id)))
+    session.execute(insert(Goal), [{"user_id": user_id, "daily": 2000, "weekly": 14000} for user_id in user_ids])
+
+    batch = []
+    for user_id in user_ids:
+        for day in range(days):
+            for meal in range(ENTRIES_PER_DAY):
+                batch.append({
+                    "user_id": user_id,
+                    "food_id": get_food_id(session, f"Food {meal}"),
+                    "calories": 200 + (user_id * 37 + day * 11 + meal) % 600,
+                    "date": START_DATE + timedelta(days=day),
+                })
+        if len(batch) >= 10000:
+            session.execute(insert(FoodEntry), batch)
+            batch.clear()
+    if batch:
+        session.execute(insert(FoodEntry), batch)
+    session.commit()
+
+
+def timed(label: str, reports, baseline: float | None = None) -> float:
+    started = time.perf_counter()
+    count = sum(1 for _ in reports)
+    elapsed = time.perf_counter() - started
+    speedup = f"{baseline / elapsed:>7.1f}x" if baseline else ""
+    print(f"{label:<22} {count:>8} {elapsed:>9.2f} {speedup}")
+    return elapsed
+
+
+def run(users: int, days: int, workers: list[int], chunk_size: int) -> None:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    engine = create_engine(f"sqlite:///{db_path}", echo=False)
+    try:
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        populate(session, users, days)
+        start, end = START_DATE, START_DATE + timedelta(days=days - 1)
+        user_ids = list(session.scalars(User.__table__.select().with_only_columns(User.id)))
+
+        print(f"{users} users x {days} days x {ENTRIES_PER_DAY} entries")
+        print(f"{'mode':<22} {'reports':>8} {'time (s)':>9} {'speedup':>8}")
+        baseline = timed("per-user loop", (generate_user_report(session, user_id, start, end) for user_id in user_ids))
+        timed("batch, in-process", generate_user_reports(session, start, end, chunk_size=chunk_size), baseline)
+        for count in workers:
+            timed(f"batch, {count} workers", generate_user_reports_parallel(session, start, end, count, chunk_size=chunk_size), baseline)
+        session.close()
+    finally:
+        engine.dispose()
+        os.close(db_fd)
+        os.unlink(db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.users, args.days, args.workers, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
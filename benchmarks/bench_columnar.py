@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the columnar food entry snapshot: load time, memory per row and group-by speed.
+
+Usage:
+    python -m benchmarks.bench_columnar --users 500 --days 365 --group-rows 10000000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from myapp.analytics.columnar import FoodEntryColumns, load_food_entries, np
+from myapp.models.food_entry import FoodEntry
+from benchmarks.datagen import Dataset, create_database
+
+ORM_SAMPLE = 50_000
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def orm_bytes_per_row(db) -> float:
+    db.expunge_all()
+    tracemalloc.start()
+    entries = list(db.scalars(select(FoodEntry).limit(ORM_SAMPLE)))
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / len(entries)
+
+
+def synthetic(rows: int, seed: int) -> FoodEntryColumns:
+    # Shaped like real data: 10k users, 500 foods, three years of days
+    rng = np.random.default_rng(seed)
+    return FoodEntryColumns(
+        user_id=rng.integers(1, 10_001, rows, dtype=np.int32),
+        food_id=rng.integers(1, 501, rows, dtype=np.int32),
+        calories=rng.integers(50, 1200, rows, dtype=np.int32),
+        day=rng.integers(738_886, 738_886 + 3 * 365, rows, dtype=np.int32),
+    )
+
+
+def run(dataset: Dataset, group_rows: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, _ = create_database(os.path.join(tmp_dir, "columnar.db"), dataset)
+        with sessionmaker(bind=engine)() as db:
+            columns, load_time = timed(lambda: load_food_entries(db))
+            print(f"loaded {len(columns)} rows in {load_time:.2f}s ({len(columns) / load_time:,.0f} rows/s), "
+                  f"{'numpy' if columns.vectorised else 'array'} columns")
+            print(f"bytes per row: columnar {columns.nbytes / len(columns):.0f}, ORM {orm_bytes_per_row(db):.0f}")
+        engine.dispose()
+
+    if np is None:
+        print("NumPy is not installed; skipping the group-by timings")
+        return
+    columns = synthetic(group_rows, dataset.seed)
+    cases = [
+        ("group_by user_id", lambda: columns.group_by("user_id")),
+        ("group_by food_id", lambda: columns.group_by("food_id")),
+        ("group_by weekday", lambda: columns.group_by("weekday")),
+        ("group_by user_id, food_id", lambda: columns.group_by("user_id", "food_id")),
+        ("group_by user_id, day", lambda: columns.group_by("user_id", "day")),
+        ("top 10 of user_id, food_id", lambda: columns.group_by("user_id", "food_id").top(10)),
+        ("histogram 100", lambda: columns.histogram(100)),
+        ("weekday_averages", lambda: columns.weekday_averages()),
+        ("where user_id", lambda: columns.where(user_id=42)),
+    ]
+    print(f"{group_rows:,} synthetic rows")
+    print(f"{'case':<30} {'best ms':>9}")
+    for name, case in cases:
+        best = min(timed(case)[1] for _ in range(repeat))
+        print(f"{name:<30} {best * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--entries-per-day", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--group-rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(Dataset(args.users, args.days, args.entries_per_day, args.seed), args.group_rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark sequential add-food calls through the cold CLI and the warm daemon.
+
+Usage:
+    python -m benchmarks.bench_daemon --calls 1000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from myapp.cli.client import DaemonClient
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADD_FOOD = ["food", "add-food", "1", "Apple", "95", "--date", "2024-01-01"]
+
+
+def wait_for_socket(path: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"daemon did not create {path}")
+        time.sleep(0.05)
+
+
+def timed_calls(calls: int, call) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - started) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--cold-calls", type=int, default=None, help="Cold CLI calls (default: --calls)")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    socket_path = os.path.join(tmp_dir, "daemon.sock")
+    env = dict(
+        os.environ,
+        HEALTH_TRACKER_DATABASE_URL=f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+        HEALTH_TRACKER_SOCKET=socket_path,
+    )
+
+    def cli(*argv):
+        return subprocess.run([sys.executable, "-m", *argv], cwd=PROJECT_DIR, env=env, capture_output=True, check=True)
+
+    cli("myapp.cli", "db", "upgrade")
+    cli("myapp.cli", "user", "add-user", "bench_user")
+
+    cold = timed_calls(args.cold_calls or args.calls, lambda: cli("myapp.cli", *ADD_FOOD))
+
+    daemon = subprocess.Popen([sys.executable, "-m", "myapp.cli", "serve"], cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_socket(socket_path)
+        thin = timed_calls(args.calls, lambda: cli("myapp.cli.client", *ADD_FOOD))
+        with DaemonClient(socket_path) as client:
+            warm = timed_calls(args.calls, lambda: client.run(ADD_FOOD))
+    finally:
+        daemon.terminate()
+        daemon.wait()
+        for name in os.listdir(tmp_dir):
+            os.unlink(os.path.join(tmp_dir, name))
+        os.rmdir(tmp_dir)
+
+    print(f"{'path':<28} {'ms/call':>8}")
+    print(f"{'cold CLI process':<28} {cold * 1000:>8.2f}")
+    print(f"{'thin client process':<28} {thin * 1000:>8.2f}")
+    print(f"{'warm daemon connection':<28} {warm * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
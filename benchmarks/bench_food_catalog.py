@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark the foods catalog: file size and per-food aggregation, free-text names vs. food_id.
+
+Usage:
+    python -m benchmarks.bench_food_catalog --sizes 100000 1000000
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+
+from myapp.db.migrations import upgrade_schema
+from benchmarks.datagen import MEALS
+
+FOODS = [food for meal in MEALS for food, _, _ in meal]
+# Free-text names as typed, including case and spacing variants
+SPELLINGS = [spelling for food in FOODS for spelling in (food, food.lower(), food.upper(), f" {food}")]
+
+LEGACY_SCHEMA = [
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL UNIQUE)",
+    "CREATE TABLE food_entries (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES users(id), "
+    "food VARCHAR NOT NULL, calories INTEGER NOT NULL, date DATE NOT NULL)",
+    "CREATE INDEX ix_food_entries_user_id_date ON food_entries (user_id, date)",
+    "CREATE INDEX ix_food_entries_user_id_id ON food_entries (user_id, id)",
+]
+
+LEGACY_QUERY = "SELECT food, COUNT(*), SUM(calories) FROM food_entries GROUP BY food"
+CATALOG_QUERY = (
+    "SELECT f.name, t.entries, t.calories FROM "
+    "(SELECT food_id, COUNT(*) AS entries, SUM(calories) AS calories FROM food_entries GROUP BY food_id) t "
+    "JOIN foods f ON f.id = t.food_id"
+)
+
+
+def build_legacy(path: str, rows: int) -> None:
+    rng = random.Random(rows)
+    conn = sqlite3.connect(path)
+    for statement in LEGACY_SCHEMA:
+        conn.execute(statement)
+    conn.executemany("INSERT INTO users (id, name) VALUES (?, ?)", [(i, f"user_{i}") for i in range(1, 101)])
+    start = date(2020, 1, 1)
+    conn.executemany(
+        "INSERT INTO food_entries (user_id, food, calories, date) VALUES (?, ?, ?, ?)",
+        (
+            (1 + i % 100, rng.choice(SPELLINGS), rng.randint(50, 900), (start + timedelta(days=i // 400)).isoformat())
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def vacuumed_size(path: str) -> float:
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM")
+    conn.close()
+    return os.path.getsize(path) / (1024 * 1024)
+
+
+def best_time(path: str, query: str, repeat: int) -> float:
+    conn = sqlite3.connect(path)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(query).fetchall()
+        best = min(best, time.perf_counter() - started)
+    conn.close()
+    return best
+
+
+def run(sizes: list[int], repeat: int) -> None:
+    print(f"{'rows':>9} {'text MiB':>9} {'catalog MiB':>12} {'migrate (s)':>12} {'group text (s)':>15} {'group id (s)':>13} {'speedup':>8}")
+    for rows in sizes:
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            legacy = os.path.join(tmp_dir, "legacy.db")
+            catalog = os.path.join(tmp_dir, "catalog.db")
+            build_legacy(legacy, rows)
+            shutil.copy(legacy, catalog)
+
+            engine = create_engine(f"sqlite:///{catalog}")
+            started = time.perf_counter()
+            upgrade_schema(engine)
+            migrate_time = time.perf_counter() - started
+            engine.dispose()
+            # Compare the entries alone: the upgrade also adds the daily rollup
+            conn = sqlite3.connect(catalog)
+            conn.execute("DROP TABLE daily_totals")
+            conn.commit()
+            conn.close()
+
+            legacy_size, catalog_size = vacuumed_size(legacy), vacuumed_size(catalog)
+            legacy_time = best_time(legacy, LEGACY_QUERY, repeat)
+            catalog_time = best_time(catalog, CATALOG_QUERY, repeat)
+            print(f"{rows:>9} {legacy_size:>9.1f} {catalog_size:>12.1f} {migrate_time:>12.2f} "
+                  f"{legacy_time:>15.4f} {catalog_time:>13.4f} {legacy_time / catalog_time:>7.1f}x")
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark `food search`: FTS5 over the foods catalog on a large food_entries table.
+
+Usage:
+    python -m benchmarks.bench_food_search --users 1000 --days 730 --entries-per-day 4
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from myapp.controllers.food_controller import get_food_id, search_foods
+from myapp.controllers.food_entry_controller import FoodEntryFilter, search_food_entries
+from myapp.models.food import Food
+from benchmarks.datagen import Dataset, create_database
+
+# Extra catalog rows so the index has more than the generator's 24 foods to search
+CATALOG_SIZE = 20_000
+WORDS = ["Roasted", "Spicy", "Baked", "Fresh", "Smoked", "Grilled", "Sweet", "Organic", "Vegan", "Classic"]
+BASES = ["Tofu", "Lamb", "Quinoa", "Mushroom", "Cheese", "Noodles", "Falafel", "Pepper", "Peach", "Tuna"]
+
+
+def catalog_rows(count: int):
+    for i in range(count):
+        name = f"{WORDS[i % len(WORDS)]} {BASES[i // len(WORDS) % len(BASES)]} {i}"
+        yield {"name": name, "normalized_name": name.casefold(), "default_calories": 100 + i % 500}
+
+
+def best_time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(dataset: Dataset, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "search.db")
+        started = time.perf_counter()
+        engine, user_ids = create_database(path, dataset)
+        with sessionmaker(bind=engine)() as db:
+            db.execute(insert(Food), list(catalog_rows(CATALOG_SIZE)))
+            db.commit()
+        print(f"{dataset.entries} food entries, {CATALOG_SIZE + 24} foods, built in {time.perf_counter() - started:.1f}s")
+
+        middle = dataset.start_date + timedelta(days=dataset.days // 2)
+        cases = [
+            ("foods 'sal'", lambda db: search_foods(db, "sal")),
+            ("foods 'grilled sa'", lambda db: search_foods(db, "grilled sa")),
+            ("foods 'spicy tofu'", lambda db: search_foods(db, "spicy tofu")),
+            ("entries 'salmon'", lambda db: search_food_entries(db, "salmon")),
+            ("entries 'sal' --user-id", lambda db: search_food_entries(db, "sal", FoodEntryFilter(user_id=user_ids[-1]))),
+            ("entries 'chicken' --user-id --dates", lambda db: search_food_entries(
+                db, "chicken", FoodEntryFilter(user_id=user_ids[0], start_date=middle, end_date=middle + timedelta(days=30)))),
+            ("entries 'tofu' (no entries)", lambda db: search_food_entries(db, "tofu")),
+        ]
+        print(f"{'case':<40} {'rows':>5} {'best ms':>9}")
+        with sessionmaker(bind=engine)() as db:
+            get_food_id(db, "Oatmeal")
+            for name, case in cases:
+                rows = len(case(db))
+                print(f"{name:<40} {rows:>5} {best_time(lambda: case(db), repeat) * 1000:>9.2f}")
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--entries-per-day", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(Dataset(args.users, args.days, args.entries_per_day, args.seed), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
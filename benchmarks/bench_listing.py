@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory and time of 'food list-food-entries' with and without --stream.
+
+Usage:
+    python -m benchmarks.bench_listing --sizes 10000 100000 1000000
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from myapp.db.database import Base
+from myapp.cli.food import list_food_entries
+from benchmarks.bench_report_aggregation import populate
+
+
+class NullWriter(io.TextIOBase):
+    def write(self, text):
+        return len(text)
+
+
+def measure(session, user_id: int, stream: bool) -> tuple[float, float]:
+    """Run the list command and return (seconds, peak MiB)."""
+    session.expunge_all()
+
+    class Db:
+        def __enter__(self):
+            return session
+
+        def __exit__(self, *exc):
+            return False
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    with patch("myapp.cli.food.get_db", Db), redirect_stdout(NullWriter()):
+        list_food_entries(user_id, after_id=None, limit=None, stream=stream)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def run(sizes: list[int]) -> None:
+    print(f"{'rows':>10} {'list (s)':>9} {'list MiB':>9} {'stream (s)':>11} {'stream MiB':>11}")
+    for rows in sizes:
+        db_fd, db_path = tempfile.mkstemp(suffix=".db")
+        engine = create_engine(f"sqlite:///{db_path}", echo=False)
+        try:
+            Base.metadata.create_all(bind=engine)
+            session = sessionmaker(bind=engine)()
+            user_id, _ = populate(session, rows)
+
+            list_time, list_peak = measure(session, user_id, stream=False)
+            stream_time, stream_peak = measure(session, user_id, stream=True)
+            print(f"{rows:>10} {list_time:>9.2f} {list_peak:>9.1f} {stream_time:>11.2f} {stream_peak:>11.1f}")
+            session.close()
+        finally:
+            engine.dispose()
+            os.close(db_fd)
+            os.unlink(db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    run(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark insert and report throughput under each database profile.
+
+Usage:
+    python -m benchmarks.bench_profiles --inserts 2000 --reports 200
+"""
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+from dataclasses import replace
+from datetime import date, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from myapp.db.config import PROFILES
+from myapp.db.database import create_engine_from_config
+from myapp.db.migrations import upgrade_schema
+from myapp.controllers.user_controller import create_user
+from myapp.controllers.food_entry_controller import create_food_entry
+from myapp.controllers.report_controller import generate_user_report
+
+START_DATE = date(2024, 1, 1)
+
+
+def bench_profile(name: str, inserts: int, reports: int) -> tuple[float, float]:
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, f"{name}.db")
+    engine = create_engine_from_config(replace(PROFILES[name], url=f"sqlite:///{db_path}"))
+    try:
+        upgrade_schema(engine)
+        session = sessionmaker(bind=engine, autoflush=False)()
+        user = create_user(session, f"bench_{name}")
+
+        started = time.perf_counter()
+        for i in range(inserts):
+            create_food_entry(session, user.id, f"Food {i % 50}", 100 + i % 700, START_DATE + timedelta(days=i % 365))
+        insert_rate = inserts / (time.perf_counter() - started)
+
+        end_date = START_DATE + timedelta(days=364)
+        started = time.perf_counter()
+        for _ in range(reports):
+            generate_user_report(session, user.id, START_DATE, end_date)
+        report_rate = reports / (time.perf_counter() - started)
+
+        session.close()
+        return insert_rate, report_rate
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+        os.rmdir(tmp_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--inserts", type=int, default=2000)
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES))
+    args = parser.parse_args()
+
+    results = {}
+    # Echoed SQL goes to /dev/null so the cost of logging is measured without
+    # flooding the terminal.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name in args.profiles:
+            results[name] = bench_profile(name, args.inserts, args.reports)
+
+    print(f"{'profile':>8} {'inserts/s':>10} {'reports/s':>10}")
+    for name, (insert_rate, report_rate) in results.items():
+        print(f"{name:>8} {insert_rate:>10.0f} {report_rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
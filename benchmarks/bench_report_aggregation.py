@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark generate_user_report over the rollup, SQL aggregation and the ORM fallback.
+
+Usage:
+    python -m benchmarks.bench_report_aggregation --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from myapp.db.database import Base
+import myapp.models.user
+import myapp.models.goal
+import myapp.models.meal_plan
+from myapp.models.food_entry import FoodEntry
+from myapp.models.user import User
+from myapp.controllers.report_controller import generate_user_report
+from myapp.controllers.food_controller import get_food_id
+
+START_DATE = date(2020, 1, 1)
+ENTRIES_PER_DAY = 5
+
+
+def populate(session, rows: int) -> tuple[int, date]:
+    """Insert `rows` food entries for a single user, five per day."""
+    user = User(name="bench_user")
+    session.add(user)
+    session.commit()
+
+    batch = []
+    for i in range(rows):
+        batch.append({
+            "user_id": user.id,
+            "food_id": get_food_id(session, f"Food {i % 50}"),
+            "calories": 100 + (i * 37) % 700,
+            "date": START_DATE + timedelta(days=i // ENTRIES_PER_DAY),
+        })
+        if len(batch) == 10000:
+            session.execute(insert(FoodEntry), batch)
+            batch.clear()
+    if batch:
+        session.execute(insert(FoodEntry), batch)
+    session.commit()
+
+    return user.id, START_DATE + timedelta(days=(rows - 1) // ENTRIES_PER_DAY)
+
+
+def time_report(session, user_id: int, end_date: date, source: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        session.expunge_all()
+        started = time.perf_counter()
+        generate_user_report(session, user_id, START_DATE, end_date, source=source)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(sizes: list[int], repeat: int) -> None:
+    print(f"{'rows':>10} {'rollup (s)':>11} {'sql (s)':>10} {'orm (s)':>10} {'speedup':>8}")
+    for rows in sizes:
+        db_fd, db_path = tempfile.mkstemp(suffix=".db")
+        engine = create_engine(f"sqlite:///{db_path}", echo=False)
+        try:
+            Base.metadata.create_all(bind=engine)
+            session = sessionmaker(bind=engine)()
+            user_id, end_date = populate(session, rows)
+
+            rollup_time = time_report(session, user_id, end_date, "rollup", repeat)
+            sql_time = time_report(session, user_id, end_date, "entries", repeat)
+            orm_time = time_report(session, user_id, end_date, "orm", repeat)
+            print(f"{rows:>10} {rollup_time:>11.4f} {sql_time:>10.4f} {orm_time:>10.4f} {orm_time / rollup_time:>7.1f}x")
+            session.close()
+        finally:
+            engine.dispose()
+            os.close(db_fd)
+            os.unlink(db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
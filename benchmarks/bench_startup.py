@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI startup: wall-clock time and the slowest imports per command.
+
+Usage:
+    python -m benchmarks.bench_startup --repeat 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = [
+    ["--help"],
+    ["user", "--help"],
+    ["food", "--help"],
+    ["report", "--help"],
+]
+
+
+def run_cli(args: list[str], importtime: bool = False) -> subprocess.CompletedProcess:
+    flags = ["-X", "importtime"] if importtime else []
+    return subprocess.run(
+        [sys.executable, *flags, "-m", "myapp.cli", *args],
+        cwd=PROJECT_DIR, capture_output=True, text=True,
+    )
+
+
+def wall_time(args: list[str], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run_cli(args)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def slowest_imports(args: list[str], top: int) -> list[tuple[int, str]]:
+    """Return (cumulative microseconds, module) for the top-level imports."""
+    imports = []
+    for line in run_cli(args, importtime=True).stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        # Only count imports at the top of the tree to avoid double counting
+        if not module.startswith("  "):
+            imports.append((int(cumulative), module.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    for command in COMMANDS:
+        label = " ".join(command)
+        print(f"{label}: median {wall_time(command, args.repeat) * 1000:.0f} ms")
+        for cumulative, module in slowest_imports(command, args.top):
+            print(f"    {cumulative / 1000:>8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark mixed controller operations in auto-commit mode vs. one unit of work.
+
+Usage:
+    python -m benchmarks.bench_unit_of_work --operations 10000 --profile prod
+"""
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+from dataclasses import replace
+from datetime import date, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from myapp.db.config import PROFILES
+from myapp.db.database import Base, create_engine_from_config
+from myapp.db.db import transaction
+import myapp.models.meal_plan
+from myapp.controllers.user_controller import create_user
+from myapp.controllers.food_entry_controller import create_food_entry, update_food_entry, delete_food_entry
+from myapp.controllers.goal_controller import create_goal
+
+START_DATE = date(2024, 1, 1)
+
+
+def mixed_operations(db, operations: int) -> None:
+    """Create, update and delete entries in a fixed 5:2:1:1:1 mix with some users and goals."""
+    user = create_user(db, "bench_user_0")
+    entry_ids = []
+    for i in range(operations):
+        step = i % 10
+        if step < 5:
+            entry = create_food_entry(db, user.id, f"Food {i % 50}", 100 + i % 700, START_DATE + timedelta(days=i % 365))
+            entry_ids.append(entry.id)
+        elif step < 7:
+            update_food_entry(db, entry_ids[-1], calories=200 + i % 500)
+        elif step == 7:
+            delete_food_entry(db, entry_ids.pop())
+        elif step == 8:
+            create_goal(db, user.id, 2000, 14000)
+        else:
+            user = create_user(db, f"bench_user_{i}")
+
+
+def run(operations: int, profile: str) -> None:
+    print(f"{operations} mixed operations, '{profile}' profile")
+    print(f"{'mode':<15} {'time (s)':>9} {'ops/s':>9}")
+    timings = {}
+    for mode in ("auto-commit", "unit of work"):
+        db_fd, db_path = tempfile.mkstemp(suffix=".db")
+        engine = create_engine_from_config(replace(PROFILES[profile], url=f"sqlite:///{db_path}", echo=False))
+        try:
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine, autoflush=False)()
+            scope = transaction(db) if mode == "unit of work" else contextlib.nullcontext()
+            started = time.perf_counter()
+            with scope:
+                mixed_operations(db, operations)
+            timings[mode] = time.perf_counter() - started
+            print(f"{mode:<15} {timings[mode]:>9.2f} {operations / timings[mode]:>9.0f}")
+            db.close()
+        finally:
+            engine.dispose()
+            os.close(db_fd)
+            for suffix in ("", "-wal", "-shm"):
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(db_path + suffix)
+    print(f"speedup: {timings['auto-commit'] / timings['unit of work']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=10_000)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="prod")
+    args = parser.parse_args()
+    run(args.operations, args.profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark deleting a user with a large history: ORM cascade vs. set-based delete vs. chunked purge.
+
+Usage:
+    python -m benchmarks.bench_user_delete --sizes 10000 50000 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from myapp.db.database import Base
+import myapp.models.goal
+import myapp.models.meal_plan
+from myapp.models.user import User
+from myapp.controllers.user_controller import delete_user, purge_user
+from benchmarks.bench_report_aggregation import populate
+
+
+def orm_cascade_delete(session, user_id: int) -> None:
+    # The previous implementation: the relationship cascade loads every child
+    session.delete(session.get(User, user_id))
+    session.commit()
+
+
+def purge(session, user_id: int) -> None:
+    for _ in purge_user(session, user_id):
+        pass
+
+
+def measure(rows: int, operation) -> tuple[float, float]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    engine = create_engine(f"sqlite:///{db_path}", echo=False)
+    try:
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        user_id, _ = populate(session, rows)
+        session.expunge_all()
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        operation(session, user_id)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        session.close()
+        return elapsed, peak / (1024 * 1024)
+    finally:
+        engine.dispose()
+        os.close(db_fd)
+        os.unlink(db_path)
+
+
+def run(sizes: list[int]) -> None:
+    operations = [("orm cascade", orm_cascade_delete), ("set-based", delete_user), ("chunked purge", purge)]
+    print(f"{'rows':>8} " + " ".join(f"{name + ' (s)':>17} {'MiB':>6}" for name, _ in operations))
+    for rows in sizes:
+        results = [measure(rows, operation) for _, operation in operations]
+        print(f"{rows:>8} " + " ".join(f"{elapsed:>17.2f} {peak:>6.1f}" for elapsed, peak in results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    args = parser.parse_args()
+    run(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
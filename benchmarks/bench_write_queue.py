@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent food entry writes: direct controller calls vs. the single-writer write queue.
+
+Usage:
+    python -m benchmarks.bench_write_queue --producers 16 --writes 500
+"""
+import argparse
+import contextlib
+import os
+import tempfile
+import threading
+import time
+from dataclasses import replace
+from datetime import date, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from myapp.controllers.food_entry_controller import create_food_entry
+from myapp.controllers.user_controller import create_user
+from myapp.controllers.write_queue import DEFAULT_MAX_BATCH, DEFAULT_MAX_DELAY_MS, WriteQueue
+from myapp.db.config import PROFILES
+from myapp.db.database import create_engine_from_config
+from myapp.db.db import run_with_retry
+from myapp.db.migrations import upgrade_schema
+
+START_DATE = date(2024, 1, 1)
+
+
+def entry_args(user_id: int, producer: int, i: int) -> tuple:
+    return user_id, f"Food {i % 50}", 100 + (producer * 31 + i) % 700, START_DATE + timedelta(days=i % 365)
+
+
+def direct(sessions, user_ids: list[int], writes: int, producer: int) -> None:
+    # Each call is its own transaction, retried if the write lock is not free
+    for i in range(writes):
+        args = entry_args(user_ids[producer], producer, i)
+        run_with_retry(lambda db: create_food_entry(db, *args).id, retries=20, session_factory=sessions)
+
+
+def queued_each(queue: WriteQueue, user_ids: list[int], writes: int, producer: int) -> None:
+    # Wait for every id before the next write, like a request handler would
+    for i in range(writes):
+        queue.create_food_entry(*entry_args(user_ids[producer], producer, i)).result()
+
+
+def queued_pipelined(queue: WriteQueue, user_ids: list[int], writes: int, producer: int) -> None:
+    futures = [queue.create_food_entry(*entry_args(user_ids[producer], producer, i)) for i in range(writes)]
+    for future in futures:
+        future.result()
+
+
+def run_producers(target, producers: int, *args) -> float:
+    errors = []
+
+    def produce(index: int):
+        try:
+            target(*args, index)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=produce, args=(i,)) for i in range(producers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+    return elapsed
+
+
+def run(producers: int, writes: int, max_batch: int, max_delay_ms: float, profile: str) -> None:
+    total = producers * writes
+    print(f"{producers} producers x {writes} food entries, '{profile}' profile")
+    print(f"{'mode':<20} {'time (s)':>9} {'writes/s':>10} {'commits':>8}")
+    timings = {}
+    for mode in ("direct", "queue (wait each)", "queue (pipelined)"):
+        db_fd, db_path = tempfile.mkstemp(suffix=".db")
+        engine = create_engine_from_config(replace(PROFILES[profile], url=f"sqlite:///{db_path}", echo=False,
+                                                   pool_size=producers, max_overflow=0))
+        try:
+            upgrade_schema(engine)
+            sessions = sessionmaker(bind=engine, autoflush=False)
+            with sessions() as db:
+                user_ids = [create_user(db, f"bench_producer_{i}").id for i in range(producers)]
+
+            if mode == "direct":
+                elapsed = run_producers(direct, producers, sessions, user_ids, writes)
+                commits = total
+            else:
+                target = queued_each if mode == "queue (wait each)" else queued_pipelined
+                with WriteQueue(sessions, max_batch=max_batch, max_delay_ms=max_delay_ms) as queue:
+                    elapsed = run_producers(target, producers, queue, user_ids, writes)
+                commits = queue.batches
+            timings[mode] = elapsed
+            print(f"{mode:<20} {elapsed:>9.2f} {total / elapsed:>10.0f} {commits:>8}")
+        finally:
+            engine.dispose()
+            os.close(db_fd)
+            for suffix in ("", "-wal", "-shm"):
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(db_path + suffix)
+    for mode in ("queue (wait each)", "queue (pipelined)"):
+        print(f"{mode} speedup: {timings['direct'] / timings[mode]:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--producers", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=500, help="Food entries per producer")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--max-delay-ms", type=float, default=DEFAULT_MAX_DELAY_MS)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="prod")
+    args = parser.parse_args()
+    run(args.producers, args.writes, args.max_batch, args.max_delay_ms, args.profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic data: N users x M days x K food entries per day, with goals and meal plans.
+
+Usage:
+    python -m benchmarks.datagen bench.db --users 100 --days 365 --entries-per-day 4 --seed 42
+"""
+import argparse
+import random
+import time
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from myapp.db.config import PROFILES
+from myapp.db.database import create_engine_from_config
+from myapp.db.migrations import upgrade_schema
+from myapp.controllers.food_controller import get_food_id
+from myapp.models.food_entry import FoodEntry
+from myapp.models.goal import Goal
+from myapp.models.meal_plan import MealPlan
+from myapp.models.user import User
+
+START_DATE = date(2024, 1, 1)
+BATCH_SIZE = 10_000
+
+# (food, lowest calories, highest calories) per meal slot; entry k of a day
+# draws from slot k % 4, so every day looks like breakfast, lunch, dinner, snack
+MEALS = [
+    [("Oatmeal", 150, 350), ("Scrambled Eggs", 180, 320), ("Greek Yogurt", 100, 220),
+     ("Avocado Toast", 250, 450), ("Pancakes", 350, 650), ("Banana", 90, 120)],
+    [("Chicken Salad", 300, 550), ("Turkey Sandwich", 350, 600), ("Lentil Soup", 200, 380),
+     ("Burrito Bowl", 550, 900), ("Sushi Roll", 250, 500), ("Caesar Salad", 300, 480)],
+    [("Grilled Salmon", 400, 650), ("Spaghetti Bolognese", 550, 850), ("Beef Stir Fry", 450, 750),
+     ("Vegetable Curry", 400, 700), ("Pizza", 600, 1100), ("Roast Chicken", 450, 700)],
+    [("Apple", 80, 110), ("Almonds", 150, 250), ("Protein Bar", 180, 280),
+     ("Dark Chocolate", 150, 300), ("Orange", 60, 90), ("Hummus and Carrots", 120, 220)],
+]
+
+PLANS = [
+    "Mediterranean week: fish twice, legumes daily",
+    "High protein: eggs, chicken, yogurt",
+    "Vegetarian: curries, salads, grain bowls",
+    "Cutting: 500 kcal deficit, no snacks after 8pm",
+    "Maintenance: three meals and one snack",
+]
+
+
+@dataclass(frozen=True)
+class Dataset:
+    users: int
+    days: int
+    entries_per_day: int
+    seed: int
+    start_date: date = START_DATE
+
+    @property
+    def end_date(self) -> date:
+        return self.start_date + timedelta(days=self.days - 1)
+
+    @property
+    def entries(self) -> int:
+        return self.users * self.days * self.entries_per_day
+
+
+def food_entry_rows(rng: random.Random, user_id: int, dataset: Dataset, food_ids: dict[str, int]):
+    for day in range(dataset.days):
+        entry_date = dataset.start_date + timedelta(days=day)
+        for k in range(dataset.entries_per_day):
+            food, low, high = rng.choice(MEALS[k % len(MEALS)])
+            yield {"user_id": user_id, "food_id": food_ids[food], "calories": rng.randint(low, high), "date": entry_date}
+
+
+def generate(db: Session, dataset: Dataset) -> list[int]:
+    """Insert the dataset and return the new user IDs.
+
+    The same dataset and seed always produce the same rows, so timings from
+    different runs (and releases) are comparable.
+    """
+    rng = random.Random(dataset.seed)
+    user_rows = [{"name": f"bench_user_{dataset.seed}_{i:06d}"} for i in range(dataset.users)]
+    user_ids = list(db.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), user_rows))
+
+    goal_rows, plan_rows = [], []
+    for user_id in user_ids:
+        daily = rng.randrange(1600, 2850, 50)
+        goal_rows.append({"user_id": user_id, "daily": daily, "weekly": daily * 7})
+        for week in range(1, min(dataset.days // 7, 4) + 1):
+            plan_rows.append({"user_id": user_id, "week": week, "plan": rng.choice(PLANS)})
+    db.execute(insert(Goal), goal_rows)
+    if plan_rows:
+        db.execute(insert(MealPlan), plan_rows)
+
+    food_ids = {
+        food: get_food_id(db, food, (low + high) // 2) for meal in MEALS for food, low, high in meal
+    }
+    batch = []
+    for user_id in user_ids:
+        for row in food_entry_rows(rng, user_id, dataset, food_ids):
+            batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                db.execute(insert(FoodEntry), batch)
+                batch.clear()
+    if batch:
+        db.execute(insert(FoodEntry), batch)
+    db.commit()
+    return user_ids
+
+
+def create_database(path: str, dataset: Dataset, profile: str = "prod"):
+    """Create a database file at `path` with the schema and the dataset."""
+    engine = create_engine_from_config(replace(PROFILES[profile], url=f"sqlite:///{path}", echo=False))
+    upgrade_schema(engine)
+    with sessionmaker(bind=engine)() as db:
+        user_ids = generate(db, dataset)
+    return engine, user_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="SQLite database file to create or extend")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--entries-per-day", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    dataset = Dataset(args.users, args.days, args.entries_per_day, args.seed)
+    started = time.perf_counter()
+    engine, _ = create_database(args.path, dataset)
+    engine.dispose()
+    print(f"Wrote {dataset.users} users and {dataset.entries} food entries to {args.path} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
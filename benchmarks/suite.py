@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Time every controller, reports over several windows and the CLI end to end; emit JSON.
+
+Usage:
+    python -m benchmarks.suite --users 50 --days 365 --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from importlib.metadata import PackageNotFoundError, version
+from itertools import count
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from myapp.controllers import food_entry_controller as food
+from myapp.controllers import goal_controller as goals
+from myapp.controllers import meal_plan_controller as meal_plans
+from myapp.controllers import user_controller as users
+from myapp.controllers.report_cache import ReportCache
+from myapp.controllers.report_controller import calorie_histogram, generate_user_report, generate_user_reports, get_cached_user_report, top_foods
+from myapp.controllers.rollup_controller import check_daily_totals, rebuild_daily_totals
+from benchmarks.datagen import Dataset, create_database
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_WINDOWS = [7, 30, 90, 365]
+
+
+@dataclass
+class Case:
+    group: str
+    name: str
+    run: Callable
+    # Untimed; its return value is passed to run, so writes get fresh rows
+    setup: Callable | None = None
+
+
+def controller_cases(db, dataset: Dataset, user_ids: list[int]) -> list[Case]:
+    user_id = user_ids[0]
+    # Writes go to a separate user, so the read benchmarks see the same rows every run
+    writer_id = users.create_user(db, "bench_writer").id
+    day = dataset.start_date
+    entry_ids = [entry.id for entry in food.get_food_entries_by_user(db, user_id, limit=100)]
+    goal_id = goals.get_goals_by_user(db, user_id)[0].id
+    plan_ids = [plan.id for plan in meal_plans.get_meal_plans_by_user(db, user_id)]
+    names = (f"bench_case_{i}" for i in count())
+    apples = food.FoodEntryFilter(user_id=user_id, food="Apple")
+
+    def new_user():
+        return users.create_user(db, next(names)).id
+
+    def new_entry():
+        return food.create_food_entry(db, writer_id, "Benchmark Snack", 100, day).id
+
+    def new_goal():
+        return goals.create_goal(db, writer_id, 2000, 14000).id
+
+    def new_plan():
+        return meal_plans.create_meal_plan(db, writer_id, 1, "Benchmark plan").id
+
+    def entry_rows(_=None):
+        return [{"user_id": writer_id, "food": "Benchmark Bulk", "calories": 100, "date": day} for _ in range(1000)]
+
+    return [
+        Case("user", "create_user", lambda _: users.create_user(db, next(names))),
+        Case("user", "get_user", lambda _: users.get_user(db, user_id)),
+        Case("user", "get_users", lambda _: users.get_users(db, user_ids[:100])),
+        Case("user", "get_user_by_name", lambda _: users.get_user_by_name(db, f"bench_user_{dataset.seed}_000000")),
+        Case("user", "get_all_users", lambda _: users.get_all_users(db, limit=1000)),
+        Case("user", "update_user", lambda new_id: users.update_user(db, new_id, next(names)), new_user),
+        Case("user", "delete_user", lambda new_id: users.delete_user(db, new_id), new_user),
+        Case("user", "count_user_food_entries", lambda _: users.count_user_food_entries(db, user_id)),
+        Case("food", "create_food_entry", lambda _: food.create_food_entry(db, writer_id, "Benchmark Snack", 100, day)),
+        Case("food", "bulk_create_food_entries_1000", lambda rows: food.bulk_create_food_entries(db, rows), entry_rows),
+        Case("food", "get_food_entry", lambda _: food.get_food_entry(db, entry_ids[0])),
+        Case("food", "get_food_entries", lambda _: food.get_food_entries(db, entry_ids)),
+        Case("food", "get_food_entries_by_user", lambda _: food.get_food_entries_by_user(db, user_id)),
+        Case("food", "get_food_entries_by_user_page", lambda _: food.get_food_entries_by_user(db, user_id, limit=50)),
+        Case("food", "iter_food_entries_by_user", lambda _: sum(1 for _ in food.iter_food_entries_by_user(db, user_id))),
+        Case("food", "update_food_entry", lambda entry_id: food.update_food_entry(db, entry_id, calories=150), new_entry),
+        Case("food", "delete_food_entry", lambda entry_id: food.delete_food_entry(db, entry_id), new_entry),
+        Case("food", "count_food_entries", lambda _: food.count_food_entries(db, apples)),
+        Case("food", "bulk_update_food_entries", lambda _: food.bulk_update_food_entries(db, apples, scale_calories=1.0)),
+        Case("food", "search_food_entries", lambda _: food.search_food_entries(db, "sal")),
+        Case("food", "search_food_entries_user", lambda _: food.search_food_entries(db, "chick", food.FoodEntryFilter(user_id=user_id))),
+        Case("goal", "create_goal", lambda _: goals.create_goal(db, writer_id, 2000, 14000)),
+        Case("goal", "get_goal", lambda _: goals.get_goal(db, goal_id)),
+        Case("goal", "get_goals_by_user", lambda _: goals.get_goals_by_user(db, user_id)),
+        Case("goal", "update_goal", lambda new_id: goals.update_goal(db, new_id, daily=2100), new_goal),
+        Case("goal", "delete_goal", lambda new_id: goals.delete_goal(db, new_id), new_goal),
+        Case("meal_plan", "create_meal_plan", lambda _: meal_plans.create_meal_plan(db, writer_id, 1, "Benchmark plan")),
+        Case("meal_plan", "get_meal_plan", lambda _: meal_plans.get_meal_plan(db, plan_ids[0])),
+        Case("meal_plan", "get_meal_plans", lambda _: meal_plans.get_meal_plans(db, plan_ids)),
+        Case("meal_plan", "get_meal_plans_by_user", lambda _: meal_plans.get_meal_plans_by_user(db, user_id)),
+        Case("meal_plan", "update_meal_plan", lambda new_id: meal_plans.update_meal_plan(db, new_id, plan="Updated"), new_plan),
+        Case("meal_plan", "delete_meal_plan", lambda new_id: meal_plans.delete_meal_plan(db, new_id), new_plan),
+        Case("rollup", "rebuild_daily_totals_user", lambda _: rebuild_daily_totals(db, user_id)),
+        Case("rollup", "check_daily_totals_user", lambda _: check_daily_totals(db, user_id)),
+    ]
+
+
+def report_cases(db, dataset: Dataset, user_ids: list[int]) -> list[Case]:
+    user_id = user_ids[0]
+    start = dataset.start_date
+    cases = []
+    for days in REPORT_WINDOWS:
+        if days > dataset.days:
+            continue
+        end = start + timedelta(days=days - 1)
+        for source in ("rollup", "entries"):
+            cases.append(Case(
+                "report", f"generate_user_report_{source}_{days}d",
+                lambda _, end=end, source=source: generate_user_report(db, user_id, start, end, source=source),
+            ))
+    end = start + timedelta(days=min(dataset.days, 30) - 1)
+    cache = ReportCache()
+    get_cached_user_report(db, user_id, start, end, cache=cache)
+    cases.append(Case("report", "get_cached_user_report_hit", lambda _: get_cached_user_report(db, user_id, start, end, cache=cache)))
+    cases.append(Case("report", "generate_user_reports_all_30d", lambda _: sum(1 for _ in generate_user_reports(db, start, end))))
+    cases.append(Case("report", "top_foods_all_30d", lambda _: top_foods(db, start, end)))
+    cases.append(Case("report", "calorie_histogram_all_30d", lambda _: calorie_histogram(db, start, end)))
+    return cases
+
+
+def cli_cases(dataset: Dataset, user_ids: list[int], env: dict) -> list[Case]:
+    user_id = str(user_ids[0])
+    writer_id = str(user_ids[-1])
+    start = dataset.start_date.isoformat()
+    end = (dataset.start_date + timedelta(days=min(dataset.days, 30) - 1)).isoformat()
+    names = (f"bench_cli_{i}" for i in count())
+    commands = [
+        ("help", lambda: ["--help"]),
+        ("user_add", lambda: ["user", "add-user", next(names)]),
+        ("user_list", lambda: ["user", "list-users", "--limit", "100"]),
+        ("food_add", lambda: ["food", "add-food", writer_id, "Benchmark Snack", "100", "--date", start]),
+        ("food_list", lambda: ["food", "list-food-entries", user_id]),
+        ("food_list_stream", lambda: ["food", "list-food-entries", user_id, "--stream"]),
+        ("goal_list", lambda: ["goal", "list-goals", user_id]),
+        ("meal_plan_list", lambda: ["meal-plan", "list-meal-plans", user_id]),
+        ("report_user", lambda: ["report", "user-report", user_id, start, end, "--no-cache"]),
+        ("report_all_users", lambda: ["report", "all-users", start, end, "--output", os.devnull]),
+    ]
+
+    def run_cli(args):
+        result = subprocess.run([sys.executable, "-m", "myapp.cli", *args], cwd=PROJECT_DIR, env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"'{' '.join(args)}' failed: {result.stderr or result.stdout}")
+
+    return [Case("cli", name, lambda args: run_cli(args), args) for name, args in commands]
+
+
+def measure(case: Case, repeat: int, warmup: int, reset: Callable[[], None]) -> dict:
+    samples = []
+    for i in range(warmup + repeat):
+        arg = case.setup() if case.setup else None
+        reset()
+        started = time.perf_counter()
+        case.run(arg)
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            samples.append(elapsed * 1000)
+    return {
+        "group": case.group,
+        "name": case.name,
+        "runs": len(samples),
+        "min_ms": round(min(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "max_ms": round(max(samples), 4),
+    }
+
+
+def package_version() -> str:
+    try:
+        return version("health-tracker-cli-app")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def run(dataset: Dataset, repeat: int, cli_repeat: int, include_cli: bool, groups: set[str] | None = None) -> dict:
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "bench.db")
+    started = time.perf_counter()
+    engine, user_ids = create_database(db_path, dataset)
+    populate_seconds = time.perf_counter() - started
+    results = []
+    try:
+        db = sessionmaker(bind=engine, autoflush=False)()
+        # Every run starts with an empty identity map, as a CLI call would
+        reset = db.expunge_all
+        cases = controller_cases(db, dataset, user_ids) + report_cases(db, dataset, user_ids)
+        for case in cases:
+            if groups is None or case.group in groups:
+                results.append(measure(case, repeat, 1, reset))
+        db.close()
+
+        if include_cli and (groups is None or "cli" in groups):
+            env = {**os.environ, "HEALTH_TRACKER_DATABASE_URL": f"sqlite:///{db_path}"}
+            env.pop("HEALTH_TRACKER_REPORT_CACHE_PATH", None)
+            for case in cli_cases(dataset, user_ids, env):
+                results.append(measure(case, cli_repeat, 0, lambda: None))
+    finally:
+        engine.dispose()
+        for name in os.listdir(tmp_dir):
+            os.unlink(os.path.join(tmp_dir, name))
+        os.rmdir(tmp_dir)
+
+    return {
+        "version": package_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "sqlite": __import__("sqlite3").sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "dataset": {
+            "users": dataset.users,
+            "days": dataset.days,
+            "entries_per_day": dataset.entries_per_day,
+            "food_entries": dataset.entries,
+            "seed": dataset.seed,
+            "populate_seconds": round(populate_seconds, 3),
+        },
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe every benchmark whose median is more than `threshold` slower than the baseline."""
+    previous = {(row["group"], row["name"]): row for row in baseline["results"]}
+    regressions = []
+    for row in results["results"]:
+        old = previous.get((row["group"], row["name"]))
+        if old and row["median_ms"] > old["median_ms"] * (1 + threshold):
+            regressions.append(
+                f"{row['group']}.{row['name']}: {old['median_ms']:.3f} ms -> {row['median_ms']:.3f} ms "
+                f"({row['median_ms'] / old['median_ms']:.2f}x)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--entries-per-day", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per controller/report benchmark")
+    parser.add_argument("--cli-repeat", type=int, default=3, help="timed runs per CLI command")
+    parser.add_argument("--no-cli", action="store_true", help="skip the end-to-end CLI benchmarks")
+    parser.add_argument("--group", action="append", dest="groups", help="only run this group (repeatable)")
+    parser.add_argument("--output", "-o", default="-", help="JSON output file, '-' for stdout")
+    parser.add_argument("--baseline", help="earlier JSON output to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before a regression is reported")
+    args = parser.parse_args()
+
+    dataset = Dataset(args.users, args.days, args.entries_per_day, args.seed)
+    results = run(dataset, args.repeat, args.cli_repeat, not args.no_cli, set(args.groups) if args.groups else None)
+
+    text = json.dumps(results, indent=2, default=date.isoformat)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,5 @@
-from myapp.db.database import Base, engine
+from myapp.db.database import get_engine
+from myapp.db.migrations import upgrade_schema
 
-import myapp.models.user
-import myapp.models.food_entry
-import myapp.models.goal
-import myapp.models.meal_plan
-
-Base.metadata.create_all(bind=engine)
+upgrade_schema(get_engine())
 print(" Tables created successfully.")
@@ -0,0 +1,4 @@
+"""Analytics over daily totals, entry streams and columnar entry snapshots; NumPy is used when installed."""
+from .trends import HAVE_NUMPY, compute_trends
+from .columnar import FoodEntryColumns, load_food_entries
+from .food_stats import FoodStats
@@ -0,0 +1,305 @@
+# myapp/analytics/columnar.py
+"""Food entries as compact column arrays, for ad-hoc analytics.
+
+`load_food_entries` reads (user_id, food_id, calories, date) in one pass
+into four 32-bit integer columns, 16 bytes per row against roughly a
+kilobyte for a FoodEntry instance. Dates are stored as proleptic
+ordinals (date.toordinal()) and foods as their catalog id, with the names
+kept once in `food_names`.
+
+With NumPy installed the columns are ndarrays that share the loaded
+buffers, and group-bys run as bincount over dense integer codes.
+Without it they stay array('i') and the same helpers loop in Python.
+"""
+import heapq
+import math
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.orm import Session
+from myapp.models.food import Food
+from myapp.models.food_entry import FoodEntry
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install health-tracker-cli-app[analytics]
+    np = None
+
+COLUMNS = ("user_id", "food_id", "calories", "day")
+# Derived keys group_by accepts besides the columns themselves
+DERIVED_KEYS = ("weekday",)
+LOAD_BATCH_SIZE = 50_000
+# Most bins a bincount group-by may allocate (two int64/float64 arrays of
+# this length); sparser keys are sorted instead
+DENSE_GROUP_LIMIT = 1 << 23
+# Most cells of the bool bitmap used to count distinct user-days
+DISTINCT_BITMAP_LIMIT = 1 << 26
+# julianday() of date.fromordinal(1) at midnight
+JULIAN_DAY_OF_ORDINAL_ZERO = 1721424.5
+
+
+@dataclass
+class FoodEntryColumns:
+    user_id: "array | np.ndarray"
+    food_id: "array | np.ndarray"
+    calories: "array | np.ndarray"
+    # date.toordinal() of the entry date
+    day: "array | np.ndarray"
+    food_names: dict[int, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.calories)
+
+    @property
+    def vectorised(self) -> bool:
+        return np is not None and isinstance(self.calories, np.ndarray)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(column) * column.itemsize for column in self._columns())
+
+    def _columns(self):
+        return [getattr(self, name) for name in COLUMNS]
+
+    def _key(self, name: str):
+        if name in COLUMNS:
+            return getattr(self, name)
+        if name == "weekday":
+            # Monday is 0, as date.weekday(); ordinal 1 was a Monday
+            if self.vectorised:
+                return (self.day + 6) % 7
+            return array("i", ((day + 6) % 7 for day in self.day))
+        raise ValueError(f"Unknown key '{name}'. Choose from: {', '.join(COLUMNS + DERIVED_KEYS)}")
+
+    def where(self, user_id: int | None = None, food_id: int | None = None, start_date: date | None = None,
+              end_date: date | None = None, min_calories: int | None = None, max_calories: int | None = None) -> "FoodEntryColumns":
+        """The rows matching every given condition, as a new snapshot; bounds are inclusive."""
+        conditions = []
+        if user_id is not None:
+            conditions.append(("user_id", "==", user_id))
+        if food_id is not None:
+            conditions.append(("food_id", "==", food_id))
+        if start_date is not None:
+            conditions.append(("day", ">=", start_date.toordinal()))
+        if end_date is not None:
+            conditions.append(("day", "<=", end_date.toordinal()))
+        if min_calories is not None:
+            conditions.append(("calories", ">=", min_calories))
+        if max_calories is not None:
+            conditions.append(("calories", "<=", max_calories))
+        if not conditions:
+            return self
+
+        if self.vectorised:
+            mask = np.ones(len(self), dtype=bool)
+            for name, op, value in conditions:
+                column = getattr(self, name)
+                mask &= column == value if op == "==" else column >= value if op == ">=" else column <= value
+            return FoodEntryColumns(*(column[mask] for column in self._columns()), food_names=self.food_names)
+
+        checks = {"==": lambda a, b: a == b, ">=": lambda a, b: a >= b, "<=": lambda a, b: a <= b}
+        tests = [(getattr(self, name), checks[op], value) for name, op, value in conditions]
+        rows = [i for i in range(len(self)) if all(check(column[i], value) for column, check, value in tests)]
+        return FoodEntryColumns(*(array("i", (column[i] for i in rows)) for column in self._columns()), food_names=self.food_names)
+
+    def group_by(self, *keys: str, bucket: int | None = None) -> "Groups":
+        """Entries and total calories per distinct value of one or more of COLUMNS and "weekday".
+
+        `bucket` groups calories into ranges of that width instead, keyed by
+        the range's lower bound, for histograms.
+        """
+        if bucket is not None:
+            if bucket <= 0:
+                raise ValueError("bucket must be positive")
+            column = self.calories
+            key_columns = [column // bucket * bucket if self.vectorised else array("i", (c // bucket * bucket for c in column))]
+        else:
+            if not keys:
+                raise ValueError("Give at least one key")
+            key_columns = [self._key(name) for name in keys]
+
+        if self.vectorised:
+            return Groups(*_group_numpy(key_columns, self.calories))
+
+        counts, totals = defaultdict(int), defaultdict(int)
+        key_iter = zip(*key_columns)
+        for key, calories in zip(key_iter, self.calories):
+            counts[key] += 1
+            totals[key] += calories
+        ordered = sorted(counts)
+        return Groups(
+            [array("i", (key[i] for key in ordered)) for i in range(len(key_columns))],
+            array("q", (counts[key] for key in ordered)),
+            array("q", (totals[key] for key in ordered)),
+        )
+
+    def histogram(self, bucket: int) -> dict[int, int]:
+        """Entries per calorie range of width `bucket`, keyed by the range's lower bound."""
+        groups = self.group_by(bucket=bucket)
+        return dict(zip(_as_list(groups.keys[0]), _as_list(groups.counts)))
+
+    def weekday_averages(self) -> dict[int, float]:
+        """Average calories per tracked day (one user's day) for each weekday, Monday = 0."""
+        if not len(self):
+            return {}
+        if self.vectorised:
+            weekdays = self._key("weekday")
+            sums = np.bincount(weekdays, weights=self.calories, minlength=7)
+            day_counts = _distinct_days_per_weekday(self.user_id, self.day)
+            return {weekday: round(float(sums[weekday]) / int(day_counts[weekday]), 1) for weekday in range(7) if day_counts[weekday]}
+
+        totals, days = defaultdict(int), defaultdict(set)
+        for user_id, day, calories in zip(self.user_id, self.day, self.calories):
+            weekday = (day + 6) % 7
+            totals[weekday] += calories
+            days[weekday].add((user_id, day))
+        return {weekday: round(totals[weekday] / len(days[weekday]), 1) for weekday in sorted(days)}
+
+
+@dataclass
+class Groups:
+    """A group-by result as parallel columns, in key order.
+
+    Kept as arrays so that a group-by with millions of groups costs no more
+    than the arrays; to_dict() and top() build Python objects only for
+    what they return.
+    """
+    # One column per key
+    keys: list
+    counts: "array | np.ndarray"
+    totals: "array | np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def to_dict(self) -> dict:
+        """{key: (entries, total calories)}; keys are tuples when grouping by several columns."""
+        keys = [_as_list(column) for column in self.keys]
+        values = zip(_as_list(self.counts), _as_list(self.totals))
+        return dict(zip(keys[0] if len(keys) == 1 else zip(*keys), values))
+
+    def top(self, k: int, by: str = "totals") -> list[tuple]:
+        """The k largest groups by "totals" or "counts" as (key, entries, total calories), largest first."""
+        if by not in ("totals", "counts"):
+            raise ValueError("by must be 'totals' or 'counts'")
+        if k <= 0 or not len(self):
+            return []
+        column = getattr(self, by)
+        if np is not None and isinstance(column, np.ndarray):
+            # argpartition finds the k largest in O(groups); only they are sorted
+            k = min(k, len(column))
+            candidates = np.sort(np.argpartition(column, len(column) - k)[len(column) - k:])
+            # Stable, so equal groups stay in key order
+            indexes = candidates[np.argsort(-column[candidates], kind="stable")].tolist()
+        else:
+            indexes = heapq.nlargest(k, range(len(column)), key=column.__getitem__)
+        rows = []
+        for i in indexes:
+            key = tuple(int(column_[i]) for column_ in self.keys)
+            rows.append((key[0] if len(key) == 1 else key, int(self.counts[i]), int(self.totals[i])))
+        return rows
+
+
+def _as_list(column) -> list:
+    return column.tolist()
+
+
+def _group_numpy(key_columns: list, values):
+    # Combine the keys into one int64 code (mixed radix over each key's
+    # range), then count and sum per code. Dense codes use bincount, O(n);
+    # sparse ones are sorted, O(n log n).
+    bases, spans = [], []
+    code = None
+    for column in key_columns:
+        low = int(column.min()) if len(column) else 0
+        span = (int(column.max()) - low + 1) if len(column) else 1
+        offset = np.subtract(column, low, dtype=np.int64)
+        code = offset if code is None else code * span + offset
+        bases.append(low)
+        spans.append(span)
+
+    size = math.prod(spans)
+    value_bits = int(values.max()).bit_length() if len(values) else 0
+    if size <= DENSE_GROUP_LIMIT:
+        counts = np.bincount(code, minlength=size)
+        totals = np.bincount(code, weights=values, minlength=size)
+        codes = np.flatnonzero(counts)
+        counts, totals = counts[codes], totals[codes]
+    elif len(values) and int(values.min()) >= 0 and (size - 1).bit_length() + value_bits <= 62:
+        # Too many bins: pack code and value into one int64, sort once (a
+        # plain integer sort, much faster than np.unique), then sum the runs
+        packed = np.sort((code << value_bits) | values.astype(np.int64))
+        sorted_codes = packed >> value_bits
+        starts = np.flatnonzero(np.concatenate(([True], sorted_codes[1:] != sorted_codes[:-1])))
+        codes = sorted_codes[starts]
+        counts = np.diff(np.append(starts, len(packed)))
+        totals = np.add.reduceat(packed & ((1 << value_bits) - 1), starts)
+    else:
+        codes, inverse = np.unique(code, return_inverse=True)
+        counts = np.bincount(inverse)
+        totals = np.bincount(inverse, weights=values)
+
+    # Decode each key back out of the combined code, last key first
+    keys = []
+    for low, span in zip(reversed(bases), reversed(spans)):
+        keys.append(codes % span + low)
+        codes = codes // span
+    keys.reverse()
+    # float64 sums are exact up to 2**53 calories
+    return keys, counts, totals.astype(np.int64)
+
+
+def _distinct_days_per_weekday(user_id, day):
+    # Number of distinct (user, day) pairs falling on each weekday. A bitmap
+    # over the users x days grid marks the pairs in O(n); its columns are
+    # the days, so summing them counts the users per day.
+    user_low, day_low = int(user_id.min()), int(day.min())
+    user_span, day_span = int(user_id.max()) - user_low + 1, int(day.max()) - day_low + 1
+    code = np.subtract(user_id, user_low, dtype=np.int64) * day_span + (day - day_low)
+    if user_span * day_span <= DISTINCT_BITMAP_LIMIT:
+        seen = np.zeros(user_span * day_span, dtype=bool)
+        seen[code] = True
+        users_per_day = seen.reshape(user_span, day_span).sum(axis=0)
+        weekdays = (np.arange(day_low, day_low + day_span) + 6) % 7
+        return np.bincount(weekdays, weights=users_per_day, minlength=7).astype(np.int64)
+    days = np.unique(code) % day_span + day_low
+    return np.bincount((days + 6) % 7, minlength=7)
+
+
+def food_entry_columns_statement(user_id: int | None = None, start_date: date | None = None, end_date: date | None = None):
+    # SQLite turns the ISO date text into an ordinal itself, so no date
+    # objects are built per row
+    day = cast(func.julianday(FoodEntry.date) - JULIAN_DAY_OF_ORDINAL_ZERO, Integer)
+    stmt = select(FoodEntry.user_id, FoodEntry.food_id, FoodEntry.calories, day)
+    if user_id is not None:
+        stmt = stmt.where(FoodEntry.user_id == user_id)
+    if start_date is not None:
+        stmt = stmt.where(FoodEntry.date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(FoodEntry.date <= end_date)
+    return stmt
+
+
+def load_food_entries(db: Session, user_id: int | None = None, start_date: date | None = None, end_date: date | None = None,
+                      use_numpy: bool | None = None, batch_size: int = LOAD_BATCH_SIZE) -> FoodEntryColumns:
+    """Read one user's (or every user's) food entries into a FoodEntryColumns snapshot in one pass."""
+    if use_numpy and np is None:
+        raise RuntimeError("NumPy is not installed; install the 'analytics' extra")
+    columns = [array("i") for _ in COLUMNS]
+    stmt = food_entry_columns_statement(user_id, start_date, end_date)
+    # A Core execute: the ORM layer would add its own per-row cost
+    for batch in db.connection().execute(stmt, execution_options={"yield_per": batch_size}).partitions():
+        # Transpose the batch once and append each column with a C loop
+        for column, values in zip(columns, zip(*batch)):
+            column.extend(values)
+
+    # The catalog is small next to the entries; take it whole
+    food_names = {food_id: name for food_id, name in db.execute(select(Food.id, Food.name))}
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        # Zero-copy views over the arrays' buffers
+        columns = [np.frombuffer(column, dtype=np.int32) for column in columns]
+    return FoodEntryColumns(*columns, food_names=food_names)
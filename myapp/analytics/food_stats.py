@@ -0,0 +1,99 @@
+# myapp/analytics/food_stats.py
+"""Top foods and calorie histograms over a stream of entries.
+
+The database path aggregates with GROUP BY in SQLite; this is the path for
+entries that never reach a table, such as the rows of an import file.
+Memory grows with the number of distinct foods and buckets, not entries,
+and picking the top K keeps a heap of only K items.
+"""
+import heapq
+from collections import Counter
+from dataclasses import dataclass, field
+
+from myapp.models.food import normalize_food_name
+
+TOP_FOODS_BY = ("calories", "entries")
+# Widest span of buckets shown with its empty buckets filled in
+MAX_HISTOGRAM_ROWS = 50
+
+
+def bucket_of(calories: int, bucket: int) -> int:
+    return calories // bucket
+
+
+def histogram_rows(counts: dict[int, int], bucket: int, max_rows: int = MAX_HISTOGRAM_ROWS) -> list[dict]:
+    """Buckets from the lowest to the highest one seen, empty ones included.
+
+    `counts` maps a bucket number (value // bucket) to its count; a row
+    covers `low` up to but not including `high`. When that span is wider
+    than `max_rows`, as with one outlier far from the rest, only the
+    non-empty buckets are returned.
+    """
+    if not counts:
+        return []
+    low, high = min(counts), max(counts)
+    indexes = range(low, high + 1) if high - low < max_rows else sorted(counts)
+    return [
+        {"low": index * bucket, "high": (index + 1) * bucket, "count": counts.get(index, 0)}
+        for index in indexes
+    ]
+
+
+def top_food_rows(totals, limit: int, by: str = "calories") -> list[dict]:
+    """The `limit` largest of (food, entries, calories) totals with their share.
+
+    Ties on `by` go to the other figure, then to the name, so the order does
+    not depend on the order the foods arrived in.
+    """
+    if by not in TOP_FOODS_BY:
+        raise ValueError(f"Unknown ranking '{by}'. Choose from: {', '.join(TOP_FOODS_BY)}")
+    totals = list(totals)
+    grand_total = sum(row[1] if by == "entries" else row[2] for row in totals)
+    if by == "calories":
+        key = lambda row: (-row[2], -row[1], row[0])
+    else:
+        key = lambda row: (-row[1], -row[2], row[0])
+    return [
+        {
+            "food": food,
+            "entries": entries,
+            "calories": calories,
+            "share": round((entries if by == "entries" else calories) / grand_total * 100, 1) if grand_total else 0.0,
+        }
+        for food, entries, calories in heapq.nsmallest(limit, totals, key=key)
+    ]
+
+
+@dataclass
+class FoodStats:
+    """Running per-food totals and a calorie histogram, fed one entry at a time."""
+    bucket: int = 100
+    # normalized name -> [display name, entries, calories]
+    foods: dict[str, list] = field(default_factory=dict)
+    buckets: Counter = field(default_factory=Counter)
+
+    def __post_init__(self):
+        if self.bucket <= 0:
+            raise ValueError("bucket must be positive")
+
+    def add(self, food: str, calories: int) -> None:
+        key = normalize_food_name(food)
+        totals = self.foods.get(key)
+        if totals is None:
+            # The first spelling seen is the one shown, as in the foods catalog
+            totals = self.foods[key] = [" ".join(food.split()), 0, 0]
+        totals[1] += 1
+        totals[2] += calories
+        self.buckets[bucket_of(calories, self.bucket)] += 1
+
+    def update(self, entries) -> "FoodStats":
+        """Add (food, calories) pairs; returns self so calls can be chained."""
+        for food, calories in entries:
+            self.add(food, calories)
+        return self
+
+    def top(self, limit: int = 10, by: str = "calories") -> list[dict]:
+        return top_food_rows(map(tuple, self.foods.values()), limit, by)
+
+    def histogram(self) -> list[dict]:
+        return histogram_rows(self.buckets, self.bucket)
@@ -0,0 +1,162 @@
+# myapp/analytics/trends.py
+"""Rolling averages, weekly changes, spread and goal streaks from daily totals.
+
+Both paths make one linear pass over the days of the range. Rolling sums
+come from a sliding window (add the day entering, drop the day leaving) in
+pure Python, or from prefix sums with NumPy; neither re-adds a window per
+day. Untracked days count as missing rather than zero: averages are per
+tracked day, and an untracked day ends a goal streak.
+"""
+import math
+from datetime import date, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install health-tracker-cli-app[analytics]
+    np = None
+
+HAVE_NUMPY = np is not None
+ROLLING_WINDOWS = (7, 30)
+# Below this many days the NumPy setup costs more than it saves
+NUMPY_MIN_DAYS = 365
+
+
+def _average(total: float, days: int) -> float | None:
+    return round(total / days, 1) if days else None
+
+
+def _trends_python(calories: list[int], tracked: list[bool], daily_goal: int | None, windows: tuple[int, ...]):
+    n = len(calories)
+    sums = {w: 0 for w in windows}
+    counts = {w: 0 for w in windows}
+    rolling = {w: [None] * n for w in windows}
+    # Welford's running mean and variance over tracked days
+    seen, mean, m2 = 0, 0.0, 0.0
+    streak = longest = 0
+
+    for i in range(n):
+        value, is_tracked = calories[i], tracked[i]
+        for w in windows:
+            sums[w] += value
+            counts[w] += is_tracked
+            if i >= w:
+                sums[w] -= calories[i - w]
+                counts[w] -= tracked[i - w]
+            rolling[w][i] = _average(sums[w], counts[w])
+        if is_tracked:
+            seen += 1
+            delta = value - mean
+            mean += delta / seen
+            m2 += delta * (value - mean)
+        if daily_goal is not None:
+            streak = streak + 1 if is_tracked and value <= daily_goal else 0
+            longest = max(longest, streak)
+
+    stddev = math.sqrt(m2 / seen) if seen else None
+    return rolling, stddev, streak, longest
+
+
+def _trends_numpy(calories: list[int], tracked: list[bool], daily_goal: int | None, windows: tuple[int, ...]):
+    values = np.asarray(calories, dtype=np.int64)
+    mask = np.asarray(tracked, dtype=bool)
+    # Prefix sums with a leading zero: the window ending at day i is
+    # prefix[i + 1] - prefix[max(0, i + 1 - w)]
+    prefix_sum = np.concatenate(([0], np.cumsum(values)))
+    prefix_count = np.concatenate(([0], np.cumsum(mask)))
+    ends = np.arange(1, len(values) + 1)
+    rolling = {}
+    for w in windows:
+        starts = np.maximum(ends - w, 0)
+        sums = prefix_sum[ends] - prefix_sum[starts]
+        counts = prefix_count[ends] - prefix_count[starts]
+        averages = sums / np.maximum(counts, 1)
+        # Python's round() rather than np.round, which can differ in the last
+        # digit, so both paths give identical results
+        rolling[w] = [round(a, 1) if c else None for a, c in zip(averages.tolist(), counts.tolist())]
+
+    stddev = float(values[mask].std()) if mask.any() else None
+
+    streak = longest = 0
+    if daily_goal is not None:
+        under = mask & (values <= daily_goal)
+        # Run lengths of consecutive True values: split at the False days
+        breaks = np.flatnonzero(~under)
+        bounds = np.concatenate(([-1], breaks, [len(under)]))
+        runs = np.diff(bounds) - 1
+        longest = int(runs.max()) if len(runs) else 0
+        streak = int(runs[-1])
+    return rolling, stddev, streak, longest
+
+
+def compute_trends(start_date: date, end_date: date, daily_rows: list[tuple[date, int, int]], daily_goal: int | None = None,
+                   windows: tuple[int, ...] = ROLLING_WINDOWS, use_numpy: bool | None = None) -> dict:
+    """Trend figures for the days from start_date to end_date.
+
+    `daily_rows` are the (date, entry count, calories) rows of the tracked
+    days, as the report queries return them. `use_numpy` forces a path;
+    by default NumPy is used when it is installed and the range is long.
+    """
+    days = (end_date - start_date).days + 1
+    if days <= 0:
+        raise ValueError("end_date must not be before start_date")
+    if use_numpy is None:
+        use_numpy = HAVE_NUMPY and days >= NUMPY_MIN_DAYS
+    elif use_numpy and not HAVE_NUMPY:
+        raise RuntimeError("NumPy is not installed; install the 'analytics' extra")
+
+    # Dense series over the range; untracked days stay 0 / False
+    calories = [0] * days
+    tracked = [False] * days
+    for day, _, total in daily_rows:
+        offset = (day - start_date).days
+        if 0 <= offset < days:
+            calories[offset] += total
+            tracked[offset] = True
+
+    compute = _trends_numpy if use_numpy else _trends_python
+    rolling, stddev, streak, longest = compute(calories, tracked, daily_goal, windows)
+
+    daily = []
+    for offset in range(days):
+        row = {"date": (start_date + timedelta(days=offset)).isoformat(), "calories": calories[offset] if tracked[offset] else None}
+        for w in windows:
+            row[f"rolling_{w}"] = rolling[w][offset]
+        daily.append(row)
+
+    # Week-over-week: 7-day blocks from start_date, compared by their average
+    # per tracked day so a partial last week is not penalised
+    weeks = []
+    previous = None
+    for offset in range(0, days, 7):
+        block = range(offset, min(offset + 7, days))
+        total = sum(calories[i] for i in block)
+        tracked_days = sum(tracked[i] for i in block)
+        average = _average(total, tracked_days)
+        change = round(average - previous, 1) if average is not None and previous is not None else None
+        weeks.append({
+            "week_start": (start_date + timedelta(days=offset)).isoformat(),
+            "calories": total,
+            "days_tracked": tracked_days,
+            "avg_daily_calories": average,
+            "change": change,
+            "change_percent": round(change / previous * 100, 1) if change is not None and previous else None,
+        })
+        if average is not None:
+            previous = average
+
+    days_tracked = sum(tracked)
+    trends = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "days_in_period": days,
+        "days_tracked": days_tracked,
+        "avg_daily_calories": _average(sum(calories), days_tracked),
+        "stddev_daily_calories": round(stddev, 1) if stddev is not None else None,
+        "daily": daily,
+        "weeks": weeks,
+        "daily_goal": daily_goal,
+    }
+    if daily_goal is not None:
+        trends["current_streak_under_goal"] = streak
+        trends["longest_streak_under_goal"] = longest
+    return trends
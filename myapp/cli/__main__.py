@@ -1,17 +1,44 @@
+import time
 import typer
-from myapp.cli import user, food, goal, meal_plan, report
+from myapp.cli.lazy import LazyTyperGroup
+
+class HealthTrackerGroup(LazyTyperGroup):
+    lazy_subcommands = {
+        "user": ("myapp.cli.user", "User management commands"),
+        "food": ("myapp.cli.food", "Food tracking commands"),
+        "goal": ("myapp.cli.goal", "Goal management commands"),
+        "meal-plan": ("myapp.cli.meal_plan", "Meal planning commands"),
+        "report": ("myapp.cli.report", "Report generation commands"),
+        "export": ("myapp.cli.export", "Data export commands"),
+        "db": ("myapp.cli.db", "Database maintenance commands"),
+        "shell": ("myapp.cli.daemon:shell_app", "Start an interactive shell"),
+        "serve": ("myapp.cli.daemon:serve_app", "Serve commands over a Unix socket"),
+    }
 
 app = typer.Typer(
     name="health-tracker",
     help="Health Tracker CLI - Track your nutrition and fitness goals",
-    no_args_is_help=True
+    no_args_is_help=True,
+    cls=HealthTrackerGroup
 )
 
-app.add_typer(user.app, name="user", help="User management commands")
-app.add_typer(food.app, name="food", help="Food tracking commands")
-app.add_typer(goal.app, name="goal", help="Goal management commands")
-app.add_typer(meal_plan.app, name="meal-plan", help="Meal planning commands")
-app.add_typer(report.app, name="report", help="Report generation commands")
+@app.callback()
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(False, "--profile", help="Print the SQL statements run and the time spent in them when the command finishes")
+):
+    if profile:
+        # Imported here so plain --help stays free of SQLAlchemy
+        from myapp.db.instrumentation import QueryInstrumentation
+
+        instrumentation = QueryInstrumentation().install()
+        started = time.perf_counter()
+
+        def print_profile():
+            instrumentation.remove()
+            typer.echo(instrumentation.format_summary(time.perf_counter() - started), err=True)
+
+        ctx.call_on_close(print_profile)
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,58 @@
+"""Thin client that forwards CLI commands to a running `health-tracker serve`.
+
+Only the standard library is imported, so each call costs little more than
+interpreter startup:
+
+    python -m myapp.cli.client food add-food 1 "Apple" 95
+"""
+import json
+import os
+import socket
+import sys
+import tempfile
+
+def default_socket_path() -> str:
+    return os.environ.get("HEALTH_TRACKER_SOCKET") or os.path.join(
+        tempfile.gettempdir(), f"health-tracker-{os.getuid()}.sock"
+    )
+
+class DaemonClient:
+    """A connection to the daemon that can run many commands in turn."""
+
+    def __init__(self, socket_path: str | None = None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path or default_socket_path())
+        self.stream = self.sock.makefile("rwb")
+
+    def run(self, argv: list[str]) -> tuple[int, str]:
+        self.stream.write(json.dumps({"argv": argv}).encode() + b"\n")
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("health-tracker daemon closed the connection")
+        response = json.loads(line)
+        return response["exit_code"], response["output"]
+
+    def close(self) -> None:
+        self.stream.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        with DaemonClient() as client:
+            exit_code, output = client.run(argv)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No health-tracker daemon on {default_socket_path()}. Start one with 'health-tracker serve'.", file=sys.stderr)
+        return 1
+    sys.stdout.write(output)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import io
+import json
+import os
+import shlex
+import signal
+import socket
+import socketserver
+import stat
+import threading
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+import click
+import typer
+from sqlalchemy.orm import configure_mappers
+from myapp.cli.client import default_socket_path
+from myapp.db.database import get_engine
+
+# Both commands are single-command apps loaded lazily by the root group
+shell_app = typer.Typer(add_completion=False)
+serve_app = typer.Typer(add_completion=False)
+
+_root_command = None
+# Output is captured by swapping sys.stdout, so commands run one at a time
+_command_lock = threading.Lock()
+
+def _get_root_command() -> click.Command:
+    global _root_command
+    if _root_command is None:
+        from myapp.cli.__main__ import app
+        from myapp.cli.report import cache_stats_app
+        root = typer.main.get_command(app)
+        report = root.get_command(click.Context(root), "report")
+        report.add_command(typer.main.get_command(cache_stats_app), "cache-stats")
+        _root_command = root
+    return _root_command
+
+def warm_up() -> None:
+    """Load every sub-app, configure the ORM mappers and open a connection."""
+    root = _get_root_command()
+    ctx = click.Context(root)
+    for name in root.list_commands(ctx):
+        root.get_command(ctx, name)
+    configure_mappers()
+    with get_engine().connect():
+        pass
+
+def run_command(argv: list[str]) -> tuple[int, str]:
+    """Run one CLI command in this process and return (exit code, output)."""
+    if argv[:1] in (["serve"], ["shell"]):
+        return 1, f"'{argv[0]}' cannot be run from inside the shell or daemon\n"
+
+    buffer = io.StringIO()
+    with _command_lock, redirect_stdout(buffer), redirect_stderr(buffer):
+        try:
+            result = _get_root_command().main(args=argv, prog_name="health-tracker", standalone_mode=False)
+            exit_code = result if isinstance(result, int) else 0
+        except click.exceptions.Exit as exc:
+            exit_code = exc.exit_code
+        except click.ClickException as exc:
+            exc.show(file=buffer)
+            exit_code = exc.exit_code
+        except click.exceptions.Abort:
+            buffer.write("Aborted!\n")
+            exit_code = 1
+        except Exception:
+            traceback.print_exc(file=buffer)
+            exit_code = 1
+    return exit_code, buffer.getvalue()
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    # One JSON request per line: {"argv": [...]}; one JSON response per line
+    def handle(self):
+        for line in self.rfile:
+            try:
+                argv = json.loads(line)["argv"]
+                exit_code, output = run_command([str(arg) for arg in argv])
+            except (ValueError, KeyError, TypeError) as exc:
+                exit_code, output = 2, f"Invalid request: {exc}\n"
+            self.wfile.write(json.dumps({"exit_code": exit_code, "output": output}).encode() + b"\n")
+            self.wfile.flush()
+
+class CommandServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+def _remove_stale_socket(socket_path: str) -> None:
+    # Only a socket nobody answers on is left over from a daemon that died;
+    # anything else at the path belongs to someone else and is kept
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(socket_path)
+        return
+    finally:
+        probe.close()
+    raise FileExistsError(f"A daemon is already listening on {socket_path}")
+
+def make_server(socket_path: str) -> CommandServer:
+    _remove_stale_socket(socket_path)
+    server = CommandServer(socket_path, CommandHandler)
+    os.chmod(socket_path, 0o600)
+    return server
+
+@shell_app.command()
+def shell():
+    """Start an interactive shell that keeps the database connection warm."""
+    warm_up()
+    typer.echo("Health Tracker shell. Type 'help' for commands, 'exit' to quit.")
+    while True:
+        try:
+            line = input("health-tracker> ")
+        except (EOFError, KeyboardInterrupt):
+            typer.echo()
+            break
+        line = line.strip()
+        if not line:
+            continue
+        if line in ("exit", "quit"):
+            break
+        try:
+            argv = shlex.split(line)
+        except ValueError as exc:
+            typer.echo(f"Invalid input: {exc}")
+            continue
+        if argv == ["help"]:
+            argv = ["--help"]
+        _, output = run_command(argv)
+        typer.echo(output, nl=False)
+
+@serve_app.command()
+def serve(socket_path: str = typer.Option(None, "--socket", help="Unix socket path (default: $HEALTH_TRACKER_SOCKET or a per-user temp file)")):
+    """Serve CLI commands over a Unix socket with a warm engine and caches."""
+    socket_path = socket_path or default_socket_path()
+    warm_up()
+    try:
+        server = make_server(socket_path)
+    except OSError as exc:
+        typer.echo(f"Cannot listen on {socket_path}: {exc}", err=True)
+        raise typer.Exit(code=1)
+    # Stop cleanly (and remove the socket) on SIGTERM as well as Ctrl-C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    typer.echo(f"Listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
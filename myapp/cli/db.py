@@ -0,0 +1,48 @@
+import typer
+from typing import Optional
+from myapp.db.database import get_engine
+from myapp.db.db import get_db
+from myapp.db.migrations import upgrade_schema
+from myapp.controllers.rollup_controller import rebuild_daily_totals, check_daily_totals
+
+app = typer.Typer(help="Database maintenance commands")
+
+@app.command()
+def upgrade():
+    """Create any missing tables and indexes in the database."""
+    created = upgrade_schema(get_engine())
+    if created:
+        for name in created:
+            typer.echo(f"Created {name}")
+    else:
+        typer.echo("Database is up to date")
+
+@app.command()
+def rebuild_rollups(user_id: Optional[int] = typer.Option(None, "--user-id", help="Only rebuild this user's rollup")):
+    """Recompute the daily calorie rollup from the food entries."""
+    with get_db() as db:
+        rows = rebuild_daily_totals(db, user_id)
+        typer.echo(f"Rebuilt {rows} daily total rows")
+
+@app.command()
+def check_rollups(user_id: Optional[int] = typer.Option(None, "--user-id", help="Only check this user's rollup")):
+    """Compare the daily calorie rollup with the food entries."""
+    with get_db() as db:
+        mismatches = check_daily_totals(db, user_id)
+
+    if not mismatches:
+        typer.echo("Daily totals are consistent")
+        return
+
+    for mismatch in mismatches:
+        expected_calories, expected_count = mismatch["expected"]
+        actual_calories, actual_count = mismatch["actual"]
+        typer.echo(
+            f"User ID {mismatch['user_id']}, {mismatch['date']}: expected {expected_calories} calories "
+            f"in {expected_count} entries, rollup has {actual_calories} in {actual_count}"
+        )
+    typer.echo(f"{len(mismatches)} inconsistent days. Run 'db rebuild-rollups' to repair.")
+    raise typer.Exit(code=1)
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,132 @@
+import contextlib
+import csv
+import gzip
+import json
+import sys
+import typer
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+from myapp.controllers.export_controller import EXPORTS, export_columns, iter_export_batches
+from myapp.db.db import get_db
+
+app = typer.Typer(help="Data export commands")
+
+MANIFEST = "manifest.json"
+# gzip(1)'s default; level 9 is several times slower for a few percent
+GZIP_LEVEL = 6
+
+@dataclass
+class ExportResult:
+    rows: int
+    # Highest id written, or the --since value when nothing was new
+    high_water_mark: int | None
+
+def _format_for(path: str, fmt: Optional[str]) -> str:
+    if fmt is None:
+        fmt = "ndjson" if path.removesuffix(".gz").endswith((".ndjson", ".jsonl")) else "csv"
+    if fmt not in ("csv", "ndjson"):
+        typer.echo("Invalid format. Use csv or ndjson.")
+        raise typer.Exit(code=1)
+    return fmt
+
+def _open_output(path: str, compress: bool):
+    if path == "-":
+        if compress:
+            return gzip.open(sys.stdout.buffer, "wt", GZIP_LEVEL, encoding="utf-8", newline="")
+        return contextlib.nullcontext(sys.stdout)
+    if compress:
+        return gzip.open(path, "wt", GZIP_LEVEL, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+def _write(out, fmt: str, columns: list[str], batches, since: Optional[int]) -> ExportResult:
+    # One write per batch; dates come out as YYYY-MM-DD in both formats
+    result = ExportResult(0, since)
+    writer = csv.writer(out) if fmt == "csv" else None
+    if writer:
+        writer.writerow(columns)
+    for batch in batches:
+        if writer:
+            writer.writerows(batch)
+        else:
+            out.write("".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in batch))
+        result.rows += len(batch)
+        result.high_water_mark = batch[-1][0]
+    return result
+
+def _export_table(db, table: str, output: str, user_id: Optional[int], since: Optional[int], fmt: str, compress: bool, batch_size: int) -> ExportResult:
+    try:
+        batches = iter_export_batches(db, table, user_id, since, batch_size)
+        with _open_output(output, compress) as out:
+            return _write(out, fmt, export_columns(table), batches, since)
+    except (OSError, ValueError) as exc:
+        typer.echo(f"Export failed: {exc}", err=True)
+        raise typer.Exit(code=1)
+
+def _report(result: ExportResult, table: str) -> None:
+    # Status goes to stderr so it never mixes with data written to stdout
+    typer.echo(f"Exported {result.rows} {table.replace('_', ' ')}", err=True)
+    if result.high_water_mark is not None:
+        typer.echo(f"Next incremental export: --since {result.high_water_mark}", err=True)
+
+def _table_command(table: str, noun: str):
+    def command(
+        output: str = typer.Argument("-", help="File to write (.csv, .ndjson or .jsonl, optionally .gz), or '-' for stdout"),
+        user_id: Optional[int] = typer.Option(None, "--user-id", help="Only this user's rows (default: every user)"),
+        since: Optional[int] = typer.Option(None, "--since", help="Only rows with an ID greater than this high-water mark"),
+        fmt: Optional[str] = typer.Option(None, "--format", help="csv or ndjson (default: from the file extension, else csv)"),
+        compress: Optional[bool] = typer.Option(None, "--gzip/--no-gzip", help="Compress the output (default: when the file name ends in .gz)"),
+        batch_size: int = typer.Option(1000, "--batch-size", min=1, help="Rows fetched and written at a time")
+    ):
+        fmt = _format_for(output, fmt)
+        if compress is None:
+            compress = output.endswith(".gz")
+        with get_db() as db:
+            _report(_export_table(db, table, output, user_id, since, fmt, compress, batch_size), table)
+    command.__doc__ = f"Export {noun} in ID order, streaming from the database."
+    return command
+
+app.command("food-entries")(_table_command("food_entries", "food entries"))
+app.command("goals")(_table_command("goals", "goals"))
+app.command("meal-plans")(_table_command("meal_plans", "meal plans"))
+
+@app.command("all")
+def export_all(
+    directory: Path = typer.Argument(..., help="Directory to write one file per table and manifest.json to"),
+    user_id: Optional[int] = typer.Option(None, "--user-id", help="Only this user's rows (default: every user)"),
+    since: Optional[Path] = typer.Option(None, "--since", help="manifest.json of an earlier export; only rows added after it are written"),
+    fmt: str = typer.Option("csv", "--format", help="csv or ndjson"),
+    compress: bool = typer.Option(False, "--gzip", help="Compress each file"),
+    batch_size: int = typer.Option(1000, "--batch-size", min=1, help="Rows fetched and written at a time")
+):
+    """Export food entries, goals and meal plans, with a manifest of high-water marks."""
+    marks = {}
+    if since is not None:
+        try:
+            marks = {table: info["high_water_mark"] for table, info in json.loads(since.read_text())["tables"].items()}
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            typer.echo(f"Cannot read manifest {since}: {exc}", err=True)
+            raise typer.Exit(code=1)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    extension = "." + _format_for("", fmt) + (".gz" if compress else "")
+    manifest = {
+        "exported_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "user_id": user_id,
+        "format": fmt,
+        "tables": {},
+    }
+    with get_db() as db:
+        for table in EXPORTS:
+            path = directory / (table + extension)
+            result = _export_table(db, table, str(path), user_id, marks.get(table), fmt, compress, batch_size)
+            manifest["tables"][table] = {
+                "file": path.name, "rows": result.rows, "since": marks.get(table), "high_water_mark": result.high_water_mark,
+            }
+            typer.echo(f"Exported {result.rows} {table.replace('_', ' ')} to {path}")
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2) + "\n")
+    typer.echo(f"Next incremental export: --since {directory / MANIFEST}")
+
+if __name__ == "__main__":
+    app()
@@ -1,9 +1,16 @@
+import time
 import typer
 from typing import Optional
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from myapp.controllers.food_entry_controller import (
-    create_food_entry, get_food_entries_by_user, update_food_entry, delete_food_entry
+    create_food_entry, bulk_create_food_entries, get_food_entries_by_user, iter_food_entries_by_user, update_food_entry, delete_food_entry,
+    FoodEntryFilter, count_food_entries, bulk_update_food_entries, bulk_delete_food_entries, search_food_entries
 )
+from myapp.controllers.food_controller import get_foods
+from myapp.models.food import normalize_food_name
+from myapp.cli.listing import page_kwargs, write_rows
+from myapp.cli.rows import format_for, open_source, parse_rows, read_rows
 from myapp.db.db import get_db
 
 app = typer.Typer(help="Food tracking commands")
@@ -12,7 +19,7 @@ app = typer.Typer(help="Food tracking commands")
 def add_food(
     user_id: int = typer.Argument(..., help="ID of the user"),
     food: str = typer.Argument(..., help="Name of the food"),
-    calories: int = typer.Argument(..., help="Number of calories"),
+    calories: Optional[int] = typer.Argument(None, help="Number of calories (default: the food's catalog default)"),
     date: Optional[str] = typer.Option(None, "--date", help="Date in YYYY-MM-DD format (default: today)")
 ):
     """Add a new food entry."""
@@ -23,16 +30,42 @@ def add_food(
         raise typer.Exit(code=1)
 
     with get_db() as db:
-        entry = create_food_entry(db, user_id, food, calories, entry_date)
+        try:
+            entry = create_food_entry(db, user_id, food, calories, entry_date)
+        except ValueError as e:
+            typer.echo(str(e))
+            raise typer.Exit(code=1)
+        except IntegrityError:
+            # The only constraint an insert can break here is the user_id foreign key
+            db.rollback()
+            typer.echo("User not found")
+            raise typer.Exit(code=1)
         typer.echo(f"Food entry created with ID {entry.id}")
 
 @app.command()
-def list_food_entries(user_id: int = typer.Argument(..., help="ID of the user")):
+def list_foods(
+    after_id: Optional[int] = typer.Option(None, "--after-id", help="Only list foods with an ID greater than this"),
+    limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Maximum number of foods to list")
+):
+    """List the food catalog."""
+    with get_db() as db:
+        rows = get_foods(db, **page_kwargs(after_id, limit))
+        write_rows(rows, lambda f: f"ID: {f.id}, Food: {f.name}, Default calories: {f.default_calories if f.default_calories is not None else '-'}", limit)
+
+@app.command()
+def list_food_entries(
+    user_id: int = typer.Argument(..., help="ID of the user"),
+    after_id: Optional[int] = typer.Option(None, "--after-id", help="Only list entries with an ID greater than this"),
+    limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Maximum number of entries to list"),
+    stream: bool = typer.Option(False, "--stream", help="Stream rows from the database instead of loading them all first")
+):
     """List all food entries for a user."""
     with get_db() as db:
-        entries = get_food_entries_by_user(db, user_id)
-        for e in entries:
-            typer.echo(f"ID: {e.id}, Food: {e.food}, Calories: {e.calories}, Date: {e.date}")
+        if stream:
+            rows = iter_food_entries_by_user(db, user_id, after_id=after_id, limit=limit)
+        else:
+            rows = get_food_entries_by_user(db, user_id, **page_kwargs(after_id, limit))
+        write_rows(rows, lambda e: f"ID: {e.id}, Food: {e.food}, Calories: {e.calories}, Date: {e.date}", limit)
 
 @app.command()
 def update_food_entry_cmd(
@@ -51,7 +84,11 @@ def update_food_entry_cmd(
             raise typer.Exit(code=1)
 
     with get_db() as db:
-        updated = update_food_entry(db, entry_id, food, calories, entry_date)
+        try:
+            updated = update_food_entry(db, entry_id, food, calories, entry_date)
+        except ValueError as e:
+            typer.echo(str(e))
+            raise typer.Exit(code=1)
         if updated:
             typer.echo(f"Updated food entry ID {entry_id}")
         else:
@@ -64,5 +101,130 @@ def delete_food_entry_cmd(entry_id: int = typer.Argument(..., help="ID of the fo
         success = delete_food_entry(db, entry_id)
         typer.echo("Food entry deleted" if success else "Food entry not found")
 
+@app.command("import")
+def import_food(
+    path: str = typer.Argument("-", help="CSV or NDJSON file to import, or '-' for stdin"),
+    user_id: Optional[int] = typer.Option(None, "--user-id", help="User ID for rows without a user_id column"),
+    fmt: Optional[str] = typer.Option(None, "--format", help="csv or ndjson (default: from the file extension, else csv)"),
+    chunk_size: int = typer.Option(1000, "--chunk-size", help="Rows per INSERT batch")
+):
+    """Import food entries from a CSV or NDJSON file in a single transaction."""
+    fmt = format_for(path, fmt)
+    if fmt not in ("csv", "ndjson"):
+        typer.echo("Invalid format. Use csv or ndjson.")
+        raise typer.Exit(code=1)
+
+    started = time.perf_counter()
+    try:
+        with open_source(path) as source, get_db() as db:
+            imported = bulk_create_food_entries(db, parse_rows(read_rows(source, fmt), user_id), chunk_size)
+    except (OSError, ValueError, SQLAlchemyError) as exc:
+        # bulk_create_food_entries has rolled back, e.g. after a row for an unknown user
+        typer.echo(f"Import failed, no entries were imported: {exc}")
+        raise typer.Exit(code=1)
+    elapsed = time.perf_counter() - started
+
+    rate = imported / elapsed if elapsed > 0 else 0
+    typer.echo(f"Imported {imported} food entries in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+def _parse_date_option(value: Optional[str]):
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        typer.echo("Invalid date format. Use YYYY-MM-DD.")
+        raise typer.Exit(code=1)
+
+def _entry_filter(user_id, start_date, end_date, food, min_calories, max_calories) -> FoodEntryFilter:
+    filters = FoodEntryFilter(
+        user_id=user_id,
+        start_date=_parse_date_option(start_date),
+        end_date=_parse_date_option(end_date),
+        food=food,
+        min_calories=min_calories,
+        max_calories=max_calories,
+    )
+    if filters.is_empty():
+        typer.echo("Give at least one filter (--user-id, --start-date, --end-date, --food, --min-calories, --max-calories).")
+        raise typer.Exit(code=1)
+    return filters
+
+@app.command()
+def bulk_update(
+    user_id: Optional[int] = typer.Option(None, "--user-id", help="Only entries of this user"),
+    start_date: Optional[str] = typer.Option(None, "--start-date", help="Only entries on or after this date (YYYY-MM-DD)"),
+    end_date: Optional[str] = typer.Option(None, "--end-date", help="Only entries on or before this date (YYYY-MM-DD)"),
+    food: Optional[str] = typer.Option(None, "--food", help="Only entries with exactly this food name"),
+    min_calories: Optional[int] = typer.Option(None, "--min-calories", help="Only entries with at least this many calories"),
+    max_calories: Optional[int] = typer.Option(None, "--max-calories", help="Only entries with at most this many calories"),
+    set_food: Optional[str] = typer.Option(None, "--set-food", help="New food name"),
+    set_calories: Optional[int] = typer.Option(None, "--set-calories", help="New calorie count"),
+    scale_calories: Optional[float] = typer.Option(None, "--scale-calories", help="Multiply calories by this factor (rounded)"),
+    set_date: Optional[str] = typer.Option(None, "--set-date", help="New date in YYYY-MM-DD format"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only count the matching entries")
+):
+    """Update every food entry matching the filters with a single UPDATE."""
+    filters = _entry_filter(user_id, start_date, end_date, food, min_calories, max_calories)
+    new_date = _parse_date_option(set_date)
+    if set_food is None and set_calories is None and scale_calories is None and new_date is None:
+        typer.echo("Nothing to update. Use --set-food, --set-calories, --scale-calories or --set-date.")
+        raise typer.Exit(code=1)
+    if set_calories is not None and scale_calories is not None:
+        typer.echo("Use either --set-calories or --scale-calories, not both.")
+        raise typer.Exit(code=1)
+    if set_food is not None and not normalize_food_name(set_food):
+        typer.echo("Food name cannot be empty.")
+        raise typer.Exit(code=1)
+
+    with get_db() as db:
+        if dry_run:
+            typer.echo(f"Would update {count_food_entries(db, filters)} food entries")
+            return
+        try:
+            updated = bulk_update_food_entries(db, filters, set_food, set_calories, scale_calories, new_date)
+        except ValueError as e:
+            typer.echo(str(e))
+            raise typer.Exit(code=1)
+        typer.echo(f"Updated {updated} food entries")
+
+@app.command()
+def bulk_delete(
+    user_id: Optional[int] = typer.Option(None, "--user-id", help="Only entries of this user"),
+    start_date: Optional[str] = typer.Option(None, "--start-date", help="Only entries on or after this date (YYYY-MM-DD)"),
+    end_date: Optional[str] = typer.Option(None, "--end-date", help="Only entries on or before this date (YYYY-MM-DD)"),
+    food: Optional[str] = typer.Option(None, "--food", help="Only entries with exactly this food name"),
+    min_calories: Optional[int] = typer.Option(None, "--min-calories", help="Only entries with at least this many calories"),
+    max_calories: Optional[int] = typer.Option(None, "--max-calories", help="Only entries with at most this many calories"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only count the matching entries")
+):
+    """Delete every food entry matching the filters with a single DELETE."""
+    filters = _entry_filter(user_id, start_date, end_date, food, min_calories, max_calories)
+
+    with get_db() as db:
+        if dry_run:
+            typer.echo(f"Would delete {count_food_entries(db, filters)} food entries")
+            return
+        deleted = bulk_delete_food_entries(db, filters)
+        typer.echo(f"Deleted {deleted} food entries")
+
+@app.command()
+def search(
+    query: str = typer.Argument(..., help="Words to look for; each matches the start of a word in the food name"),
+    user_id: Optional[int] = typer.Option(None, "--user-id", help="Only entries of this user"),
+    start_date: Optional[str] = typer.Option(None, "--start-date", help="Only entries on or after this date (YYYY-MM-DD)"),
+    end_date: Optional[str] = typer.Option(None, "--end-date", help="Only entries on or before this date (YYYY-MM-DD)"),
+    limit: int = typer.Option(20, "--limit", min=1, help="Maximum number of entries to list")
+):
+    """Search food entries by food name, best match first, then newest."""
+    filters = FoodEntryFilter(user_id=user_id, start_date=_parse_date_option(start_date), end_date=_parse_date_option(end_date))
+    with get_db() as db:
+        entries = search_food_entries(db, query, filters, limit)
+        if not entries:
+            typer.echo("No matching food entries")
+            return
+        for e in entries:
+            typer.echo(f"ID: {e.id}, User: {e.user_id}, Food: {e.food}, Calories: {e.calories}, Date: {e.date}")
+
 if __name__ == "__main__":
     app()
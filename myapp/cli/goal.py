@@ -1,8 +1,10 @@
 import typer
 from typing import Optional
+from sqlalchemy.exc import IntegrityError
 from myapp.controllers.goal_controller import (
-    create_goal, get_goals_by_user, update_goal, delete_goal
+    create_goal, get_goals_by_user, iter_goals_by_user, update_goal, delete_goal
 )
+from myapp.cli.listing import page_kwargs, write_rows
 from myapp.db.db import get_db
 
 app = typer.Typer(help="Goal management commands")
@@ -15,16 +17,28 @@ def add_goal(
 ):
     """Create a new goal for a user."""
     with get_db() as db:
-        goal = create_goal(db, user_id, daily, weekly)
+        try:
+            goal = create_goal(db, user_id, daily, weekly)
+        except IntegrityError:
+            db.rollback()
+            typer.echo("User not found")
+            raise typer.Exit(code=1)
         typer.echo(f"Goal created with ID {goal.id}")
 
 @app.command()
-def list_goals(user_id: int = typer.Argument(..., help="ID of the user")):
+def list_goals(
+    user_id: int = typer.Argument(..., help="ID of the user"),
+    after_id: Optional[int] = typer.Option(None, "--after-id", help="Only list goals with an ID greater than this"),
+    limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Maximum number of goals to list"),
+    stream: bool = typer.Option(False, "--stream", help="Stream rows from the database instead of loading them all first")
+):
     """List all goals for a user."""
     with get_db() as db:
-        goals = get_goals_by_user(db, user_id)
-        for goal in goals:
-            typer.echo(f"ID: {goal.id}, Daily: {goal.daily}, Weekly: {goal.weekly}")
+        if stream:
+            rows = iter_goals_by_user(db, user_id, after_id=after_id, limit=limit)
+        else:
+            rows = get_goals_by_user(db, user_id, **page_kwargs(after_id, limit))
+        write_rows(rows, lambda goal: f"ID: {goal.id}, Daily: {goal.daily}, Weekly: {goal.weekly}", limit)
 
 @app.command()
 def update_goal_cmd(
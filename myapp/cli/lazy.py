@@ -0,0 +1,51 @@
+import importlib
+import click
+import typer
+from typer.core import TyperGroup
+
+class LazyTyperGroup(TyperGroup):
+    """A Typer group whose sub-apps are only imported when they are invoked.
+
+    Subclasses map each sub-command name to the module defining its `app`
+    and the one-line help shown in the parent's command list, so `--help`
+    can be rendered without importing SQLAlchemy, the controllers or the
+    models. A "module:attribute" target loads a single-command Typer app
+    as a plain command instead of a group.
+    """
+
+    lazy_subcommands: dict[str, tuple[str, str]] = {}
+
+    def __init__(self, **attrs):
+        super().__init__(**attrs)
+        self._describing = False
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str):
+        if cmd_name in self.commands or cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+        module_name, help_text = self.lazy_subcommands[cmd_name]
+        if self._describing:
+            # Listing commands in the help screen only needs the summary
+            return click.Command(cmd_name, help=help_text)
+        return self._load(cmd_name, module_name, help_text)
+
+    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        self._describing = True
+        try:
+            return super().format_help(ctx, formatter)
+        finally:
+            self._describing = False
+
+    def _load(self, cmd_name: str, target: str, help_text: str) -> click.Command:
+        module_name, _, attribute = target.partition(":")
+        module = importlib.import_module(module_name)
+        if attribute:
+            command = typer.main.get_command(getattr(module, attribute))
+        else:
+            command = typer.main.get_group(module.app)
+        command.name = cmd_name
+        command.help = command.help or help_text
+        self.add_command(command, cmd_name)
+        return command
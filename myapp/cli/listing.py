@@ -0,0 +1,53 @@
+"""Helpers shared by the list-* commands: paging options and buffered output."""
+import typer
+
+
+class LineWriter:
+    """Collect output lines and write them in blocks.
+
+    One typer.echo call per row costs a write() per row; joining a block of
+    lines first keeps long listings cheap without holding them all in memory.
+    """
+
+    def __init__(self, buffer_size: int = 1000):
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._lines = []
+
+    def write(self, line: str):
+        self._lines.append(line)
+        self.count += 1
+        if len(self._lines) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            typer.echo("\n".join(self._lines))
+            self._lines = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+
+def page_kwargs(after_id: int | None, limit: int | None) -> dict:
+    """Keyword arguments for a paginated controller call, omitting unset ones."""
+    kwargs = {}
+    if after_id is not None:
+        kwargs["after_id"] = after_id
+    if limit is not None:
+        kwargs["limit"] = limit
+    return kwargs
+
+
+def write_rows(rows, format_row, limit: int | None = None):
+    """Write one formatted line per row and point at the next page if there is one."""
+    last_id = None
+    with LineWriter() as out:
+        for row in rows:
+            out.write(format_row(row))
+            last_id = row.id
+    if limit is not None and out.count == limit:
+        typer.echo(f"More results: --after-id {last_id}", err=True)
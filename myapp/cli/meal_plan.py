@@ -1,8 +1,10 @@
 import typer
 from typing import Optional
+from sqlalchemy.exc import IntegrityError
 from myapp.controllers.meal_plan_controller import (
-    create_meal_plan, get_meal_plans_by_user, update_meal_plan, delete_meal_plan
+    create_meal_plan, get_meal_plans_by_user, iter_meal_plans_by_user, update_meal_plan, delete_meal_plan
 )
+from myapp.cli.listing import page_kwargs, write_rows
 from myapp.db.db import get_db
 
 app = typer.Typer(help="Meal planning commands")
@@ -15,16 +17,28 @@ def add_meal_plan(
 ):
     """Create a new meal plan for a user."""
     with get_db() as db:
-        mp = create_meal_plan(db, user_id, week, plan)
+        try:
+            mp = create_meal_plan(db, user_id, week, plan)
+        except IntegrityError:
+            db.rollback()
+            typer.echo("User not found")
+            raise typer.Exit(code=1)
         typer.echo(f"Meal plan created with ID {mp.id}")
 
 @app.command()
-def list_meal_plans(user_id: int = typer.Argument(..., help="ID of the user")):
+def list_meal_plans(
+    user_id: int = typer.Argument(..., help="ID of the user"),
+    after_id: Optional[int] = typer.Option(None, "--after-id", help="Only list meal plans with an ID greater than this"),
+    limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Maximum number of meal plans to list"),
+    stream: bool = typer.Option(False, "--stream", help="Stream rows from the database instead of loading them all first")
+):
     """List all meal plans for a user."""
     with get_db() as db:
-        plans = get_meal_plans_by_user(db, user_id)
-        for p in plans:
-            typer.echo(f"ID: {p.id}, Week: {p.week}, Plan: {p.plan}")
+        if stream:
+            rows = iter_meal_plans_by_user(db, user_id, after_id=after_id, limit=limit)
+        else:
+            rows = get_meal_plans_by_user(db, user_id, **page_kwargs(after_id, limit))
+        write_rows(rows, lambda p: f"ID: {p.id}, Week: {p.week}, Plan: {p.plan}", limit)
 
 @app.command()
 def update_meal_plan_cmd(
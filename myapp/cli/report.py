@@ -1,7 +1,17 @@
+import contextlib
+import json
+import sys
+import time
 import typer
-from datetime import datetime
+from typing import Optional
+from datetime import date, datetime
 from myapp.db.db import get_db
-from myapp.controllers.report_controller import generate_user_report
+from myapp.analytics.food_stats import TOP_FOODS_BY, FoodStats
+from myapp.cli.rows import format_for, open_source, parse_rows, read_rows
+from myapp.controllers.report_controller import (
+    calorie_histogram, generate_user_report, generate_user_reports, generate_user_trends, get_cached_user_report, top_foods
+)
+from myapp.controllers.report_cache import get_report_cache
 
 app = typer.Typer(help="Report generation commands")
 
@@ -9,7 +19,8 @@ app = typer.Typer(help="Report generation commands")
 def user_report(
     user_id: int = typer.Argument(..., help="ID of the user"),
     start_date: str = typer.Argument(..., help="Start date in YYYY-MM-DD format"),
-    end_date: str = typer.Argument(..., help="End date in YYYY-MM-DD format")
+    end_date: str = typer.Argument(..., help="End date in YYYY-MM-DD format"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Recompute the report instead of using the report cache")
 ):
     """Generate a nutrition report for a user within a date range."""
     try:
@@ -20,7 +31,10 @@ def user_report(
         raise typer.Exit(code=1)
 
     with get_db() as db:
-        report = generate_user_report(db, user_id, start, end)
+        if no_cache:
+            report = generate_user_report(db, user_id, start, end)
+        else:
+            report = get_cached_user_report(db, user_id, start, end)
 
     if not report or report['total_entries'] == 0:
         typer.echo(f"📋 Report for User ID {user_id} from {start} to {end}:")
@@ -58,5 +72,198 @@ def user_report(
         for date_str, calories in report['daily_breakdown'].items():
             typer.echo(f"{date_str}: {calories:,} calories")
 
+def _format_change(week: dict) -> str:
+    if week['change'] is None:
+        return "-"
+    percent = f" ({week['change_percent']:+}%)" if week['change_percent'] is not None else ""
+    return f"{week['change']:+,}{percent}"
+
+@app.command()
+def trends(
+    user_id: int = typer.Argument(..., help="ID of the user"),
+    start_date: str = typer.Argument(..., help="Start date in YYYY-MM-DD format"),
+    end_date: str = typer.Argument(..., help="End date in YYYY-MM-DD format"),
+    daily: bool = typer.Option(False, "--daily", help="Also list every day with its rolling averages"),
+    as_json: bool = typer.Option(False, "--json", help="Print the full result as JSON"),
+    engine: str = typer.Option("auto", "--engine", help="auto, python or numpy")
+):
+    """Show rolling averages, week-over-week changes and goal streaks for a user."""
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except ValueError:
+        typer.echo("❌ Invalid date format. Use YYYY-MM-DD.")
+        raise typer.Exit(code=1)
+    if engine not in ("auto", "python", "numpy"):
+        typer.echo("❌ Invalid engine. Use auto, python or numpy.")
+        raise typer.Exit(code=1)
+
+    with get_db() as db:
+        try:
+            result = generate_user_trends(db, user_id, start, end, use_numpy={"auto": None, "python": False, "numpy": True}[engine])
+        except (ValueError, RuntimeError) as e:
+            typer.echo(f"❌ {e}")
+            raise typer.Exit(code=1)
+
+    if as_json:
+        typer.echo(json.dumps(result, default=date.isoformat, indent=2))
+        return
+
+    typer.echo(f"\n📈 TRENDS for User ID {user_id}")
+    typer.echo(f"📅 Period: {start} to {end} ({result['days_in_period']} days, {result['days_tracked']} tracked)")
+    typer.echo("=" * 50)
+    if result['days_tracked'] == 0:
+        typer.echo("No food entries found for this period.")
+        return
+
+    latest = result['daily'][-1]
+    typer.echo(f"Average daily calories: {result['avg_daily_calories']:,}")
+    typer.echo(f"Standard deviation: {result['stddev_daily_calories']:,}")
+    for key, label in (("rolling_7", "7-day"), ("rolling_30", "30-day")):
+        value = latest[key]
+        typer.echo(f"{label} average on {latest['date']}: {f'{value:,}' if value is not None else '-'}")
+    if result['daily_goal'] is not None:
+        typer.echo(f"\n🎯 Days at or under the {result['daily_goal']:,} calorie goal: "
+                   f"current streak {result['current_streak_under_goal']}, longest {result['longest_streak_under_goal']}")
+
+    typer.echo("\n📊 WEEK OVER WEEK")
+    for week in result['weeks']:
+        average = f"{week['avg_daily_calories']:,}" if week['avg_daily_calories'] is not None else "-"
+        typer.echo(f"{week['week_start']}: {week['calories']:,} calories, {week['days_tracked']} days tracked, "
+                   f"avg {average}, change {_format_change(week)}")
+
+    if daily:
+        typer.echo("\n📆 DAILY")
+        for row in result['daily']:
+            values = [f"{row[key]:,}" if row[key] is not None else "-" for key in ("calories", "rolling_7", "rolling_30")]
+            typer.echo(f"{row['date']}: {values[0]} calories, 7-day {values[1]}, 30-day {values[2]}")
+
+HISTOGRAM_WIDTH = 40
+
+def _stream_food_stats(path: str, fmt: Optional[str], start: date, end: date, user_id: Optional[int], bucket: int) -> FoodStats:
+    # One pass over the rows; only the per-food totals and bucket counts are kept
+    stats = FoodStats(bucket)
+    with open_source(path) as source:
+        for row in parse_rows(read_rows(source, format_for(path, fmt)), None, require_user=False):
+            if start <= row["date"] <= end and (user_id is None or row["user_id"] == user_id):
+                stats.add(row["food"], row["calories"])
+    return stats
+
+@app.command("top-foods")
+def top_foods_cmd(
+    start_date: str = typer.Argument(..., help="Start date in YYYY-MM-DD format"),
+    end_date: str = typer.Argument(..., help="End date in YYYY-MM-DD format"),
+    user_id: Optional[int] = typer.Option(None, "--user-id", help="Only this user's entries (default: every user)"),
+    limit: int = typer.Option(10, "--limit", "-n", min=1, help="Number of foods to show"),
+    by: str = typer.Option("calories", "--by", help="Rank by total calories or by number of entries"),
+    bucket: int = typer.Option(100, "--bucket", min=1, help="Histogram bucket width in calories"),
+    per_day: bool = typer.Option(False, "--per-day", help="Histogram of daily totals instead of single entries"),
+    input_path: Optional[str] = typer.Option(None, "--input", help="Read entries from a CSV or NDJSON file ('-' for stdin) instead of the database"),
+    fmt: Optional[str] = typer.Option(None, "--format", help="Input format: csv or ndjson (default: from the file extension, else csv)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the result as JSON")
+):
+    """Show the top foods by calories or frequency and a calorie histogram."""
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except ValueError:
+        typer.echo("❌ Invalid date format. Use YYYY-MM-DD.")
+        raise typer.Exit(code=1)
+    if by not in TOP_FOODS_BY:
+        typer.echo(f"❌ Invalid ranking. Use {' or '.join(TOP_FOODS_BY)}.")
+        raise typer.Exit(code=1)
+    if input_path is not None and format_for(input_path, fmt) not in ("csv", "ndjson"):
+        typer.echo("❌ Invalid format. Use csv or ndjson.")
+        raise typer.Exit(code=1)
+    if input_path is not None and per_day:
+        typer.echo("❌ --per-day reads the daily totals and cannot be used with --input.")
+        raise typer.Exit(code=1)
+
+    if input_path is not None:
+        try:
+            stats = _stream_food_stats(input_path, fmt, start, end, user_id, bucket)
+        except (OSError, ValueError) as e:
+            typer.echo(f"❌ {e}")
+            raise typer.Exit(code=1)
+        foods, histogram = stats.top(limit, by), stats.histogram()
+    else:
+        with get_db() as db:
+            foods = top_foods(db, start, end, user_id, limit, by)
+            histogram = calorie_histogram(db, start, end, user_id, bucket, per_day)
+
+    if as_json:
+        typer.echo(json.dumps({"foods": foods, "histogram": histogram}, indent=2))
+        return
+
+    scope = f"User ID {user_id}" if user_id is not None else "all users"
+    typer.echo(f"\n🍽️ TOP FOODS BY {by.upper()} for {scope}")
+    typer.echo(f"📅 Period: {start} to {end}")
+    typer.echo("=" * 50)
+    if not foods:
+        typer.echo("No food entries found for this period.")
+        return
+
+    for rank, row in enumerate(foods, start=1):
+        typer.echo(f"{rank:>2}. {row['food']}: {row['calories']:,} calories, {row['entries']:,} entries ({row['share']}%)")
+
+    typer.echo(f"\n📊 CALORIES PER {'DAY' if per_day else 'ENTRY'}")
+    largest = max(row['count'] for row in histogram)
+    labels = [f"{row['low']:,}-{row['high'] - 1:,}" for row in histogram]
+    label_width = max(map(len, labels))
+    for previous, label, row in zip([None] + histogram, labels, histogram):
+        if previous is not None and previous['high'] != row['low']:
+            # Empty buckets left out of a wide histogram
+            typer.echo(f"{'...':>{label_width}} |")
+        bar = "█" * round(row['count'] / largest * HISTOGRAM_WIDTH)
+        typer.echo(f"{label:>{label_width}} | {bar} {row['count']:,}")
+
+def _open_output(path: str):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdout)
+    return open(path, "w", encoding="utf-8")
+
+@app.command()
+def all_users(
+    start_date: str = typer.Argument(..., help="Start date in YYYY-MM-DD format"),
+    end_date: str = typer.Argument(..., help="End date in YYYY-MM-DD format"),
+    output: str = typer.Option("-", "--output", "-o", help="NDJSON output file ('-' for stdout)"),
+    workers: int = typer.Option(1, "--workers", min=1, help="Worker processes; 1 runs the batch queries in-process"),
+    chunk_size: int = typer.Option(1000, "--chunk-size", min=1, help="Users per batch query")
+):
+    """Generate reports for every user as NDJSON, one report per line."""
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except ValueError:
+        typer.echo("❌ Invalid date format. Use YYYY-MM-DD.", err=True)
+        raise typer.Exit(code=1)
+
+    started = time.perf_counter()
+    count = 0
+    with get_db() as db, _open_output(output) as out:
+        if workers > 1:
+            from myapp.controllers.batch_report_controller import generate_user_reports_parallel
+            reports = generate_user_reports_parallel(db, start, end, workers, chunk_size=chunk_size)
+        else:
+            reports = generate_user_reports(db, start, end, chunk_size=chunk_size)
+        for report in reports:
+            out.write(json.dumps(report, default=date.isoformat) + "\n")
+            count += 1
+
+    elapsed = time.perf_counter() - started
+    typer.echo(f"Wrote {count} reports in {elapsed:.2f}s", err=True)
+
+# The counters live in memory, so a one-shot run would always print zeros:
+# the shell and daemon add this to 'report' for the life of their process
+cache_stats_app = typer.Typer(add_completion=False)
+
+@cache_stats_app.command()
+def cache_stats():
+    """Show report cache hit and miss counters for this shell or daemon."""
+    with get_db() as db:
+        stats = get_report_cache(db).stats()
+    for name, value in stats.items():
+        typer.echo(f"{name}: {value}")
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,57 @@
+"""Helpers shared by the commands that read food entry rows from CSV or NDJSON."""
+import contextlib
+import csv
+import json
+import sys
+from datetime import datetime
+
+
+def open_source(path: str):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin)
+    return open(path, newline="", encoding="utf-8")
+
+
+def format_for(path: str, fmt: str | None) -> str:
+    """The --format value, defaulting from the file extension."""
+    if fmt is None:
+        fmt = "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+    return fmt
+
+
+def read_rows(source, fmt: str):
+    # readline() rather than iterating the file: click's wrapped stdin turns
+    # StopIteration into EOFError. NDJSON lines are yielded undecoded so
+    # parse_rows can name the row a decoding error is in.
+    lines = iter(source.readline, "")
+    if fmt == "csv":
+        yield from csv.DictReader(lines)
+    else:
+        for line in lines:
+            if line.strip():
+                yield line
+
+
+def parse_rows(rows, default_user_id: int | None, require_user: bool = True):
+    """Validate rows into dicts with user_id, food, calories and date.
+
+    Errors name the row. Without `require_user` a row may lack a user_id
+    when no default is given; its user_id is then None.
+    """
+    for line_no, row in enumerate(rows, start=1):
+        try:
+            if isinstance(row, str):
+                row = json.loads(row)
+            if not isinstance(row, dict):
+                raise ValueError(f"expected an object, got {type(row).__name__}")
+            user_id = row.get("user_id") or default_user_id
+            if user_id is None and require_user:
+                raise ValueError("missing user_id")
+            yield {
+                "user_id": int(user_id) if user_id is not None else None,
+                "food": row["food"],
+                "calories": int(row["calories"]),
+                "date": datetime.strptime(row["date"], "%Y-%m-%d").date(),
+            }
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Row {line_no}: {exc}") from exc
@@ -1,8 +1,10 @@
 import typer
 from typing import Optional
 from myapp.controllers.user_controller import (
-    create_user, get_user_by_name, get_all_users, update_user, delete_user
+    create_user, get_user_by_name, get_all_users, iter_all_users, update_user, delete_user,
+    get_user as get_user_by_id, count_user_food_entries, purge_user
 )
+from myapp.cli.listing import page_kwargs, write_rows
 from myapp.db.db import get_db
 
 app = typer.Typer(help="User management commands")
@@ -25,12 +27,18 @@ def get_user(name: str = typer.Argument(..., help="Name of the user to find")):
             typer.echo("User not found")
 
 @app.command()
-def list_users():
+def list_users(
+    after_id: Optional[int] = typer.Option(None, "--after-id", help="Only list users with an ID greater than this"),
+    limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Maximum number of users to list"),
+    stream: bool = typer.Option(False, "--stream", help="Stream rows from the database instead of loading them all first")
+):
     """List all users."""
     with get_db() as db:
-        users = get_all_users(db)
-        for user in users:
-            typer.echo(f"ID: {user.id}, Name: {user.name}")
+        if stream:
+            rows = iter_all_users(db, after_id=after_id, limit=limit)
+        else:
+            rows = get_all_users(db, **page_kwargs(after_id, limit))
+        write_rows(rows, lambda user: f"ID: {user.id}, Name: {user.name}", limit)
 
 @app.command()
 def update_user_cmd(
@@ -52,6 +60,23 @@ def delete_user_cmd(user_id: int = typer.Argument(..., help="ID of the user to d
         success = delete_user(db, user_id)
         typer.echo("User deleted" if success else "User not found")
 
+@app.command()
+def purge(
+    user_id: int = typer.Argument(..., help="ID of the user to purge"),
+    chunk_size: int = typer.Option(5000, "--chunk-size", min=1, help="Food entries deleted per transaction")
+):
+    """Delete a user and all of their data in chunks, showing progress."""
+    with get_db() as db:
+        if not get_user_by_id(db, user_id):
+            typer.echo("User not found")
+            raise typer.Exit(code=1)
+
+        total = count_user_food_entries(db, user_id)
+        with typer.progressbar(length=total, label="Deleting food entries") as progress:
+            for deleted in purge_user(db, user_id, chunk_size):
+                progress.update(deleted)
+        typer.echo(f"Purged user {user_id} and {total} food entries")
+
 
 if __name__ == "__main__":
     app()
\ No newline at end of file
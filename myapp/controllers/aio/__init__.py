@@ -0,0 +1 @@
+# Async controllers mirroring myapp.controllers for use with AsyncSession
@@ -0,0 +1,54 @@
+from collections.abc import Iterable
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from myapp.controllers.aio.lookup import get_many
+from myapp.controllers.pagination import keyset
+from myapp.controllers.aio.transaction import save
+from myapp.controllers.food_entry_controller import check_food_name, new_food_entry
+from myapp.controllers.report_cache import invalidate_reports
+from datetime import date
+from myapp.models.food_entry import FoodEntry
+
+async def create_food_entry(db: AsyncSession, user_id: int, food: str, calories: int | None, entry_date: date) -> FoodEntry:
+    new_entry = await db.run_sync(new_food_entry, user_id, food, calories, entry_date)
+    db.add(new_entry)
+    await save(db, new_entry)
+    invalidate_reports(db, user_id, entry_date, entry_date)
+    return new_entry
+
+async def get_food_entry(db: AsyncSession, entry_id: int) -> FoodEntry | None:
+    return await db.get(FoodEntry, entry_id)
+
+async def get_food_entries(db: AsyncSession, entry_ids: Iterable[int]) -> list[FoodEntry]:
+    return await get_many(db, FoodEntry, entry_ids)
+
+async def get_food_entries_by_user(db: AsyncSession, user_id: int, after_id: int | None = None, limit: int | None = None) -> list[FoodEntry]:
+    return list(await db.scalars(keyset(select(FoodEntry).where(FoodEntry.user_id == user_id), FoodEntry.id, after_id, limit)))
+
+async def update_food_entry(db: AsyncSession, entry_id: int, food: str | None = None, calories: int | None = None, entry_date: date | None = None) -> FoodEntry | None:
+    check_food_name(food)
+    entry = await get_food_entry(db, entry_id)
+    if not entry:
+        return None
+    old_user_id, old_date = entry.user_id, entry.date
+    if food is not None:
+        entry.food = food
+    if calories is not None:
+        entry.calories = calories
+    if entry_date is not None:
+        entry.date = entry_date
+    await save(db, entry)
+    invalidate_reports(db, old_user_id, old_date, old_date)
+    if entry_date is not None and entry_date != old_date:
+        invalidate_reports(db, old_user_id, entry_date, entry_date)
+    return entry
+
+async def delete_food_entry(db: AsyncSession, entry_id: int) -> bool:
+    entry = await get_food_entry(db, entry_id)
+    if not entry:
+        return False
+    user_id, entry_date = entry.user_id, entry.date
+    await db.delete(entry)
+    await save(db)
+    invalidate_reports(db, user_id, entry_date, entry_date)
+    return True
@@ -0,0 +1,47 @@
+from collections.abc import Iterable
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from myapp.controllers.aio.lookup import get_many
+from myapp.controllers.pagination import keyset
+from myapp.controllers.aio.transaction import save
+from myapp.controllers.report_cache import invalidate_reports
+from myapp.models.goal import Goal
+
+async def create_goal(db: AsyncSession, user_id: int, daily: int, weekly: int) -> Goal:
+    new_goal = Goal(user_id=user_id, daily=daily, weekly=weekly)
+    db.add(new_goal)
+    await save(db, new_goal)
+    # Reports compare against the latest goal whatever their range
+    invalidate_reports(db, user_id)
+    return new_goal
+
+async def get_goal(db: AsyncSession, goal_id: int) -> Goal | None:
+    return await db.get(Goal, goal_id)
+
+async def get_goals(db: AsyncSession, goal_ids: Iterable[int]) -> list[Goal]:
+    return await get_many(db, Goal, goal_ids)
+
+async def get_goals_by_user(db: AsyncSession, user_id: int, after_id: int | None = None, limit: int | None = None) -> list[Goal]:
+    return list(await db.scalars(keyset(select(Goal).where(Goal.user_id == user_id), Goal.id, after_id, limit)))
+
+async def update_goal(db: AsyncSession, goal_id: int, daily: int | None = None, weekly: int | None = None) -> Goal | None:
+    goal = await get_goal(db, goal_id)
+    if not goal:
+        return None
+    if daily is not None:
+        goal.daily = daily
+    if weekly is not None:
+        goal.weekly = weekly
+    await save(db, goal)
+    invalidate_reports(db, goal.user_id)
+    return goal
+
+async def delete_goal(db: AsyncSession, goal_id: int) -> bool:
+    goal = await get_goal(db, goal_id)
+    if not goal:
+        return False
+    user_id = goal.user_id
+    await db.delete(goal)
+    await save(db)
+    invalidate_reports(db, user_id)
+    return True
@@ -0,0 +1,12 @@
+from collections.abc import Iterable
+from sqlalchemy.ext.asyncio import AsyncSession
+from myapp.controllers.lookup import get_many_statements
+
+async def get_many(db: AsyncSession, model, ids: Iterable[int]) -> list:
+    # Async counterpart of myapp.controllers.lookup.get_many
+    ids = list(dict.fromkeys(ids))
+    found, statements = get_many_statements(db, model, ids)
+    for stmt in statements:
+        for obj in await db.scalars(stmt):
+            found[obj.id] = obj
+    return [found[ident] for ident in ids if ident in found]
@@ -0,0 +1,41 @@
+from collections.abc import Iterable
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from myapp.controllers.aio.lookup import get_many
+from myapp.controllers.pagination import keyset
+from myapp.controllers.aio.transaction import save
+from myapp.models.meal_plan import MealPlan
+
+async def create_meal_plan(db: AsyncSession, user_id: int, week: int, plan: str) -> MealPlan:
+    new_plan = MealPlan(user_id=user_id, week=week, plan=plan)
+    db.add(new_plan)
+    await save(db, new_plan)
+    return new_plan
+
+async def get_meal_plan(db: AsyncSession, plan_id: int) -> MealPlan | None:
+    return await db.get(MealPlan, plan_id)
+
+async def get_meal_plans(db: AsyncSession, plan_ids: Iterable[int]) -> list[MealPlan]:
+    return await get_many(db, MealPlan, plan_ids)
+
+async def get_meal_plans_by_user(db: AsyncSession, user_id: int, after_id: int | None = None, limit: int | None = None) -> list[MealPlan]:
+    return list(await db.scalars(keyset(select(MealPlan).where(MealPlan.user_id == user_id), MealPlan.id, after_id, limit)))
+
+async def update_meal_plan(db: AsyncSession, plan_id: int, week: int | None = None, plan: str | None = None) -> MealPlan | None:
+    meal_plan = await get_meal_plan(db, plan_id)
+    if not meal_plan:
+        return None
+    if week is not None:
+        meal_plan.week = week
+    if plan is not None:
+        meal_plan.plan = plan
+    await save(db, meal_plan)
+    return meal_plan
+
+async def delete_meal_plan(db: AsyncSession, plan_id: int) -> bool:
+    meal_plan = await get_meal_plan(db, plan_id)
+    if not meal_plan:
+        return False
+    await db.delete(meal_plan)
+    await save(db)
+    return True
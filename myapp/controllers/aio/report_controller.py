@@ -0,0 +1,11 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from myapp.controllers.report_controller import build_report, daily_rows_statement, latest_goal_statement
+
+async def generate_user_report(db: AsyncSession, user_id: int, start_date: date, end_date: date):
+    result = await db.execute(daily_rows_statement(user_id, start_date, end_date))
+    daily_rows = [(day, count, calories) for day, count, calories in result]
+
+    goal = (await db.scalars(latest_goal_statement(user_id))).first()
+
+    return build_report(user_id, start_date, end_date, daily_rows, goal)
@@ -0,0 +1,11 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from myapp.db.db import UNIT_OF_WORK
+
+async def save(db: AsyncSession, *objects) -> None:
+    # Async counterpart of myapp.controllers.transaction.save
+    if db.info.get(UNIT_OF_WORK) is True:
+        await db.flush()
+        return
+    await db.commit()
+    for obj in objects:
+        await db.refresh(obj)
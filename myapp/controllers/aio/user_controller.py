@@ -0,0 +1,46 @@
+from collections.abc import Iterable
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from myapp.controllers.aio.lookup import get_many
+from myapp.controllers.pagination import keyset
+from myapp.controllers.aio.transaction import save
+from myapp.controllers.report_cache import invalidate_reports
+from myapp.controllers.user_controller import delete_user_statements
+from myapp.models.user import User
+
+async def create_user(db: AsyncSession, name: str) -> User:
+    new_user = User(name=name)
+    db.add(new_user)
+    await save(db, new_user)
+    return new_user
+
+async def get_user(db: AsyncSession, user_id: int) -> User | None:
+    return await db.get(User, user_id)
+
+async def get_users(db: AsyncSession, user_ids: Iterable[int]) -> list[User]:
+    return await get_many(db, User, user_ids)
+
+async def get_user_by_name(db: AsyncSession, name: str) -> User | None:
+    return await db.scalar(select(User).where(User.name == name))
+
+async def get_all_users(db: AsyncSession, after_id: int | None = None, limit: int | None = None) -> list[User]:
+    return list(await db.scalars(keyset(select(User), User.id, after_id, limit)))
+
+async def update_user(db: AsyncSession, user_id: int, name: str | None = None) -> User | None:
+    user = await get_user(db, user_id)
+    if not user:
+        return None
+    if name is not None:
+        user.name = name
+    await save(db, user)
+    return user
+
+async def delete_user(db: AsyncSession, user_id: int) -> bool:
+    user = await get_user(db, user_id)
+    if not user:
+        return False
+    for stmt in delete_user_statements(user_id):
+        await db.execute(stmt)
+    await save(db)
+    invalidate_reports(db, user_id)
+    return True
@@ -0,0 +1,38 @@
+# myapp/controllers/batch_report_controller.py
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from datetime import date
+from itertools import repeat
+from sqlalchemy.orm import Session
+from myapp.db import database
+from myapp.db.config import DatabaseConfig
+from myapp.controllers.report_controller import generate_user_reports, user_id_chunks
+
+# Session of the current worker process, opened by _init_worker
+_worker_db: Session | None = None
+
+def worker_config(db: Session, config: DatabaseConfig | None = None) -> DatabaseConfig:
+    # Workers open the same database as the parent session, read-only
+    config = config or database.config
+    return replace(
+        config,
+        url=db.get_bind().url.render_as_string(hide_password=False),
+        echo=False,
+        pragmas={**config.pragmas, "query_only": "ON"},
+    )
+
+def _init_worker(config: DatabaseConfig) -> None:
+    global _worker_db
+    _worker_db = Session(database.create_engine_from_config(config))
+
+def _report_shard(user_ids: list[int], start_date: date, end_date: date) -> list[dict]:
+    return list(generate_user_reports(_worker_db, start_date, end_date, user_ids=user_ids, chunk_size=len(user_ids)))
+
+def generate_user_reports_parallel(db: Session, start_date: date, end_date: date, workers: int, user_ids: Iterable[int] | None = None, chunk_size: int = 1000, config: DatabaseConfig | None = None) -> Iterator[dict]:
+    # Shards users into chunks and reports each chunk in a worker process with
+    # its own read-only connection. Reports are yielded in user order.
+    chunks = user_id_chunks(db, user_ids, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(worker_config(db, config),)) as pool:
+        for reports in pool.map(_report_shard, chunks, repeat(start_date), repeat(end_date)):
+            yield from reports
@@ -0,0 +1,51 @@
+from collections.abc import Iterator, Sequence
+from sqlalchemy import Row, select, text
+from sqlalchemy.orm import Session
+from myapp.models.food import Food
+from myapp.models.food_entry import FoodEntry
+from myapp.models.goal import Goal
+from myapp.models.meal_plan import MealPlan
+
+EXPORT_BATCH_SIZE = 1000
+
+# Table name -> (model, columns written); rows come out in id order, so the
+# last id written is the high-water mark for the next incremental export.
+# The tables are AUTOINCREMENT, so a deleted row's id is never issued again.
+EXPORTS = {
+    "food_entries": (FoodEntry, (FoodEntry.id, FoodEntry.user_id, Food.name.label("food"), FoodEntry.calories, FoodEntry.date)),
+    "goals": (Goal, (Goal.id, Goal.user_id, Goal.daily, Goal.weekly)),
+    "meal_plans": (MealPlan, (MealPlan.id, MealPlan.user_id, MealPlan.week, MealPlan.plan)),
+}
+
+def export_columns(table: str) -> list[str]:
+    return [column.key for column in EXPORTS[table][1]]
+
+def last_issued_id(db: Session, table: str) -> int:
+    # The largest id the table has ever had, kept by SQLite for AUTOINCREMENT
+    # tables even after that row is deleted
+    return db.scalar(text("SELECT seq FROM sqlite_sequence WHERE name = :name"), {"name": table}) or 0
+
+def iter_export_batches(db: Session, table: str, user_id: int | None = None, since: int | None = None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Sequence[Row]]:
+    # Plain rows, batch_size at a time from a streaming cursor, so memory
+    # stays flat however many rows the table has. `since` skips rows up to
+    # and including that id. A mark past every id ever issued comes from a
+    # database that has been replaced since, whose new rows may sit below
+    # it: that raises ValueError here rather than exporting nothing.
+    if since is not None and since > (last_issued := last_issued_id(db, table)):
+        raise ValueError(
+            f"High-water mark {since} is past the last {table} id ever issued ({last_issued}); "
+            "the database was replaced since that export, so export it in full"
+        )
+    return _export_batches(db, table, user_id, since, batch_size)
+
+def _export_batches(db: Session, table: str, user_id: int | None, since: int | None, batch_size: int) -> Iterator[Sequence[Row]]:
+    model, columns = EXPORTS[table]
+    stmt = select(*columns)
+    if model is FoodEntry:
+        stmt = stmt.join(Food, Food.id == FoodEntry.food_id)
+    if user_id is not None:
+        stmt = stmt.where(model.user_id == user_id)
+    if since is not None:
+        stmt = stmt.where(model.id > since)
+    result = db.execute(stmt.order_by(model.id), execution_options={"yield_per": batch_size})
+    yield from result.partitions()
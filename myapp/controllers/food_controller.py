@@ -0,0 +1,140 @@
+# myapp/controllers/food_controller.py
+import re
+import threading
+import weakref
+from sqlalchemy import column, event, func, literal_column, or_, select, table, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, make_transient_to_detached
+from myapp.controllers.pagination import keyset
+from myapp.models.food import Food, normalize_food_name
+
+# Session.info key for catalog rows seen by the open transaction; they reach
+# the shared cache only once it commits, so a rollback cannot leave an id
+# behind that no longer exists
+PENDING_FOODS = "pending_foods"
+
+# (id, name, default_calories)
+CachedFood = tuple[int, str, int | None]
+
+_lock = threading.Lock()
+# normalized name -> catalog row, per engine
+_caches: "weakref.WeakKeyDictionary[Engine, dict[str, CachedFood]]" = weakref.WeakKeyDictionary()
+
+
+def _engine_cache(db: Session) -> dict[str, CachedFood]:
+    bind = db.get_bind()
+    engine = getattr(bind, "engine", bind)
+    with _lock:
+        cache = _caches.get(engine)
+        if cache is None:
+            cache = _caches[engine] = {}
+        return cache
+
+
+def _cached(db: Session, key: str) -> CachedFood | None:
+    pending = db.info.get(PENDING_FOODS)
+    if pending and key in pending:
+        return pending[key]
+    return _engine_cache(db).get(key)
+
+
+def _as_food(db: Session, row: CachedFood) -> Food:
+    # merge(load=False) attaches the cached row to the session without a SELECT
+    food_id, name, default_calories = row
+    food = Food(id=food_id, name=name, normalized_name=normalize_food_name(name), default_calories=default_calories)
+    make_transient_to_detached(food)
+    return db.merge(food, load=False)
+
+
+def get_or_create_food(db: Session, name: str, default_calories: int | None = None) -> Food:
+    # Repeated names are answered from the cache; a new name costs one upsert
+    # that returns the existing row if another writer created it first
+    key = normalize_food_name(name)
+    if not key:
+        raise ValueError("Food name cannot be empty")
+    row = _cached(db, key)
+    if row is None:
+        foods = Food.__table__
+        stmt = sqlite_insert(foods).values(name=" ".join(name.split()), normalized_name=key, default_calories=default_calories)
+        stmt = stmt.on_conflict_do_update(index_elements=[foods.c.normalized_name], set_={"normalized_name": stmt.excluded.normalized_name})
+        row = tuple(db.execute(stmt.returning(foods.c.id, foods.c.name, foods.c.default_calories)).one())
+        db.info.setdefault(PENDING_FOODS, {})[key] = row
+    return _as_food(db, row)
+
+
+def get_food_id(db: Session, name: str, default_calories: int | None = None) -> int:
+    key = normalize_food_name(name)
+    row = _cached(db, key)
+    return row[0] if row is not None else get_or_create_food(db, name, default_calories).id
+
+
+def get_food_by_name(db: Session, name: str) -> Food | None:
+    key = normalize_food_name(name)
+    row = _cached(db, key)
+    if row is not None:
+        return _as_food(db, row)
+    return db.scalars(select(Food).where(Food.normalized_name == key)).first()
+
+
+def food_id_statement(name: str):
+    # Catalog id for a name, for use inside other statements; matches nothing
+    # when the food has never been entered
+    return select(Food.id).where(Food.normalized_name == normalize_food_name(name)).scalar_subquery()
+
+
+def get_foods(db: Session, after_id: int | None = None, limit: int | None = None) -> list[Food]:
+    return list(db.scalars(keyset(select(Food), Food.id, after_id, limit)))
+
+
+def _search_index_exists(db: Session) -> bool:
+    # Missing when the database was created by a SQLite without FTS5
+    return db.scalar(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'foods_fts'")) is not None
+
+
+def search_foods_statement(db: Session, query: str):
+    # Catalog rows where every word of the query starts a word of the name,
+    # best match (bm25, which favours short names) first; None for a query
+    # without words. Callers may add conditions on Food before running it.
+    words = re.findall(r"\w+", query.casefold())
+    if not words:
+        return None
+    if not _search_index_exists(db):
+        return (
+            select(Food)
+            .where(*(or_(Food.normalized_name.startswith(word), Food.normalized_name.contains(" " + word)) for word in words))
+            .order_by(func.length(Food.name), Food.id)
+        )
+    fts = table("foods_fts", column("rowid"), column("rank"))
+    match = " ".join(f'"{word}"*' for word in words)
+    return (
+        select(Food).join(fts, fts.c.rowid == Food.id)
+        .where(literal_column("foods_fts").op("MATCH")(match))
+        .order_by(fts.c.rank, Food.id)
+    )
+
+
+def search_foods(db: Session, query: str, limit: int | None = 20) -> list[Food]:
+    stmt = search_foods_statement(db, query)
+    if stmt is None:
+        return []
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return list(db.scalars(stmt))
+
+
+def clear_food_cache() -> None:
+    with _lock:
+        _caches.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _share_pending_foods(session: Session) -> None:
+    pending = session.info.pop(PENDING_FOODS, None)
+    if pending:
+        _engine_cache(session).update(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_foods(session: Session) -> None:
+    session.info.pop(PENDING_FOODS, None)
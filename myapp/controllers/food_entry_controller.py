@@ -1,38 +1,268 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, fields
+from sqlalchemy import Integer, case, cast, delete, exists, func, insert, select, union_all, update
 from sqlalchemy.orm import Session
+from myapp.controllers.food_controller import food_id_statement, get_food_id, get_or_create_food, search_foods_statement
+from myapp.controllers.lookup import get_many
+from myapp.controllers.pagination import keyset
+from myapp.controllers.transaction import in_unit_of_work, save
+from myapp.controllers.report_cache import invalidate_reports
 from datetime import date
+from myapp.models.food import Food, normalize_food_name
 from myapp.models.food_entry import FoodEntry
 
-def create_food_entry(db: Session, user_id: int, food: str, calories: int, entry_date: date) -> FoodEntry:
-    new_entry = FoodEntry(user_id=user_id, food=food, calories=calories, date=entry_date)
+def new_food_entry(db: Session, user_id: int, food: str, calories: int | None, entry_date: date) -> FoodEntry:
+    # Without calories the catalog's default for the food is used. Shared
+    # with the async controller, which runs it through run_sync.
+    food_item = get_or_create_food(db, food, calories)
+    if calories is None:
+        calories = food_item.default_calories
+    if calories is None:
+        raise ValueError(f"No calories given and '{food_item.name}' has no default")
+    return FoodEntry(user_id=user_id, food_item=food_item, calories=calories, date=entry_date)
+
+def check_food_name(food: str | None) -> None:
+    # A new name is resolved to a catalog food at flush; reject a blank one
+    # before anything is changed
+    if food is not None and not normalize_food_name(food):
+        raise ValueError("Food name cannot be empty")
+
+def create_food_entry(db: Session, user_id: int, food: str, calories: int | None, entry_date: date) -> FoodEntry:
+    new_entry = new_food_entry(db, user_id, food, calories, entry_date)
     db.add(new_entry)
-    db.commit()
-    db.refresh(new_entry)
+    save(db, new_entry)
+    invalidate_reports(db, user_id, entry_date, entry_date)
     return new_entry
 
+def _food_entry_row(db: Session, entry: dict) -> dict:
+    if "food_id" in entry:
+        return entry
+    if entry["calories"] is None:
+        # As in create_food_entry: fall back to the catalog's default
+        food_item = get_or_create_food(db, entry["food"])
+        if food_item.default_calories is None:
+            raise ValueError(f"No calories given and '{food_item.name}' has no default")
+        food_id, calories = food_item.id, food_item.default_calories
+    else:
+        food_id, calories = get_food_id(db, entry["food"], entry["calories"]), entry["calories"]
+    return {"user_id": entry["user_id"], "food_id": food_id, "calories": calories, "date": entry["date"]}
+
+def _touch(touched: dict[int, tuple[date, date]], row: dict) -> None:
+    first, last = touched.get(row["user_id"], (row["date"], row["date"]))
+    touched[row["user_id"]] = (min(first, row["date"]), max(last, row["date"]))
+
+def bulk_create_food_entries(db: Session, entries: Iterable[dict], chunk_size: int = 1000) -> int:
+    # Each entry is a dict with user_id, food (or food_id), calories and date.
+    # Rows are inserted with executemany in chunks and committed once at the
+    # end, so the iterable is consumed lazily and nothing is refreshed. Inside
+    # a unit of work the commit (or rollback) is left to the caller.
+    owns_transaction = not in_unit_of_work(db)
+    inserted = 0
+    chunk = []
+    # (first, last) date written per user, for report cache invalidation
+    touched: dict[int, tuple[date, date]] = {}
+    try:
+        for entry in entries:
+            entry = _food_entry_row(db, entry)
+            chunk.append(entry)
+            _touch(touched, entry)
+            if len(chunk) >= chunk_size:
+                db.execute(insert(FoodEntry), chunk)
+                inserted += len(chunk)
+                chunk = []
+        if chunk:
+            db.execute(insert(FoodEntry), chunk)
+            inserted += len(chunk)
+        if owns_transaction:
+            db.commit()
+    except Exception:
+        if owns_transaction:
+            db.rollback()
+        raise
+    for user_id, (first, last) in touched.items():
+        invalidate_reports(db, user_id, first, last)
+    return inserted
+
+def create_food_entries(db: Session, entries: list[dict]) -> list[int]:
+    # Several create_food_entry calls as one INSERT ... RETURNING: the new ids
+    # come back in the order of `entries`, and no objects are built
+    rows = [_food_entry_row(db, entry) for entry in entries]
+    if not rows:
+        return []
+    ids = list(db.scalars(insert(FoodEntry).returning(FoodEntry.id, sort_by_parameter_order=True), rows))
+    if not in_unit_of_work(db):
+        db.commit()
+    touched: dict[int, tuple[date, date]] = {}
+    for row in rows:
+        _touch(touched, row)
+    for user_id, (first, last) in touched.items():
+        invalidate_reports(db, user_id, first, last)
+    return ids
+
 def get_food_entry(db: Session, entry_id: int) -> FoodEntry | None:
-    return db.query(FoodEntry).filter(FoodEntry.id == entry_id).first()
+    return db.get(FoodEntry, entry_id)
 
-def get_food_entries_by_user(db: Session, user_id: int) -> list[FoodEntry]:
-    return db.query(FoodEntry).filter(FoodEntry.user_id == user_id).all()
+def get_food_entries(db: Session, entry_ids: Iterable[int]) -> list[FoodEntry]:
+    return get_many(db, FoodEntry, entry_ids)
+
+def get_food_entries_by_user(db: Session, user_id: int, after_id: int | None = None, limit: int | None = None) -> list[FoodEntry]:
+    return keyset(db.query(FoodEntry).filter(FoodEntry.user_id == user_id), FoodEntry.id, after_id, limit).all()
+
+def iter_food_entries_by_user(db: Session, user_id: int, after_id: int | None = None, limit: int | None = None, batch_size: int = 1000) -> Iterator[FoodEntry]:
+    # Fetches batch_size rows at a time instead of materialising the whole list
+    return iter(keyset(db.query(FoodEntry).filter(FoodEntry.user_id == user_id), FoodEntry.id, after_id, limit).yield_per(batch_size))
 
 def update_food_entry(db: Session, entry_id: int, food: str | None = None, calories: int | None = None, entry_date: date | None = None) -> FoodEntry | None:
+    check_food_name(food)
     entry = get_food_entry(db, entry_id)
     if not entry:
         return None
+    old_user_id, old_date = entry.user_id, entry.date
     if food is not None:
         entry.food = food
     if calories is not None:
         entry.calories = calories
     if entry_date is not None:
         entry.date = entry_date
-    db.commit()
-    db.refresh(entry)
+    save(db, entry)
+    invalidate_reports(db, old_user_id, old_date, old_date)
+    if entry_date is not None and entry_date != old_date:
+        invalidate_reports(db, old_user_id, entry_date, entry_date)
     return entry
 
 def delete_food_entry(db: Session, entry_id: int) -> bool:
     entry = get_food_entry(db, entry_id)
     if not entry:
         return False
+    user_id, entry_date = entry.user_id, entry.date
     db.delete(entry)
-    db.commit()
-    return True
\ No newline at end of file
+    save(db)
+    invalidate_reports(db, user_id, entry_date, entry_date)
+    return True
+
+@dataclass(frozen=True)
+class FoodEntryFilter:
+    # Every set field must match; date and calorie bounds are inclusive
+    user_id: int | None = None
+    start_date: date | None = None
+    end_date: date | None = None
+    food: str | None = None
+    min_calories: int | None = None
+    max_calories: int | None = None
+
+    def is_empty(self) -> bool:
+        return all(getattr(self, field.name) is None for field in fields(self))
+
+    def clauses(self) -> list:
+        clauses = []
+        if self.user_id is not None:
+            clauses.append(FoodEntry.user_id == self.user_id)
+        if self.start_date is not None:
+            clauses.append(FoodEntry.date >= self.start_date)
+        if self.end_date is not None:
+            clauses.append(FoodEntry.date <= self.end_date)
+        if self.food is not None:
+            clauses.append(FoodEntry.food_id == food_id_statement(self.food))
+        if self.min_calories is not None:
+            clauses.append(FoodEntry.calories >= self.min_calories)
+        if self.max_calories is not None:
+            clauses.append(FoodEntry.calories <= self.max_calories)
+        return clauses
+
+def count_food_entries(db: Session, filters: FoodEntryFilter) -> int:
+    return db.scalar(select(func.count()).select_from(FoodEntry).where(*filters.clauses()))
+
+def _touched_ranges(db: Session, filters: FoodEntryFilter) -> list[tuple[int, date, date]]:
+    # (user_id, first date, last date) of the matching rows, for report cache invalidation
+    return list(db.execute(
+        select(FoodEntry.user_id, func.min(FoodEntry.date), func.max(FoodEntry.date))
+        .where(*filters.clauses())
+        .group_by(FoodEntry.user_id)
+    ))
+
+def _require_filter(filters: FoodEntryFilter) -> None:
+    if filters.is_empty():
+        raise ValueError("Refusing to change every food entry: give at least one filter")
+
+def _run_bulk(db: Session, stmt, filters: FoodEntryFilter, new_date: date | None = None) -> int:
+    _require_filter(filters)
+    touched = _touched_ranges(db, filters)
+    # Pending ORM changes go out first. Loaded objects are then expired (by
+    # the commit, or explicitly inside a unit of work) rather than
+    # synchronised one by one.
+    db.flush()
+    count = db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+    if in_unit_of_work(db):
+        db.expire_all()
+    save(db)
+    for user_id, first, last in touched:
+        invalidate_reports(db, user_id, first, last)
+        if new_date is not None:
+            invalidate_reports(db, user_id, new_date, new_date)
+    return count
+
+def bulk_update_food_entries(db: Session, filters: FoodEntryFilter, food: str | None = None, calories: int | None = None, scale_calories: float | None = None, entry_date: date | None = None) -> int:
+    # A single UPDATE over every matching row. scale_calories multiplies and
+    # rounds; it cannot be combined with an absolute calories value.
+    if calories is not None and scale_calories is not None:
+        raise ValueError("Give either calories or scale_calories, not both")
+    if food is None and calories is None and scale_calories is None and entry_date is None:
+        raise ValueError("Nothing to update")
+    check_food_name(food)
+    # Checked before the catalog lookup, which may insert the new food
+    _require_filter(filters)
+    values = {}
+    if food is not None:
+        values["food_id"] = get_food_id(db, food)
+    if calories is not None:
+        values["calories"] = calories
+    if scale_calories is not None:
+        values["calories"] = cast(func.round(FoodEntry.calories * scale_calories), Integer)
+    if entry_date is not None:
+        values["date"] = entry_date
+    return _run_bulk(db, update(FoodEntry).where(*filters.clauses()).values(values), filters, entry_date)
+
+def bulk_delete_food_entries(db: Session, filters: FoodEntryFilter) -> int:
+    # A single DELETE over every matching row
+    return _run_bulk(db, delete(FoodEntry).where(*filters.clauses()), filters)
+
+def search_food_entries(db: Session, query: str, filters: FoodEntryFilter | None = None, limit: int = 20) -> list[FoodEntry]:
+    # The catalog is searched first, keeping only foods with a matching
+    # entry; then one statement takes the newest entries of each food,
+    # best-ranked food first, up to the limit
+    filters = filters or FoodEntryFilter()
+    stmt = search_foods_statement(db, query)
+    if stmt is None:
+        return []
+    matching = select(FoodEntry.food_id).where(*filters.clauses())
+    if filters.user_id is not None:
+        # One user's entries are few: collect their foods once
+        stmt = stmt.where(Food.id.in_(matching))
+    else:
+        # One probe of the (food_id, date) index per matching food
+        stmt = stmt.where(exists(matching.where(FoodEntry.food_id == Food.id)))
+
+    food_ids = list(db.scalars(stmt.with_only_columns(Food.id).limit(limit)))
+    if not food_ids:
+        return []
+    food_rank = case({food_id: rank for rank, food_id in enumerate(food_ids)}, value=FoodEntry.food_id)
+    if filters.user_id is not None:
+        # One user's entries are few: read them once for every food. Without
+        # ANALYZE statistics SQLite would walk every entry of each food
+        # looking for the user's; "+ 0" keeps it off the food index
+        entries_stmt = select(FoodEntry).where((FoodEntry.food_id + 0).in_(food_ids), *filters.clauses())
+    else:
+        # One branch per food, each taking at most `limit` of its newest
+        # entries through the (food_id, date) index, so only those get sorted
+        newest = union_all(*(
+            select(FoodEntry.id)
+            .where(FoodEntry.food_id == food_id, *filters.clauses())
+            .order_by(FoodEntry.date.desc(), FoodEntry.id.desc())
+            .limit(limit)
+            .subquery()
+            .select()
+            for food_id in food_ids
+        )).subquery()
+        entries_stmt = select(FoodEntry).join(newest, newest.c.id == FoodEntry.id)
+    entries_stmt = entries_stmt.order_by(food_rank, FoodEntry.date.desc(), FoodEntry.id.desc()).limit(limit)
+    return list(db.scalars(entries_stmt))
@@ -1,19 +1,31 @@
+from collections.abc import Iterable, Iterator
 
 from sqlalchemy.orm import Session
+from myapp.controllers.lookup import get_many
+from myapp.controllers.pagination import keyset
+from myapp.controllers.transaction import save
+from myapp.controllers.report_cache import invalidate_reports
 from myapp.models.goal import Goal
 
 def create_goal(db: Session, user_id: int, daily: int, weekly: int) -> Goal:
     new_goal = Goal(user_id=user_id, daily=daily, weekly=weekly)
     db.add(new_goal)
-    db.commit()
-    db.refresh(new_goal)
+    save(db, new_goal)
+    # Reports compare against the latest goal whatever their range
+    invalidate_reports(db, user_id)
     return new_goal
 
 def get_goal(db: Session, goal_id: int) -> Goal | None:
-    return db.query(Goal).filter(Goal.id == goal_id).first()
+    return db.get(Goal, goal_id)
 
-def get_goals_by_user(db: Session, user_id: int) -> list[Goal]:
-    return db.query(Goal).filter(Goal.user_id == user_id).all()
+def get_goals(db: Session, goal_ids: Iterable[int]) -> list[Goal]:
+    return get_many(db, Goal, goal_ids)
+
+def get_goals_by_user(db: Session, user_id: int, after_id: int | None = None, limit: int | None = None) -> list[Goal]:
+    return keyset(db.query(Goal).filter(Goal.user_id == user_id), Goal.id, after_id, limit).all()
+
+def iter_goals_by_user(db: Session, user_id: int, after_id: int | None = None, limit: int | None = None, batch_size: int = 1000) -> Iterator[Goal]:
+    return iter(keyset(db.query(Goal).filter(Goal.user_id == user_id), Goal.id, after_id, limit).yield_per(batch_size))
 
 def update_goal(db: Session, goal_id: int, daily: int | None = None, weekly: int | None = None) -> Goal | None:
     goal = get_goal(db, goal_id)
@@ -23,14 +35,16 @@ def update_goal(db: Session, goal_id: int, daily: int | None = None, weekly: int
         goal.daily = daily
     if weekly is not None:
         goal.weekly = weekly
-    db.commit()
-    db.refresh(goal)
+    save(db, goal)
+    invalidate_reports(db, goal.user_id)
     return goal
 
 def delete_goal(db: Session, goal_id: int) -> bool:
     goal = get_goal(db, goal_id)
     if not goal:
         return False
+    user_id = goal.user_id
     db.delete(goal)
-    db.commit()
+    save(db)
+    invalidate_reports(db, user_id)
     return True
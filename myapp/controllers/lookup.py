@@ -0,0 +1,39 @@
+# myapp/controllers/lookup.py
+from collections.abc import Iterable
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+
+# Ids per IN (...) query, well below SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 500
+
+def loaded(db: Session, model, ident: int):
+    # The object for ident if the session already holds it unexpired, without SQL
+    obj = db.identity_map.get(db.identity_key(model, ident))
+    if obj is None or inspect(obj).expired:
+        return None
+    return obj
+
+def get_many_statements(db: Session, model, ids: list[int]):
+    # Identity-map hits, plus one IN query per chunk of ids still to fetch
+    found = {}
+    missing = []
+    for ident in ids:
+        obj = loaded(db, model, ident)
+        if obj is None:
+            missing.append(ident)
+        else:
+            found[ident] = obj
+    statements = [
+        select(model).where(model.id.in_(missing[start:start + IN_CHUNK_SIZE]))
+        for start in range(0, len(missing), IN_CHUNK_SIZE)
+    ]
+    return found, statements
+
+def get_many(db: Session, model, ids: Iterable[int]) -> list:
+    # Objects in id order; unknown ids are skipped
+    ids = list(dict.fromkeys(ids))
+    found, statements = get_many_statements(db, model, ids)
+    for stmt in statements:
+        for obj in db.scalars(stmt):
+            found[obj.id] = obj
+    return [found[ident] for ident in ids if ident in found]
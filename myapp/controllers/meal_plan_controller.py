@@ -1,18 +1,27 @@
+from collections.abc import Iterable, Iterator
 from sqlalchemy.orm import Session
+from myapp.controllers.lookup import get_many
+from myapp.controllers.pagination import keyset
+from myapp.controllers.transaction import save
 from myapp.models.meal_plan import MealPlan
 
 def create_meal_plan(db: Session, user_id: int, week: int, plan: str) -> MealPlan:
     new_plan = MealPlan(user_id=user_id, week=week, plan=plan)
     db.add(new_plan)
-    db.commit()
-    db.refresh(new_plan)
+    save(db, new_plan)
     return new_plan
 
 def get_meal_plan(db: Session, plan_id: int) -> MealPlan | None:
-    return db.query(MealPlan).filter(MealPlan.id == plan_id).first()
+    return db.get(MealPlan, plan_id)
 
-def get_meal_plans_by_user(db: Session, user_id: int) -> list[MealPlan]:
-    return db.query(MealPlan).filter(MealPlan.user_id == user_id).all()
+def get_meal_plans(db: Session, plan_ids: Iterable[int]) -> list[MealPlan]:
+    return get_many(db, MealPlan, plan_ids)
+
+def get_meal_plans_by_user(db: Session, user_id: int, after_id: int | None = None, limit: int | None = None) -> list[MealPlan]:
+    return keyset(db.query(MealPlan).filter(MealPlan.user_id == user_id), MealPlan.id, after_id, limit).all()
+
+def iter_meal_plans_by_user(db: Session, user_id: int, after_id: int | None = None, limit: int | None = None, batch_size: int = 1000) -> Iterator[MealPlan]:
+    return iter(keyset(db.query(MealPlan).filter(MealPlan.user_id == user_id), MealPlan.id, after_id, limit).yield_per(batch_size))
 
 def update_meal_plan(db: Session, plan_id: int, week: int | None = None, plan: str | None = None) -> MealPlan | None:
     meal_plan = get_meal_plan(db, plan_id)
@@ -22,8 +31,7 @@ def update_meal_plan(db: Session, plan_id: int, week: int | None = None, plan: s
         meal_plan.week = week
     if plan is not None:
         meal_plan.plan = plan
-    db.commit()
-    db.refresh(meal_plan)
+    save(db, meal_plan)
     return meal_plan
 
 def delete_meal_plan(db: Session, plan_id: int) -> bool:
@@ -31,5 +39,5 @@ def delete_meal_plan(db: Session, plan_id: int) -> bool:
     if not meal_plan:
         return False
     db.delete(meal_plan)
-    db.commit()
+    save(db)
     return True
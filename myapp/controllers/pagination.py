@@ -0,0 +1,13 @@
+# myapp/controllers/pagination.py
+
+def keyset(query, id_column, after_id: int | None = None, limit: int | None = None):
+    # Keyset ("seek") pagination: rows come back in id order and a page starts
+    # after the last id of the previous one, so deep pages cost the same as
+    # the first instead of scanning past an OFFSET. Works on both Query and
+    # Select objects.
+    query = query.order_by(id_column)
+    if after_id is not None:
+        query = query.where(id_column > after_id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
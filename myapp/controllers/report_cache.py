@@ -0,0 +1,230 @@
+# myapp/controllers/report_cache.py
+import json
+import os
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import date
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from myapp.db.config import ENV_PREFIX
+from myapp.controllers.transaction import in_unit_of_work
+
+DEFAULT_MAX_ENTRIES = 256
+# Session.info key for invalidations to repeat once a unit of work commits
+PENDING_INVALIDATIONS = "pending_report_invalidations"
+
+ReportKey = tuple[int, date, date]
+
+
+def _copy_report(report: dict) -> dict:
+    # Reports hold scalars plus flat dicts (the daily breakdown), so a
+    # one-level copy is enough to keep callers from mutating cached data
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in report.items()}
+
+
+class ReportCache:
+    """Report cache keyed by (user_id, start_date, end_date).
+
+    An in-process LRU sits in front of an optional SQLite file, so separate
+    CLI invocations pointed at the same file share cached reports. The
+    namespace (normally the database URL) keeps reports of different
+    databases apart in a shared file.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: str | None = None, namespace: str = ""):
+        self.max_entries = max_entries
+        self.path = path
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[ReportKey, dict] = OrderedDict()
+        # Bumped on every invalidation of a user, so a report computed while
+        # that user's data changed is not stored
+        self._versions: dict[int, int] = {}
+        self._lock = threading.RLock()
+        self._disk = self._open_disk(path) if path else None
+        _caches.add(self)
+
+    @staticmethod
+    def _open_disk(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS report_cache ("
+            "namespace TEXT NOT NULL, user_id INTEGER NOT NULL, start_date TEXT NOT NULL, end_date TEXT NOT NULL, "
+            "report TEXT NOT NULL, PRIMARY KEY (namespace, user_id, start_date, end_date))"
+        )
+        return conn
+
+    def get(self, user_id: int, start_date: date, end_date: date) -> dict | None:
+        key = (user_id, start_date, end_date)
+        with self._lock:
+            report = self._entries.get(key)
+            if report is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_report(report)
+
+            report = self._disk_get(key)
+            if report is not None:
+                self._remember(key, report)
+                self.hits += 1
+                self.disk_hits += 1
+                return _copy_report(report)
+
+            self.misses += 1
+            return None
+
+    def put(self, user_id: int, start_date: date, end_date: date, report: dict) -> None:
+        key = (user_id, start_date, end_date)
+        report = _copy_report(report)
+        with self._lock:
+            self._remember(key, report)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO report_cache (namespace, user_id, start_date, end_date, report) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, user_id, start_date.isoformat(), end_date.isoformat(), json.dumps(report, default=date.isoformat)),
+                )
+
+    def get_or_compute(self, user_id: int, start_date: date, end_date: date, compute: Callable[[], dict]) -> dict:
+        report = self.get(user_id, start_date, end_date)
+        if report is not None:
+            return report
+
+        version = self._versions.get(user_id, 0)
+        report = compute()
+        with self._lock:
+            if self._versions.get(user_id, 0) == version:
+                self.put(user_id, start_date, end_date, report)
+        return report
+
+    def invalidate(self, user_id: int, start_date: date | None = None, end_date: date | None = None) -> None:
+        """Drop the user's cached reports whose range overlaps [start_date, end_date].
+
+        Without dates every report of the user is dropped.
+        """
+        start_date = start_date or date.min
+        end_date = end_date or date.max
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            stale = [
+                key for key in self._entries
+                if key[0] == user_id and key[1] <= end_date and key[2] >= start_date
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            if self._disk is not None:
+                cursor = self._disk.execute(
+                    "DELETE FROM report_cache WHERE namespace = ? AND user_id = ? AND start_date <= ? AND end_date >= ?",
+                    (self.namespace, user_id, end_date.isoformat(), start_date.isoformat()),
+                )
+                self.invalidations += max(cursor.rowcount - len(stale), 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            for user_id in {key[0] for key in self._entries}:
+                self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self._entries.clear()
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM report_cache WHERE namespace = ?", (self.namespace,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+            }
+            if self._disk is not None:
+                stats["disk_entries"] = self._disk.execute(
+                    "SELECT COUNT(*) FROM report_cache WHERE namespace = ?", (self.namespace,)
+                ).fetchone()[0]
+            return stats
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def _remember(self, key: ReportKey, report: dict) -> None:
+        self._entries[key] = report
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_get(self, key: ReportKey) -> dict | None:
+        if self._disk is None:
+            return None
+        row = self._disk.execute(
+            "SELECT report FROM report_cache WHERE namespace = ? AND user_id = ? AND start_date = ? AND end_date = ?",
+            (self.namespace, key[0], key[1].isoformat(), key[2].isoformat()),
+        ).fetchone()
+        if row is None:
+            return None
+        report = json.loads(row[0])
+        report["start_date"] = date.fromisoformat(report["start_date"])
+        report["end_date"] = date.fromisoformat(report["end_date"])
+        return report
+
+
+# Every live cache receives the controllers' invalidations
+_caches: "weakref.WeakSet[ReportCache]" = weakref.WeakSet()
+# Default cache per database URL
+_default_caches: dict[str, ReportCache] = {}
+
+
+def load_report_cache(namespace: str = "", environ=None) -> ReportCache:
+    """Build a cache from HEALTH_TRACKER_REPORT_CACHE_SIZE and HEALTH_TRACKER_REPORT_CACHE_PATH."""
+    environ = os.environ if environ is None else environ
+    max_entries = int(environ.get(f"{ENV_PREFIX}REPORT_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+    path = environ.get(f"{ENV_PREFIX}REPORT_CACHE_PATH") or None
+    return ReportCache(max_entries=max_entries, path=path, namespace=namespace)
+
+
+def get_report_cache(db: Session) -> ReportCache:
+    # Keyed without the driver, so sync and async sessions share a namespace
+    url = db.get_bind().url
+    namespace = url.set(drivername=url.get_backend_name()).render_as_string(hide_password=True)
+    cache = _default_caches.get(namespace)
+    if cache is None:
+        cache = _default_caches[namespace] = load_report_cache(namespace)
+    return cache
+
+
+def invalidate_reports(db: Session, user_id: int, start_date: date | None = None, end_date: date | None = None) -> None:
+    # Called by the controllers after a write. Inside a unit of work the
+    # invalidation is repeated after the commit, so a report cached by another
+    # reader before the data was committed does not survive it.
+    get_report_cache(db)
+    for cache in list(_caches):
+        cache.invalidate(user_id, start_date, end_date)
+    if in_unit_of_work(db):
+        db.info.setdefault(PENDING_INVALIDATIONS, []).append((user_id, start_date, end_date))
+
+
+def clear_reports(db: Session) -> None:
+    get_report_cache(db)
+    for cache in list(_caches):
+        cache.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_invalidations(session: Session) -> None:
+    pending = session.info.pop(PENDING_INVALIDATIONS, None)
+    for user_id, start_date, end_date in pending or ():
+        for cache in list(_caches):
+            cache.invalidate(user_id, start_date, end_date)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_invalidations(session: Session) -> None:
+    session.info.pop(PENDING_INVALIDATIONS, None)
@@ -1,47 +1,110 @@
 # myapp/controllers/report_controller.py
 
+from collections.abc import Iterable, Iterator
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
+from myapp.analytics.food_stats import TOP_FOODS_BY, histogram_rows
+from myapp.analytics.trends import compute_trends
+from myapp.controllers.pagination import keyset
+from myapp.controllers.report_cache import ReportCache, get_report_cache
+from myapp.models.food import Food
 from myapp.models.user import User
 from myapp.models.food_entry import FoodEntry
 from myapp.models.goal import Goal
+from myapp.models.daily_total import DailyTotal
 from datetime import date, timedelta
 from collections import defaultdict
 
-def generate_user_report(db: Session, user_id: int, start_date: date, end_date: date):
-    # Get all food entries in the date range
+def daily_rows_statement(user_id: int, start_date: date, end_date: date):
+    # One row per tracked day: (date, entry count, calorie sum), read from the
+    # trigger-maintained rollup so the cost is O(days) rather than O(entries).
+    return (
+        select(DailyTotal.date, DailyTotal.entry_count, DailyTotal.calories)
+        .where(
+            DailyTotal.user_id == user_id,
+            DailyTotal.date >= start_date,
+            DailyTotal.date <= end_date
+        )
+        .order_by(DailyTotal.date)
+    )
+
+def entry_rows_statement(user_id: int, start_date: date, end_date: date):
+    # Same rows aggregated from the raw entries. SQLite does the aggregation,
+    # so no FoodEntry objects are built.
+    return (
+        select(FoodEntry.date, func.count(FoodEntry.id), func.sum(FoodEntry.calories))
+        .where(
+            FoodEntry.user_id == user_id,
+            FoodEntry.date >= start_date,
+            FoodEntry.date <= end_date
+        )
+        .group_by(FoodEntry.date)
+        .order_by(FoodEntry.date)
+    )
+
+def latest_goal_statement(user_id: int):
+    return select(Goal).where(Goal.user_id == user_id).order_by(Goal.id.desc()).limit(1)
+
+def users_daily_rows_statement(user_ids: list[int], start_date: date, end_date: date):
+    # Rollup rows for a whole batch of users, ordered by the daily_totals
+    # primary key (user_id, date).
+    return (
+        select(DailyTotal.user_id, DailyTotal.date, DailyTotal.entry_count, DailyTotal.calories)
+        .where(
+            DailyTotal.user_id.in_(user_ids),
+            DailyTotal.date >= start_date,
+            DailyTotal.date <= end_date
+        )
+        .order_by(DailyTotal.user_id, DailyTotal.date)
+    )
+
+def latest_goals_statement(user_ids: list[int]):
+    latest_ids = select(func.max(Goal.id)).where(Goal.user_id.in_(user_ids)).group_by(Goal.user_id)
+    return select(Goal).where(Goal.id.in_(latest_ids))
+
+def _daily_rows_sql(db: Session, stmt) -> list[tuple[date, int, int]]:
+    return [(day, count, calories) for day, count, calories in db.execute(stmt)]
+
+def _daily_rows_orm(db: Session, user_id: int, start_date: date, end_date: date) -> list[tuple[date, int, int]]:
+    # Fallback path: load every entry in the range and aggregate in Python.
     entries = db.query(FoodEntry).filter(
         FoodEntry.user_id == user_id,
         FoodEntry.date >= start_date,
         FoodEntry.date <= end_date
     ).all()
 
-    # Get the user's most recent goal
-    goal = db.query(Goal).filter(Goal.user_id == user_id).order_by(Goal.id.desc()).first()
+    counts = defaultdict(int)
+    calories = defaultdict(int)
+    for entry in entries:
+        counts[entry.date] += 1
+        calories[entry.date] += entry.calories
+
+    return [(day, counts[day], calories[day]) for day in sorted(calories)]
 
-    # Calculate total calories
-    total_calories = sum(entry.calories for entry in entries)
+def _latest_goal(db: Session, user_id: int) -> Goal | None:
+    return db.scalars(latest_goal_statement(user_id)).first()
+
+def build_report(user_id: int, start_date: date, end_date: date, daily_rows: list[tuple[date, int, int]], goal: Goal | None) -> dict:
+    # Calculate totals from the per-day rows
+    total_entries = sum(count for _, count, _ in daily_rows)
+    total_calories = sum(calories for _, _, calories in daily_rows)
 
     # Calculate days in the period
     days_in_period = (end_date - start_date).days + 1
 
     # Calculate days with entries
-    days_with_entries = len(set(entry.date for entry in entries))
+    days_with_entries = len(daily_rows)
 
     # Calculate average daily calories
     avg_daily_calories = total_calories / days_with_entries if days_with_entries > 0 else 0
 
-    # Group entries by date for daily breakdown
-    daily_breakdown = defaultdict(int)
-    for entry in entries:
-        daily_breakdown[entry.date] += entry.calories
-
-    # Sort the daily breakdown by date
-    sorted_daily = {k.isoformat(): v for k, v in sorted(daily_breakdown.items())}
+    # Daily breakdown, sorted by date
+    sorted_daily = {day.isoformat(): calories for day, _, calories in sorted(daily_rows)}
 
     # Prepare the report
     report = {
         "user_id": user_id,
-        "total_entries": len(entries),
+        "total_entries": total_entries,
         "total_calories": total_calories,
         "start_date": start_date,
         "end_date": end_date,
@@ -72,3 +135,125 @@ def generate_user_report(db: Session, user_id: int, start_date: date, end_date:
         report["has_goal"] = False
 
     return report
+
+REPORT_SOURCES = ("rollup", "entries", "orm")
+
+def generate_user_report(db: Session, user_id: int, start_date: date, end_date: date, source: str = "rollup"):
+    # Read the daily rollup by default. "entries" aggregates the raw table in
+    # SQL and "orm" is the original in-Python fallback.
+    if source == "rollup":
+        daily_rows = _daily_rows_sql(db, daily_rows_statement(user_id, start_date, end_date))
+    elif source == "entries":
+        daily_rows = _daily_rows_sql(db, entry_rows_statement(user_id, start_date, end_date))
+    elif source == "orm":
+        daily_rows = _daily_rows_orm(db, user_id, start_date, end_date)
+    else:
+        raise ValueError(f"Unknown report source '{source}'. Choose from: {', '.join(REPORT_SOURCES)}")
+
+    # Get the user's most recent goal
+    goal = _latest_goal(db, user_id)
+
+    return build_report(user_id, start_date, end_date, daily_rows, goal)
+
+def generate_user_trends(db: Session, user_id: int, start_date: date, end_date: date, use_numpy: bool | None = None) -> dict:
+    # Rolling averages, weekly changes and goal streaks from the same rollup
+    # rows as the report: O(days) to read and O(days) to compute
+    daily_rows = _daily_rows_sql(db, daily_rows_statement(user_id, start_date, end_date))
+    goal = _latest_goal(db, user_id)
+    trends = compute_trends(start_date, end_date, daily_rows, goal.daily if goal else None, use_numpy=use_numpy)
+    return {"user_id": user_id, **trends}
+
+def top_foods_statement(start_date: date, end_date: date, user_id: int | None = None, limit: int = 10, by: str = "calories"):
+    # GROUP BY food_id in SQLite, so only one row per food leaves the
+    # database; the window sum gives each food's share before the LIMIT.
+    if by not in TOP_FOODS_BY:
+        raise ValueError(f"Unknown ranking '{by}'. Choose from: {', '.join(TOP_FOODS_BY)}")
+    conditions = [FoodEntry.date >= start_date, FoodEntry.date <= end_date]
+    if user_id is not None:
+        conditions.append(FoodEntry.user_id == user_id)
+    entries = func.count(FoodEntry.id)
+    calories = func.sum(FoodEntry.calories)
+    ranked = entries if by == "entries" else calories
+    totals = (
+        select(
+            FoodEntry.food_id,
+            entries.label("entries"),
+            calories.label("calories"),
+            func.sum(ranked).over().label("grand_total"),
+        )
+        .where(*conditions)
+        .group_by(FoodEntry.food_id)
+        .subquery()
+    )
+    primary, secondary = (totals.c.entries, totals.c.calories) if by == "entries" else (totals.c.calories, totals.c.entries)
+    return (
+        select(Food.name, totals.c.entries, totals.c.calories, totals.c.grand_total)
+        .join(totals, totals.c.food_id == Food.id)
+        .order_by(primary.desc(), secondary.desc(), Food.name)
+        .limit(limit)
+    )
+
+def top_foods(db: Session, start_date: date, end_date: date, user_id: int | None = None, limit: int = 10, by: str = "calories") -> list[dict]:
+    rows = []
+    for name, entries, calories, grand_total in db.execute(top_foods_statement(start_date, end_date, user_id, limit, by)):
+        value = entries if by == "entries" else calories
+        rows.append({
+            "food": name,
+            "entries": entries,
+            "calories": calories,
+            "share": round(value / grand_total * 100, 1) if grand_total else 0.0,
+        })
+    return rows
+
+def calorie_histogram_statement(start_date: date, end_date: date, user_id: int | None = None, bucket: int = 100, per_day: bool = False):
+    # Entry calories, or daily totals from the rollup with per_day, counted per
+    # bucket in SQLite. Integer division truncates towards zero there, so
+    # negative values are moved down one bucket to floor like Python's //.
+    model = DailyTotal if per_day else FoodEntry
+    value = model.calories
+    index = (value // bucket - case((value % bucket < 0, 1), else_=0)).label("bucket")
+    conditions = [model.date >= start_date, model.date <= end_date]
+    if user_id is not None:
+        conditions.append(model.user_id == user_id)
+    return select(index, func.count()).where(*conditions).group_by(index)
+
+def calorie_histogram(db: Session, start_date: date, end_date: date, user_id: int | None = None, bucket: int = 100, per_day: bool = False) -> list[dict]:
+    if bucket <= 0:
+        raise ValueError("bucket must be positive")
+    counts = {index: count for index, count in db.execute(calorie_histogram_statement(start_date, end_date, user_id, bucket, per_day))}
+    return histogram_rows(counts, bucket)
+
+def get_cached_user_report(db: Session, user_id: int, start_date: date, end_date: date, cache: ReportCache | None = None) -> dict:
+    # Read-through: reuse a cached report for the same user and range; the
+    # controllers drop it when an entry in the range or a goal changes.
+    cache = cache or get_report_cache(db)
+    return cache.get_or_compute(user_id, start_date, end_date, lambda: generate_user_report(db, user_id, start_date, end_date))
+
+def user_id_chunks(db: Session, user_ids: Iterable[int] | None = None, chunk_size: int = 1000) -> Iterator[list[int]]:
+    # Explicit ids are split as given; otherwise every user is walked in id
+    # order one keyset page at a time.
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        for start in range(0, len(user_ids), chunk_size):
+            yield user_ids[start:start + chunk_size]
+        return
+
+    after_id = None
+    while True:
+        chunk = list(db.scalars(keyset(select(User.id), User.id, after_id, chunk_size)))
+        if not chunk:
+            return
+        yield chunk
+        after_id = chunk[-1]
+
+def generate_user_reports(db: Session, start_date: date, end_date: date, user_ids: Iterable[int] | None = None, chunk_size: int = 1000) -> Iterator[dict]:
+    # Batch version of generate_user_report: two queries per chunk of users
+    # (rollup rows and latest goals) instead of two per user.
+    for chunk in user_id_chunks(db, user_ids, chunk_size):
+        daily_rows = defaultdict(list)
+        for user_id, day, count, calories in db.execute(users_daily_rows_statement(chunk, start_date, end_date)):
+            daily_rows[user_id].append((day, count, calories))
+        goals = {goal.user_id: goal for goal in db.scalars(latest_goals_statement(chunk))}
+
+        for user_id in chunk:
+            yield build_report(user_id, start_date, end_date, daily_rows.get(user_id, []), goals.get(user_id))
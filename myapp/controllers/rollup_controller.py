@@ -0,0 +1,56 @@
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from myapp.models.daily_total import DailyTotal
+from myapp.models.food_entry import FoodEntry
+from myapp.controllers.report_cache import clear_reports, invalidate_reports
+from myapp.controllers.transaction import save
+
+def _entry_totals_statement(user_id: int | None = None):
+    stmt = select(
+        FoodEntry.user_id, FoodEntry.date, func.sum(FoodEntry.calories), func.count(FoodEntry.id)
+    ).group_by(FoodEntry.user_id, FoodEntry.date)
+    if user_id is not None:
+        stmt = stmt.where(FoodEntry.user_id == user_id)
+    return stmt
+
+def rebuild_daily_totals(db: Session, user_id: int | None = None) -> int:
+    # Recompute the rollup from the raw entries, for one user or everyone
+    clear = delete(DailyTotal)
+    if user_id is not None:
+        clear = clear.where(DailyTotal.user_id == user_id)
+    db.execute(clear)
+    result = db.execute(
+        insert(DailyTotal).from_select(
+            ["user_id", "date", "calories", "entry_count"], _entry_totals_statement(user_id)
+        )
+    )
+    save(db)
+    # Cached reports may have been built from the rollup being replaced
+    if user_id is None:
+        clear_reports(db)
+    else:
+        invalidate_reports(db, user_id)
+    return result.rowcount
+
+def check_daily_totals(db: Session, user_id: int | None = None) -> list[dict]:
+    # Compare the rollup with the raw entries and return every mismatching day
+    expected = {
+        (uid, day): (calories, count)
+        for uid, day, calories, count in db.execute(_entry_totals_statement(user_id))
+    }
+
+    stmt = select(DailyTotal.user_id, DailyTotal.date, DailyTotal.calories, DailyTotal.entry_count)
+    if user_id is not None:
+        stmt = stmt.where(DailyTotal.user_id == user_id)
+    actual = {(uid, day): (calories, count) for uid, day, calories, count in db.execute(stmt)}
+
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys()):
+        if expected.get(key) != actual.get(key):
+            mismatches.append({
+                "user_id": key[0],
+                "date": key[1],
+                "expected": expected.get(key, (0, 0)),
+                "actual": actual.get(key, (0, 0)),
+            })
+    return mismatches
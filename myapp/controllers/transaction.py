@@ -0,0 +1,18 @@
+# myapp/controllers/transaction.py
+from sqlalchemy.orm import Session
+from myapp.db.db import UNIT_OF_WORK
+
+def in_unit_of_work(db: Session) -> bool:
+    return db.info.get(UNIT_OF_WORK) is True
+
+def save(db: Session, *objects) -> None:
+    # Auto-commit mode (the default) commits and reloads the given objects.
+    # Inside a unit of work the pending changes are only flushed: new rows get
+    # their IDs from INSERT ... RETURNING, nothing is re-selected and the
+    # owner of the transaction commits once.
+    if in_unit_of_work(db):
+        db.flush()
+        return
+    db.commit()
+    for obj in objects:
+        db.refresh(obj)
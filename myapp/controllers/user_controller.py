@@ -1,22 +1,37 @@
-
+from collections.abc import Iterable, Iterator
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import Session
+from myapp.controllers.lookup import get_many
+from myapp.controllers.pagination import keyset
+from myapp.controllers.transaction import in_unit_of_work, save
+from myapp.controllers.report_cache import invalidate_reports
 from myapp.models.user import User
+from myapp.models.food_entry import FoodEntry
+from myapp.models.goal import Goal
+from myapp.models.meal_plan import MealPlan
+from myapp.models.daily_total import DailyTotal
 
 def create_user(db: Session, name: str) -> User:
     new_user = User(name=name)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    save(db, new_user)
     return new_user
 
 def get_user(db: Session, user_id: int) -> User | None:
-    return db.query(User).filter(User.id == user_id).first()
+    # Served from the identity map when the object is already loaded
+    return db.get(User, user_id)
+
+def get_users(db: Session, user_ids: Iterable[int]) -> list[User]:
+    return get_many(db, User, user_ids)
 
 def get_user_by_name(db: Session, name: str) -> User | None:
     return db.query(User).filter(User.name == name).first()
 
-def get_all_users(db: Session) -> list[User]:
-    return db.query(User).all()
+def get_all_users(db: Session, after_id: int | None = None, limit: int | None = None) -> list[User]:
+    return keyset(db.query(User), User.id, after_id, limit).all()
+
+def iter_all_users(db: Session, after_id: int | None = None, limit: int | None = None, batch_size: int = 1000) -> Iterator[User]:
+    return iter(keyset(db.query(User), User.id, after_id, limit).yield_per(batch_size))
 
 def update_user(db: Session, user_id: int, name: str | None = None) -> User | None:
     user = get_user(db, user_id)
@@ -24,14 +39,46 @@ def update_user(db: Session, user_id: int, name: str | None = None) -> User | No
         return None
     if name is not None:
         user.name = name
-    db.commit()
-    db.refresh(user)
+    save(db, user)
     return user
 
+def delete_user_statements(user_id: int) -> list:
+    # One set-based DELETE per table instead of loading every child row for
+    # the ORM cascade. The rollup goes first so the food_entries delete
+    # trigger finds nothing left to decrement; the user row goes last.
+    return [
+        delete(model).where(model.user_id == user_id)
+        for model in (DailyTotal, FoodEntry, Goal, MealPlan)
+    ] + [delete(User).where(User.id == user_id)]
+
 def delete_user(db: Session, user_id: int) -> bool:
     user = get_user(db, user_id)
     if not user:
         return False
-    db.delete(user)
-    db.commit()
+    for stmt in delete_user_statements(user_id):
+        db.execute(stmt)
+    save(db)
+    invalidate_reports(db, user_id)
     return True
+
+def count_user_food_entries(db: Session, user_id: int) -> int:
+    return db.scalar(select(func.count()).select_from(FoodEntry).where(FoodEntry.user_id == user_id))
+
+def purge_user(db: Session, user_id: int, chunk_size: int = 5000) -> Iterator[int]:
+    # Deletes the user's food entries chunk_size rows per transaction and
+    # yields the number removed by each chunk, so other writers get the lock
+    # between chunks. The remaining rows and the user go in a final
+    # delete_user. Commits as it goes, so it cannot run inside a unit of work.
+    if in_unit_of_work(db):
+        raise ValueError("purge_user commits per chunk and cannot run inside a unit of work")
+    chunk = select(FoodEntry.id).where(FoodEntry.user_id == user_id).limit(chunk_size)
+    while True:
+        deleted = db.execute(
+            delete(FoodEntry).where(FoodEntry.id.in_(chunk)).execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        if not deleted:
+            break
+        invalidate_reports(db, user_id)
+        yield deleted
+    delete_user(db, user_id)
@@ -0,0 +1,174 @@
+# myapp/controllers/write_queue.py
+import queue
+import threading
+import time
+from collections.abc import Callable
+from itertools import groupby
+from concurrent.futures import Future
+from datetime import date
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from myapp.controllers.food_entry_controller import create_food_entries, create_food_entry
+from myapp.controllers.goal_controller import create_goal
+from myapp.controllers.meal_plan_controller import create_meal_plan
+from myapp.db.db import run_with_retry
+
+DEFAULT_MAX_BATCH = 500
+DEFAULT_MAX_DELAY_MS = 1.0
+DEFAULT_MAX_PENDING = 10_000
+
+_STOP = object()
+FOOD_ENTRY_FIELDS = ("user_id", "food", "calories", "date")
+
+
+def _is_food_entry_create(item) -> bool:
+    _, controller, args, kwargs = item
+    return controller is create_food_entry and len(args) == len(FOOD_ENTRY_FIELDS) and not kwargs
+
+
+def _apply_batch(db: Session, batch: list) -> list:
+    # Consecutive food entry creates go in as one multi-row INSERT; every
+    # other call runs its controller as is, in queue order
+    results = []
+    for coalesce, items in groupby(batch, key=_is_food_entry_create):
+        items = list(items)
+        if coalesce and len(items) > 1:
+            results.extend(create_food_entries(db, [dict(zip(FOOD_ENTRY_FIELDS, args)) for _, _, args, _ in items]))
+        else:
+            results.extend(_result_value(controller(db, *args, **kwargs)) for _, controller, args, kwargs in items)
+    return results
+
+
+def _result_value(result):
+    # Mapped objects are expired by the commit and the session is closed by
+    # the time a producer looks, so they resolve to their primary key
+    if result is not None and inspect(result, raiseerr=False) is not None:
+        return inspect(result).identity[0]
+    return result
+
+
+class WriteQueue:
+    """Write-behind queue with one writer thread that group-commits controller calls.
+
+    SQLite takes one writer at a time, so producers that call the
+    controllers directly queue up on the write lock and pay for a commit
+    each. Here producers only enqueue; the writer takes up to `max_batch`
+    calls, waiting at most `max_delay_ms` after the first for more, and
+    applies them in order in one transaction, with runs of food entries as
+    a single multi-row INSERT. Each call's future resolves
+    once that transaction commits: to the new row's id for the create_*
+    methods, and to the controller's return value (objects as their id) for
+    submit(). If a batch fails, its calls are re-run one per transaction so
+    only the failing call's future gets the exception.
+
+    Producers block once `max_pending` calls are waiting. From asyncio,
+    await asyncio.wrap_future(future).
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] | None = None, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_delay_ms: float = DEFAULT_MAX_DELAY_MS, max_pending: int = DEFAULT_MAX_PENDING):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.batches = 0
+        self.committed = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._writer.start()
+
+    def submit(self, controller: Callable, *args, **kwargs) -> Future:
+        """Queue `controller(db, *args, **kwargs)` for the writer thread."""
+        future = Future()
+        # Queued under the lock so a concurrent close() cannot put _STOP
+        # ahead of it and leave the future unresolved
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("WriteQueue is closed")
+            self._queue.put((future, controller, args, kwargs))
+        return future
+
+    def create_food_entry(self, user_id: int, food: str, calories: int | None, entry_date: date) -> Future:
+        return self.submit(create_food_entry, user_id, food, calories, entry_date)
+
+    def create_goal(self, user_id: int, daily: int, weekly: int) -> Future:
+        return self.submit(create_goal, user_id, daily, weekly)
+
+    def create_meal_plan(self, user_id: int, week: int, plan: str) -> Future:
+        return self.submit(create_meal_plan, user_id, week, plan)
+
+    def flush(self) -> None:
+        """Wait until every call queued so far is committed or has failed."""
+        self.submit(lambda db: None).result()
+
+    def close(self) -> None:
+        """Stop taking calls, apply the ones already queued and stop the writer."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    def __enter__(self) -> "WriteQueue":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _next_batch(self) -> tuple[list, bool]:
+        # Block for the first call, then gather more until the batch is full
+        # or max_delay has passed since the first arrived
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            # Calls whose future a producer cancelled are dropped here
+            batch = [item for item in batch if item[0].set_running_or_notify_cancel()]
+            if batch:
+                self._apply(batch)
+
+    def _apply(self, batch: list) -> None:
+        try:
+            results = run_with_retry(lambda db: _apply_batch(db, batch), session_factory=self.session_factory)
+        except Exception as exc:
+            if len(batch) == 1:
+                batch[0][0].set_exception(exc)
+            else:
+                # Find the failing call: the others still commit, one per transaction
+                self._apply_each(batch)
+            return
+        self.batches += 1
+        self.committed += len(batch)
+        for (future, _, _, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def _apply_each(self, batch: list) -> None:
+        for future, controller, args, kwargs in batch:
+            try:
+                result = run_with_retry(lambda db: _result_value(controller(db, *args, **kwargs)), session_factory=self.session_factory)
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                self.batches += 1
+                self.committed += 1
+                future.set_result(result)
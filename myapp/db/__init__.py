@@ -1,11 +1,19 @@
-from .database import Base, engine, SessionLocal
+from .database import Base, SessionLocal, get_engine
 from myapp.models.food_entry import FoodEntry
 from myapp.models.goal import Goal
 from myapp.models.meal_plan import MealPlan
 
+def __getattr__(name: str):
+    # Keep `from myapp.db import engine` working without creating it at import
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def init_db():
+    from myapp.db.migrations import upgrade_schema
+
     print("Creating all tables...")
-    Base.metadata.create_all(bind=engine)
+    upgrade_schema(get_engine())
     print(" Done.")
 
 if __name__ == "__main__":
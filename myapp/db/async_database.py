@@ -0,0 +1,47 @@
+# myapp/db/async_database.py
+from contextlib import asynccontextmanager
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from myapp.db.config import DatabaseConfig
+from myapp.db.database import config, install_pragmas
+from myapp.db.instrumentation import install_slow_query_log
+from myapp.db.db import UNIT_OF_WORK
+
+def create_async_engine_from_config(config: DatabaseConfig) -> AsyncEngine:
+    new_engine = create_async_engine(config.async_url, **config.engine_kwargs())
+    install_pragmas(new_engine.sync_engine, config.pragmas)
+    install_slow_query_log(new_engine.sync_engine, config.slow_query_ms, config.slow_query_log)
+    return new_engine
+
+_async_engine: AsyncEngine | None = None
+# Objects stay loaded after commit so attribute access never needs implicit IO
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine_from_config(config)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+def __getattr__(name: str):
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@asynccontextmanager
+async def get_async_db(unit_of_work: bool = False):
+    get_async_engine()
+    db: AsyncSession = AsyncSessionLocal()
+    try:
+        if unit_of_work:
+            db.info[UNIT_OF_WORK] = True
+            try:
+                yield db
+                await db.commit()
+            except BaseException:
+                await db.rollback()
+                raise
+        else:
+            yield db
+    finally:
+        await db.close()
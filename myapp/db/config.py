@@ -0,0 +1,133 @@
+# myapp/db/config.py
+import os
+from dataclasses import dataclass, field, replace
+from sqlalchemy import pool
+
+ENV_PREFIX = "HEALTH_TRACKER_"
+DEFAULT_PROFILE = "prod"
+
+# Names accepted for DatabaseConfig.pool_class. SQLAlchemy's default is
+# QueuePool for a SQLite file and SingletonThreadPool for :memory:.
+POOL_CLASSES = {
+    "queue": pool.QueuePool,
+    "singleton": pool.SingletonThreadPool,
+    "static": pool.StaticPool,
+    "null": pool.NullPool,
+}
+
+
+@dataclass(frozen=True)
+class DatabaseConfig:
+    url: str = "sqlite:///health_tracker.db"
+    echo: bool = False
+    pool_size: int | None = None
+    max_overflow: int | None = None
+    pool_timeout: float | None = None
+    pool_recycle: int | None = None
+    # One of POOL_CLASSES; None keeps the dialect's default
+    pool_class: str | None = None
+    # Times run_with_retry re-runs a unit of work that hit "database is
+    # locked" after the busy_timeout pragma ran out
+    lock_retries: int = 3
+    # SQLite pragmas applied to every new connection, in order
+    pragmas: dict[str, str | int] = field(default_factory=dict)
+    # Statements slower than this many milliseconds go to the slow-query log
+    slow_query_ms: float | None = None
+    # File the slow-query log is appended to (default: stderr)
+    slow_query_log: str | None = None
+
+    @property
+    def async_url(self) -> str:
+        # SQLite URLs are switched to the aiosqlite driver for the async engine
+        if self.url.startswith("sqlite://"):
+            return "sqlite+aiosqlite://" + self.url[len("sqlite://"):]
+        return self.url
+
+    def engine_kwargs(self) -> dict:
+        kwargs = {"echo": self.echo}
+        for name in ("pool_size", "max_overflow", "pool_timeout", "pool_recycle"):
+            value = getattr(self, name)
+            if value is not None:
+                kwargs[name] = value
+        if self.pool_class is not None:
+            kwargs["poolclass"] = POOL_CLASSES[self.pool_class]
+        return kwargs
+
+
+PROFILES = {
+    # Logs every statement and keeps SQLite's durable defaults.
+    "dev": DatabaseConfig(
+        echo=True,
+        pragmas={"busy_timeout": 5000, "foreign_keys": "ON"},
+    ),
+    # WAL journal with relaxed fsync, a 64 MiB page cache and 256 MiB mmap.
+    # Pooled connections are shared by threads, so writers wait up to 5 s
+    # for the write lock and readers never wait for writers.
+    "prod": DatabaseConfig(
+        echo=False,
+        pragmas={
+            "busy_timeout": 5000,
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -64000,
+            "mmap_size": 268435456,
+            "temp_store": "MEMORY",
+            "foreign_keys": "ON",
+        },
+    ),
+}
+
+
+def _parse_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def load_config(environ=None) -> DatabaseConfig:
+    """Build the database configuration from a named profile and env overrides.
+
+    HEALTH_TRACKER_PROFILE selects the profile (default "prod"). Individual
+    settings can then be overridden with HEALTH_TRACKER_DATABASE_URL,
+    HEALTH_TRACKER_DB_ECHO, HEALTH_TRACKER_DB_POOL_SIZE,
+    HEALTH_TRACKER_DB_MAX_OVERFLOW, HEALTH_TRACKER_DB_POOL_TIMEOUT,
+    HEALTH_TRACKER_DB_POOL_RECYCLE, HEALTH_TRACKER_DB_POOL_CLASS,
+    HEALTH_TRACKER_DB_LOCK_RETRIES, HEALTH_TRACKER_SLOW_QUERY_MS,
+    HEALTH_TRACKER_SLOW_QUERY_LOG and HEALTH_TRACKER_SQLITE_<PRAGMA>.
+    """
+    environ = os.environ if environ is None else environ
+
+    profile = environ.get(f"{ENV_PREFIX}PROFILE", DEFAULT_PROFILE)
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown database profile '{profile}'. Choose from: {', '.join(PROFILES)}")
+    config = PROFILES[profile]
+
+    overrides = {}
+    if f"{ENV_PREFIX}DATABASE_URL" in environ:
+        overrides["url"] = environ[f"{ENV_PREFIX}DATABASE_URL"]
+    if f"{ENV_PREFIX}DB_ECHO" in environ:
+        overrides["echo"] = _parse_bool(environ[f"{ENV_PREFIX}DB_ECHO"])
+    for name, cast in (("pool_size", int), ("max_overflow", int), ("pool_timeout", float), ("pool_recycle", int)):
+        key = f"{ENV_PREFIX}DB_{name.upper()}"
+        if key in environ:
+            overrides[name] = cast(environ[key])
+    if f"{ENV_PREFIX}DB_POOL_CLASS" in environ:
+        pool_class = environ[f"{ENV_PREFIX}DB_POOL_CLASS"].lower()
+        if pool_class not in POOL_CLASSES:
+            raise ValueError(f"Unknown pool class '{pool_class}'. Choose from: {', '.join(POOL_CLASSES)}")
+        overrides["pool_class"] = pool_class
+    if f"{ENV_PREFIX}DB_LOCK_RETRIES" in environ:
+        overrides["lock_retries"] = int(environ[f"{ENV_PREFIX}DB_LOCK_RETRIES"])
+    if f"{ENV_PREFIX}SLOW_QUERY_MS" in environ:
+        overrides["slow_query_ms"] = float(environ[f"{ENV_PREFIX}SLOW_QUERY_MS"])
+    if f"{ENV_PREFIX}SLOW_QUERY_LOG" in environ:
+        overrides["slow_query_log"] = environ[f"{ENV_PREFIX}SLOW_QUERY_LOG"] or None
+
+    pragma_prefix = f"{ENV_PREFIX}SQLITE_"
+    pragma_overrides = {
+        key[len(pragma_prefix):].lower(): value
+        for key, value in environ.items()
+        if key.startswith(pragma_prefix)
+    }
+    if pragma_overrides:
+        overrides["pragmas"] = {**config.pragmas, **pragma_overrides}
+
+    return replace(config, **overrides)
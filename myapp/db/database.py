@@ -1,10 +1,53 @@
 # myapp/db/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
+from myapp.db.config import DatabaseConfig, load_config
+from myapp.db.instrumentation import install_slow_query_log
 
-DATABASE_URL = "sqlite:///health_tracker.db"
+def install_pragmas(target: Engine, pragmas: dict[str, str | int]) -> None:
+    if target.dialect.name != "sqlite" or not pragmas:
+        return
 
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    @event.listens_for(target, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def create_engine_from_config(config: DatabaseConfig) -> Engine:
+    new_engine = create_engine(config.url, **config.engine_kwargs())
+    install_pragmas(new_engine, config.pragmas)
+    install_slow_query_log(new_engine, config.slow_query_ms, config.slow_query_log)
+    return new_engine
+
+config = load_config()
+DATABASE_URL = config.url
+
+# The engine is created on first use, so importing the models or a CLI
+# sub-app does not open the database. SessionLocal is bound at that point.
+_engine: Engine | None = None
+_engine_lock = threading.Lock()
+SessionLocal = sessionmaker(autoflush=False, autocommit=False)
+# One session per thread for code that embeds the controllers in a threaded
+# worker; see myapp.db.db.session_scope
+ScopedSession = scoped_session(SessionLocal)
 Base = declarative_base()
 
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        # Threads that race to the first use must share one engine and pool
+        with _engine_lock:
+            if _engine is None:
+                new_engine = create_engine_from_config(config)
+                SessionLocal.configure(bind=new_engine)
+                _engine = new_engine
+    return _engine
+
+def __getattr__(name: str):
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
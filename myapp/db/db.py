@@ -1,11 +1,96 @@
+import random
+import time
+from collections.abc import Callable
+from typing import TypeVar
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 from contextlib import contextmanager
-from myapp.db.database import SessionLocal
+from myapp.db.database import ScopedSession, SessionLocal, config, get_engine
+
+T = TypeVar("T")
+
+# Session.info flag checked by the controllers: when set they flush instead
+# of committing, and whoever opened the transaction commits once.
+UNIT_OF_WORK = "unit_of_work"
+
+# First pause before re-running a unit of work that found the database
+# locked; doubled on each retry, with jitter so writers do not retry in step
+LOCK_RETRY_BACKOFF = 0.05
 
 @contextmanager
-def get_db():
-    db: Session = SessionLocal()
+def transaction(db: Session):
+    """Run the controller calls inside the block as a single unit of work."""
+    db.info[UNIT_OF_WORK] = True
     try:
         yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.info.pop(UNIT_OF_WORK, None)
+
+@contextmanager
+def get_db(unit_of_work: bool = False):
+    get_engine()  # binds SessionLocal on first use
+    db: Session = SessionLocal()
+    try:
+        if unit_of_work:
+            with transaction(db):
+                yield db
+        else:
+            yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@contextmanager
+def session_scope(unit_of_work: bool = False):
+    """The calling thread's session, for controllers embedded in threaded code.
+
+    Nested scopes on the same thread share the session (and its unit of
+    work). The outermost scope closes it, which returns its connection to
+    the pool, so a worker thread holds a connection only while it works.
+    """
+    get_engine()
+    outermost = not ScopedSession.registry.has()
+    db: Session = ScopedSession()
+    try:
+        if unit_of_work and not db.info.get(UNIT_OF_WORK):
+            with transaction(db):
+                yield db
+        else:
+            yield db
+    finally:
+        if outermost:
+            ScopedSession.remove()
+
+def is_lock_error(exc: BaseException) -> bool:
+    return isinstance(exc, OperationalError) and "locked" in str(exc.orig)
+
+def run_with_retry(work: Callable[[Session], T], retries: int | None = None, backoff: float = LOCK_RETRY_BACKOFF,
+                   session_factory: Callable[[], Session] | None = None) -> T:
+    """Run `work(db)` as one unit of work, re-running it if the database is locked.
+
+    SQLite already waits busy_timeout for the write lock; this covers a
+    writer that waited that long, and the lock errors SQLite reports without
+    waiting. The transaction is rolled back before each retry, so `work`
+    must not have effects outside the session. Inside an enclosing unit of
+    work there is nothing to retry on its own, and `work` runs once.
+    With `session_factory` each attempt gets a new session from it instead
+    of the thread's session.
+    """
+    retries = config.lock_retries if retries is None else retries
+    attempt = 0
+    while True:
+        nested = session_factory is None and ScopedSession.registry.has() and ScopedSession().info.get(UNIT_OF_WORK)
+        try:
+            if session_factory is None:
+                with session_scope(unit_of_work=True) as db:
+                    return work(db)
+            with session_factory() as db, transaction(db):
+                return work(db)
+        except OperationalError as exc:
+            if nested or attempt >= retries or not is_lock_error(exc):
+                raise
+        time.sleep(random.uniform(0, backoff * 2 ** attempt))
+        attempt += 1
@@ -0,0 +1,189 @@
+# myapp/db/instrumentation.py
+import contextvars
+import json
+import logging
+import re
+import sys
+import time
+from dataclasses import dataclass
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+SLOW_QUERY_LOGGER = "myapp.db.slow_queries"
+CONTROLLER_PACKAGE = "myapp.controllers"
+
+
+@dataclass
+class QueryRecord:
+    statement: str
+    duration: float
+    # Rows affected by INSERT/UPDATE/DELETE, or rows returned by a session
+    # SELECT; None where neither is known (streamed or Core-level reads)
+    rowcount: int | None
+    caller: str | None
+
+
+def find_caller(frame=None) -> str | None:
+    # The outermost controller function on the stack, i.e. the call the CLI
+    # made rather than the helpers (save, get_many, ...) it went through
+    caller = None
+    frame = frame or sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(CONTROLLER_PACKAGE + "."):
+            caller = f"{module.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return caller
+
+
+def normalize_statement(statement: str, width: int | None = None) -> str:
+    statement = re.sub(r"\s+", " ", statement).strip()
+    if width is not None and len(statement) > width:
+        statement = statement[:width - 3] + "..."
+    return statement
+
+
+def slow_query_logger(path: str | None = None) -> logging.Logger:
+    logger = logging.getLogger(SLOW_QUERY_LOGGER)
+    if path and not any(getattr(handler, "baseFilename", None) == path for handler in logger.handlers):
+        handler = logging.FileHandler(path, delay=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+
+class QueryInstrumentation:
+    """Time every statement run on an engine, or on every engine.
+
+    Installed on an Engine instance it covers that engine; installed on the
+    Engine class (the default) it also covers engines created later, such as
+    the lazily created application engine. With `record` set each statement
+    is kept in `records` for summary(); statements slower than
+    `slow_threshold_ms` are logged as one JSON object per line.
+
+    SQLite reports no rowcount for a SELECT, so while recording, SELECTs
+    run through a Session are counted by buffering their result; results
+    streamed with yield_per are left uncounted.
+    """
+
+    def __init__(self, record: bool = True, slow_threshold_ms: float | None = None, logger: logging.Logger | None = None):
+        self.record = record
+        self.slow_threshold_ms = slow_threshold_ms
+        self.logger = logger or slow_query_logger()
+        self.records: list[QueryRecord] = []
+        self._targets = []
+        # Start times live on the connection, per instrumentation, so nested
+        # or concurrent instrumentations do not see each other's timers
+        self._timer_key = ("query_start_times", id(self))
+        # Statements run by the session execution in progress, waiting for
+        # their row count
+        self._pending = contextvars.ContextVar(f"pending_queries_{id(self)}", default=None)
+
+    def install(self, target=Engine) -> "QueryInstrumentation":
+        event.listen(target, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(target, "after_cursor_execute", self._after_cursor_execute)
+        if not self._targets:
+            event.listen(Session, "do_orm_execute", self._do_orm_execute)
+        self._targets.append(target)
+        return self
+
+    def remove(self) -> None:
+        for target in self._targets:
+            event.remove(target, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(target, "after_cursor_execute", self._after_cursor_execute)
+        if self._targets:
+            event.remove(Session, "do_orm_execute", self._do_orm_execute)
+        self._targets.clear()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(self._timer_key, []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        timers = conn.info.get(self._timer_key)
+        if not timers:
+            return
+        duration = time.perf_counter() - timers.pop()
+        slow = self.slow_threshold_ms is not None and duration * 1000 >= self.slow_threshold_ms
+        if not (self.record or slow):
+            return
+
+        rowcount = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+        query = QueryRecord(statement, duration, rowcount, find_caller())
+        if self.record:
+            self.records.append(query)
+        pending = self._pending.get()
+        if rowcount is None and cursor.description is not None and pending is not None:
+            # Logged by _do_orm_execute once the rows are counted
+            pending.append((query, slow, executemany))
+        elif slow:
+            self._log_slow(query, executemany)
+
+    def _do_orm_execute(self, orm_execute_state):
+        options = orm_execute_state.execution_options
+        if not self.record or not orm_execute_state.is_select or options.get("yield_per") or options.get("stream_results"):
+            return None
+        pending = []
+        token = self._pending.set(pending)
+        try:
+            result = orm_execute_state.invoke_statement()
+        finally:
+            self._pending.reset(token)
+        # Buffer the rows to count them; the caller reads them from the copy
+        frozen = result.freeze()
+        for query, slow, executemany in pending:
+            query.rowcount = len(frozen.data)
+            if slow:
+                self._log_slow(query, executemany)
+        return frozen()
+
+    def _log_slow(self, query: QueryRecord, executemany: bool) -> None:
+        self.logger.warning(json.dumps({
+            "event": "slow_query",
+            "duration_ms": round(query.duration * 1000, 3),
+            "threshold_ms": self.slow_threshold_ms,
+            "rows": query.rowcount,
+            "caller": query.caller,
+            "executemany": executemany,
+            "statement": normalize_statement(query.statement),
+        }))
+
+    def summary(self) -> list[dict]:
+        """Recorded statements grouped by caller and statement text, slowest total first."""
+        groups: dict[tuple, dict] = {}
+        for query in self.records:
+            statement = normalize_statement(query.statement)
+            group = groups.setdefault((query.caller, statement), {
+                "caller": query.caller, "statement": statement, "calls": 0, "total": 0.0, "max": 0.0, "rows": None,
+            })
+            group["calls"] += 1
+            group["total"] += query.duration
+            group["max"] = max(group["max"], query.duration)
+            if query.rowcount is not None:
+                group["rows"] = (group["rows"] or 0) + query.rowcount
+        return sorted(groups.values(), key=lambda group: group["total"], reverse=True)
+
+    def format_summary(self, elapsed: float | None = None, limit: int = 20, width: int = 60) -> str:
+        groups = self.summary()
+        total = sum(query.duration for query in self.records)
+        header = f"{len(self.records)} statements, {total * 1000:.2f} ms in SQL"
+        if elapsed is not None:
+            header += f", {elapsed * 1000:.2f} ms total"
+        lines = [header]
+        if groups:
+            lines.append(f"{'calls':>6} {'total ms':>10} {'max ms':>9} {'rows':>7}  {'caller':<40} statement")
+            for group in groups[:limit]:
+                rows = "-" if group["rows"] is None else str(group["rows"])
+                lines.append(
+                    f"{group['calls']:>6} {group['total'] * 1000:>10.2f} {group['max'] * 1000:>9.2f} {rows:>7}  "
+                    f"{group['caller'] or '-':<40} {normalize_statement(group['statement'], width)}"
+                )
+            if len(groups) > limit:
+                lines.append(f"... {len(groups) - limit} more")
+        return "\n".join(lines)
+
+
+def install_slow_query_log(target, threshold_ms: float | None, path: str | None = None) -> QueryInstrumentation | None:
+    if threshold_ms is None:
+        return None
+    return QueryInstrumentation(record=False, slow_threshold_ms=threshold_ms, logger=slow_query_logger(path)).install(target)
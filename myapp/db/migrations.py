@@ -0,0 +1,141 @@
+# myapp/db/migrations.py
+from collections import defaultdict
+from sqlalchemy import Table, inspect, insert, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from myapp.db.database import Base
+from myapp.controllers.rollup_controller import rebuild_daily_totals
+
+import myapp.models.user
+import myapp.models.food
+import myapp.models.food_entry
+import myapp.models.goal
+import myapp.models.meal_plan
+import myapp.models.daily_total
+from myapp.models.daily_total import ROLLUP_TRIGGERS
+from myapp.models.food import Food, normalize_food_name
+from myapp.models.food_entry import FoodEntry
+
+def upgrade_schema(engine: Engine) -> list[str]:
+    """Bring an existing database up to date with the models.
+
+    `create_all` only creates indexes together with their table, so indexes
+    added to a model later are created here for tables that already exist.
+    A newly created daily_totals rollup is filled from the existing entries,
+    and food names stored on the entries are moved into the foods catalog.
+    A newly created foods_fts search index is built from the catalog, and
+    tables the models declare AUTOINCREMENT are rebuilt with it.
+    Returns the names of the tables and indexes that were created.
+    """
+    created = []
+    with engine.begin() as conn:
+        existing_tables = set(inspect(conn).get_table_names())
+        Base.metadata.create_all(bind=conn)
+
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                created.append(table.name)
+                continue
+            existing_indexes = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+            if table.name == "food_entries" and "food_id" not in {c["name"] for c in inspect(conn).get_columns(table.name)}:
+                # The rebuild creates every index of the new table
+                migrate_food_names(conn)
+                created.extend(index.name for index in table.indexes if index.name not in existing_indexes)
+                continue
+            if table.dialect_options["sqlite"]["autoincrement"] and not has_autoincrement(conn, table.name):
+                # The rebuild creates every index of the new table
+                migrate_autoincrement(conn, table)
+                created.append(table.name)
+                continue
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(bind=conn)
+                    created.append(index.name)
+
+    # The search index is created empty; fill it from the catalog
+    if "foods_fts" not in existing_tables and "foods_fts" in inspect(engine).get_table_names():
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO foods_fts (foods_fts) VALUES ('rebuild')"))
+        created.append("foods_fts")
+
+    # A rollup table added to an existing database starts out empty
+    if "daily_totals" in created and "food_entries" in existing_tables:
+        with Session(bind=engine) as db:
+            rebuild_daily_totals(db)
+
+    return created
+
+def migrate_food_names(conn: Connection) -> int:
+    """Replace food_entries.food (free text) with food_id into the foods catalog.
+
+    Names differing only in case or whitespace become one catalog row, named
+    after the earliest entry, with the average calories as its default.
+    SQLite cannot change a column in place, so food_entries is rebuilt; ids,
+    indexes and the rollup triggers are kept. Returns the number of foods.
+    """
+    variants = defaultdict(list)
+    for food, first_id, entries, calories in conn.execute(text(
+        "SELECT food, MIN(id), COUNT(*), SUM(calories) FROM food_entries GROUP BY food"
+    )):
+        variants[normalize_food_name(food)].append((first_id, food, entries, calories))
+
+    food_ids = {}
+    for normalized, rows in variants.items():
+        first_id, name, _, _ = min(rows)
+        entries = sum(row[2] for row in rows)
+        default_calories = round(sum(row[3] for row in rows) / entries)
+        food_id = conn.execute(
+            insert(Food.__table__).values(name=" ".join(name.split()), normalized_name=normalized, default_calories=default_calories)
+        ).inserted_primary_key[0]
+        for row in rows:
+            food_ids[row[1]] = food_id
+
+    entries_table = FoodEntry.__table__
+    conn.execute(text("CREATE TEMPORARY TABLE food_name_ids (food VARCHAR PRIMARY KEY, food_id INTEGER NOT NULL)"))
+    if food_ids:
+        conn.execute(text("INSERT INTO food_name_ids (food, food_id) VALUES (:food, :food_id)"), [
+            {"food": food, "food_id": food_id} for food, food_id in food_ids.items()
+        ])
+    # Index names are global in SQLite, so the old ones go before the rebuild
+    for index in inspect(conn).get_indexes("food_entries"):
+        conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+    conn.execute(text("ALTER TABLE food_entries RENAME TO food_entries_legacy"))
+    entries_table.create(bind=conn)
+    conn.execute(text(
+        "INSERT INTO food_entries (id, user_id, food_id, calories, date) "
+        "SELECT e.id, e.user_id, n.food_id, e.calories, e.date "
+        "FROM food_entries_legacy e JOIN food_name_ids n ON n.food = e.food"
+    ))
+    # The rollup triggers moved with the renamed table and go with it; the
+    # copied rows leave daily_totals unchanged
+    conn.execute(text("DROP TABLE food_entries_legacy"))
+    conn.execute(text("DROP TABLE food_name_ids"))
+    if conn.dialect.name == "sqlite":
+        for trigger in ROLLUP_TRIGGERS:
+            conn.execute(text(trigger))
+    return len(variants)
+
+def has_autoincrement(conn: Connection, table_name: str) -> bool:
+    sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table_name}).scalar()
+    return sql is not None and "AUTOINCREMENT" in sql.upper()
+
+def migrate_autoincrement(conn: Connection, table: Table) -> None:
+    """Rebuild `table` as declared, with AUTOINCREMENT on its id.
+
+    Without it SQLite hands out the id of the newest row again once that
+    row is deleted, below an incremental export's high-water mark. Rows,
+    indexes and, for food_entries, the rollup triggers are kept; ids freed
+    before the rebuild may still be handed out once more.
+    """
+    columns = ", ".join(f'"{column.name}"' for column in table.columns)
+    for index in inspect(conn).get_indexes(table.name):
+        conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+    conn.execute(text(f'ALTER TABLE "{table.name}" RENAME TO "{table.name}_legacy"'))
+    table.create(bind=conn)
+    conn.execute(text(f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "{table.name}_legacy"'))
+    # Triggers moved with the renamed table and go with it; the copied rows
+    # leave daily_totals unchanged
+    conn.execute(text(f'DROP TABLE "{table.name}_legacy"'))
+    if table.name == "food_entries":
+        for trigger in ROLLUP_TRIGGERS:
+            conn.execute(text(trigger))
@@ -0,0 +1,56 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, DDL, event
+from myapp.db.database import Base
+
+class DailyTotal(Base):
+    __tablename__ = "daily_totals"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True, nullable=False)
+    date = Column(Date, primary_key=True, nullable=False)
+    calories = Column(Integer, nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)
+
+
+# The rollup is maintained by triggers on food_entries, so every write path
+# (ORM, bulk Core statements, other tools) keeps it in sync. Rows are removed
+# once their entry_count drops to zero.
+ROLLUP_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_food_entries_rollup_insert
+    AFTER INSERT ON food_entries
+    BEGIN
+        INSERT INTO daily_totals (user_id, date, calories, entry_count)
+        VALUES (NEW.user_id, NEW.date, NEW.calories, 1)
+        ON CONFLICT (user_id, date) DO UPDATE
+        SET calories = calories + excluded.calories, entry_count = entry_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_food_entries_rollup_delete
+    AFTER DELETE ON food_entries
+    BEGIN
+        UPDATE daily_totals
+        SET calories = calories - OLD.calories, entry_count = entry_count - 1
+        WHERE user_id = OLD.user_id AND date = OLD.date;
+        DELETE FROM daily_totals
+        WHERE user_id = OLD.user_id AND date = OLD.date AND entry_count <= 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_food_entries_rollup_update
+    AFTER UPDATE OF user_id, date, calories ON food_entries
+    BEGIN
+        UPDATE daily_totals
+        SET calories = calories - OLD.calories, entry_count = entry_count - 1
+        WHERE user_id = OLD.user_id AND date = OLD.date;
+        DELETE FROM daily_totals
+        WHERE user_id = OLD.user_id AND date = OLD.date AND entry_count <= 0;
+        INSERT INTO daily_totals (user_id, date, calories, entry_count)
+        VALUES (NEW.user_id, NEW.date, NEW.calories, 1)
+        ON CONFLICT (user_id, date) DO UPDATE
+        SET calories = calories + excluded.calories, entry_count = entry_count + 1;
+    END
+    """,
+]
+
+for trigger in ROLLUP_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(trigger).execute_if(dialect="sqlite"))
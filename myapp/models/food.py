@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Integer, String, DDL, event
+from myapp.db.database import Base
+
+def normalize_food_name(name: str) -> str:
+    # Catalog key: case and runs of whitespace do not make a different food
+    return " ".join(name.split()).casefold()
+
+class Food(Base):
+    __tablename__ = "foods"
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    # Display name as first entered, with whitespace collapsed
+    name = Column(String, nullable=False)
+    normalized_name = Column(String, unique=True, nullable=False)
+    default_calories = Column(Integer, nullable=True)
+
+
+def fts5_available(connection) -> bool:
+    if connection.dialect.name != "sqlite":
+        return False
+    options = {row[0] for row in connection.exec_driver_sql("PRAGMA compile_options")}
+    return "ENABLE_FTS5" in options
+
+# Full-text index over the catalog names, for `food search`. It stores no
+# copy of the names (external content) and is kept in sync by triggers, so
+# every write path to foods updates it. Builds of SQLite without FTS5 skip
+# it and search falls back to LIKE.
+FOOD_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS foods_fts USING fts5(
+        name, content='foods', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_foods_fts_insert
+    AFTER INSERT ON foods
+    BEGIN
+        INSERT INTO foods_fts (rowid, name) VALUES (NEW.id, NEW.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_foods_fts_delete
+    AFTER DELETE ON foods
+    BEGIN
+        INSERT INTO foods_fts (foods_fts, rowid, name) VALUES ('delete', OLD.id, OLD.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_foods_fts_update
+    AFTER UPDATE OF name ON foods
+    BEGIN
+        INSERT INTO foods_fts (foods_fts, rowid, name) VALUES ('delete', OLD.id, OLD.name);
+        INSERT INTO foods_fts (rowid, name) VALUES (NEW.id, NEW.name);
+    END
+    """,
+]
+
+for statement in FOOD_SEARCH_DDL:
+    event.listen(
+        Base.metadata, "after_create",
+        DDL(statement).execute_if(callable_=lambda ddl, target, bind, **kw: fts5_available(bind)),
+    )
@@ -1,14 +1,54 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, ForeignKey, Date, Index, event
+from sqlalchemy.orm import Session, relationship
 from myapp.db.database import Base
+from myapp.models import daily_total  # registers the daily_totals rollup and its triggers
+from myapp.models.food import Food
 
 class FoodEntry(Base):
     __tablename__ = 'food_entries'
+    __table_args__ = (
+        Index('ix_food_entries_user_id_date', 'user_id', 'date'),
+        Index('ix_food_entries_user_id_id', 'user_id', 'id'),
+        # Newest entries of one food first, for `food search`
+        Index('ix_food_entries_food_id_date', 'food_id', 'date'),
+        # Ids are never reused, so an export's high-water mark stays valid
+        {'sqlite_autoincrement': True},
+    )
 
     id = Column(Integer, primary_key=True ,nullable=False)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
-    food = Column(String, nullable=False)
+    food_id = Column(Integer, ForeignKey('foods.id'), nullable=False)
     calories = Column(Integer, nullable=False)
     date = Column(Date, nullable=False)
 
-    user = relationship('User', back_populates='entries')
\ No newline at end of file
+    user = relationship('User', back_populates='entries')
+    # The catalog row is loaded in the same query as the entry
+    food_item = relationship(Food, lazy='joined', innerjoin=True)
+
+    @property
+    def food(self) -> str | None:
+        pending = self.__dict__.get('_pending_food')
+        if pending is not None:
+            return pending
+        return self.food_item.name if self.food_item is not None else None
+
+    @food.setter
+    def food(self, name: str) -> None:
+        # Resolved to a catalog row when the session flushes
+        self.__dict__['_pending_food'] = " ".join(name.split())
+        self.food_item = None
+
+
+@event.listens_for(Session, "before_flush")
+def _resolve_food_names(session, flush_context, instances):
+    pending = [
+        obj for obj in (*session.new, *session.dirty)
+        if isinstance(obj, FoodEntry) and '_pending_food' in obj.__dict__
+    ]
+    if not pending:
+        return
+    # Imported here: the catalog cache lives with the controllers, which import the models
+    from myapp.controllers.food_controller import get_or_create_food
+
+    for entry in pending:
+        entry.food_item = get_or_create_food(session, entry.__dict__.pop('_pending_food'), entry.calories)
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from myapp.db.database import Base
 
 class Goal(Base):
     __tablename__ = 'goals'
+    __table_args__ = (
+        Index('ix_goals_user_id_id', 'user_id', 'id'),
+        # Ids are never reused, so an export's high-water mark stays valid
+        {'sqlite_autoincrement': True},
+    )
 
     id = Column(Integer, primary_key=True,nullable=False)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
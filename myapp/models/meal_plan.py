@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from myapp.db.database import Base
 
 class MealPlan(Base):
     __tablename__ = "meal_plans"
+    __table_args__ = (
+        Index("ix_meal_plans_user_id_week", "user_id", "week"),
+        Index("ix_meal_plans_user_id_id", "user_id", "id"),
+        # Ids are never reused, so an export's high-water mark stays valid
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True,nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,13 +1,33 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import replace
 from datetime import date, datetime
-from myapp.db.db import get_db
+from sqlalchemy.orm import Session
+from myapp.db import database
+from myapp.db.migrations import upgrade_schema
 from myapp.controllers.report_controller import generate_user_report
 from myapp.controllers.user_controller import create_user
 from myapp.controllers.food_entry_controller import create_food_entry
 from myapp.controllers.goal_controller import create_goal
 
+@contextmanager
+def temporary_db():
+    """Yield a session on a fresh database file that is removed afterwards."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = database.create_engine_from_config(
+            replace(database.config, url=f"sqlite:///{os.path.join(tmp_dir, 'report.db')}")
+        )
+        upgrade_schema(engine)
+        try:
+            with Session(engine) as db:
+                yield db
+        finally:
+            engine.dispose()
+
 def test_report():
     """Test the enhanced report functionality."""
-    with get_db() as db:
+    with temporary_db() as db:
         # Create a test user with a unique name using timestamp
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         user = create_user(db, f"test_user_report_{timestamp}")
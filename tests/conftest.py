@@ -4,7 +4,8 @@ Pytest configuration and fixtures for the health tracker CLI app.
 import pytest
 import tempfile
 import os
-from sqlalchemy import create_engine, text
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 from myapp.db.database import Base
 from myapp.models.user import User
@@ -38,6 +39,46 @@ def test_db():
     os.unlink(db_path)
 
 
+@pytest.fixture
+def prod_db(tmp_path):
+    """Session on a database built like the app's: prod profile pragmas (foreign keys on) and the full schema."""
+    from dataclasses import replace
+    from myapp.db.config import PROFILES
+    from myapp.db.database import create_engine_from_config
+    from myapp.db.migrations import upgrade_schema
+
+    engine = create_engine_from_config(replace(PROFILES["prod"], url=f"sqlite:///{tmp_path / 'prod.db'}"))
+    upgrade_schema(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def count_queries(test_db):
+    """Context manager collecting every SQL statement issued on the test database.
+
+    Usage: ``with count_queries() as statements: ...`` then ``len(statements)``.
+    """
+    engine = test_db.get_bind()
+
+    @contextmanager
+    def counting():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counting
+
+
 @pytest.fixture
 def sample_user(test_db):
     """Create a sample user for testing."""
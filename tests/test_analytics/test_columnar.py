@@ -0,0 +1,122 @@
+"""
+Tests for the columnar food entry snapshot.
+"""
+import pytest
+from datetime import date
+from myapp.analytics import columnar
+from myapp.analytics.columnar import load_food_entries
+from myapp.controllers.food_entry_controller import bulk_create_food_entries
+
+ENTRIES = [
+    # (user, food, calories, date); 2024-01-01 was a Monday
+    (0, "Oatmeal", 300, date(2024, 1, 1)),
+    (0, "Pizza", 900, date(2024, 1, 1)),
+    (0, "Oatmeal", 250, date(2024, 1, 2)),
+    (1, "Pizza", 800, date(2024, 1, 1)),
+    (1, "Apple", 95, date(2024, 1, 8)),
+    (2, "Apple", 80, date(2024, 1, 3)),
+]
+
+
+@pytest.fixture
+def entries(test_db, multiple_users):
+    """Create the ENTRIES for the three users."""
+    user_ids = [user.id for user in multiple_users]
+    bulk_create_food_entries(test_db, [
+        {"user_id": user_ids[user], "food": food, "calories": calories, "date": day}
+        for user, food, calories, day in ENTRIES
+    ])
+    return user_ids
+
+
+@pytest.fixture(params=[False, True], ids=["array", "numpy"])
+def use_numpy(request):
+    if request.param:
+        pytest.importorskip("numpy")
+    return request.param
+
+
+@pytest.mark.integration
+class TestFoodEntryColumns:
+    """Test cases for loading and querying the snapshot, with and without NumPy."""
+
+    def test_load(self, test_db, entries, use_numpy):
+        """Test that every row is loaded into 4-byte columns with ordinal dates."""
+        columns = load_food_entries(test_db, use_numpy=use_numpy)
+
+        assert len(columns) == len(ENTRIES)
+        assert columns.vectorised is use_numpy
+        assert columns.nbytes == 16 * len(ENTRIES)
+        assert list(columns.day)[:2] == [date(2024, 1, 1).toordinal()] * 2
+        assert sorted(columns.food_names.values()) == ["Apple", "Oatmeal", "Pizza"]
+        assert len(load_food_entries(test_db, user_id=entries[0], use_numpy=use_numpy)) == 3
+        assert len(load_food_entries(test_db, start_date=date(2024, 1, 2), end_date=date(2024, 1, 3), use_numpy=use_numpy)) == 2
+
+    def test_group_by(self, test_db, entries, use_numpy):
+        columns = load_food_entries(test_db, use_numpy=use_numpy)
+        names = {name: food_id for food_id, name in columns.food_names.items()}
+
+        by_food = columns.group_by("food_id").to_dict()
+        assert by_food[names["Pizza"]] == (2, 1700)
+        assert by_food[names["Apple"]] == (2, 175)
+        assert columns.group_by("weekday").to_dict() == {0: (4, 2095), 1: (1, 250), 2: (1, 80)}
+        assert columns.group_by("user_id", "day").to_dict()[(entries[0], date(2024, 1, 1).toordinal())] == (2, 1200)
+
+    def test_where(self, test_db, entries, use_numpy):
+        columns = load_food_entries(test_db, use_numpy=use_numpy)
+
+        subset = columns.where(user_id=entries[0], min_calories=260)
+        assert sorted(subset.calories) == [300, 900]
+        assert len(columns.where(start_date=date(2024, 1, 3))) == 2
+        assert columns.where() is columns
+
+    def test_histogram_weekdays_and_top(self, test_db, entries, use_numpy):
+        columns = load_food_entries(test_db, use_numpy=use_numpy)
+        names = {name: food_id for food_id, name in columns.food_names.items()}
+
+        assert columns.histogram(250) == {0: 2, 250: 2, 750: 2}
+        # Mondays: user 0 ate 1200 on Jan 1, user 1 800 on Jan 1 and 95 on Jan 8
+        assert columns.weekday_averages() == {0: round(2095 / 3, 1), 1: 250.0, 2: 80.0}
+        assert columns.group_by("food_id").top(1) == [(names["Pizza"], 2, 1700)]
+        assert [row[0] for row in columns.group_by("food_id").top(5, by="counts")] == [
+            names["Oatmeal"], names["Pizza"], names["Apple"]
+        ]
+
+    def test_invalid_arguments(self, test_db, entries, use_numpy):
+        columns = load_food_entries(test_db, use_numpy=use_numpy)
+
+        with pytest.raises(ValueError):
+            columns.group_by("colour")
+        with pytest.raises(ValueError):
+            columns.group_by()
+        with pytest.raises(ValueError):
+            columns.histogram(0)
+
+
+@pytest.mark.unit
+class TestNumpyGroupPaths:
+    """Test that the bincount, sort and unique group-by paths agree."""
+
+    def test_paths_agree(self, monkeypatch):
+        np = pytest.importorskip("numpy")
+        rng = np.random.default_rng(5)
+        columns = columnar.FoodEntryColumns(
+            user_id=rng.integers(1, 200, 5000, dtype=np.int32),
+            food_id=rng.integers(1, 50, 5000, dtype=np.int32),
+            calories=rng.integers(0, 1500, 5000, dtype=np.int32),
+            day=rng.integers(738_886, 739_251, 5000, dtype=np.int32),
+        )
+        dense = columns.group_by("user_id", "day").to_dict()
+        averages = columns.weekday_averages()
+
+        monkeypatch.setattr(columnar, "DENSE_GROUP_LIMIT", 0)
+        monkeypatch.setattr(columnar, "DISTINCT_BITMAP_LIMIT", 0)
+        assert columns.group_by("user_id", "day").to_dict() == dense
+        assert columns.weekday_averages() == averages
+
+        # A negative value cannot be packed into the sort key: np.unique path
+        key = (int(columns.user_id[0]), int(columns.day[0]))
+        count, total = dense[key]
+        dense[key] = (count, total - int(columns.calories[0]) - 1)
+        columns.calories[0] = -1
+        assert columns.group_by("user_id", "day").to_dict() == dense
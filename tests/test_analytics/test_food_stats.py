@@ -0,0 +1,72 @@
+"""
+Tests for the streaming top-foods and histogram accumulator.
+"""
+import random
+import pytest
+from myapp.analytics.food_stats import FoodStats, histogram_rows
+
+
+@pytest.mark.unit
+class TestFoodStats:
+    """Test cases for FoodStats."""
+
+    def test_top_matches_full_sort(self):
+        """Test the bounded heap against sorting every food."""
+        rng = random.Random(3)
+        entries = [(f"Food {rng.randrange(200)}", rng.randint(50, 900)) for _ in range(5000)]
+        stats = FoodStats().update(entries)
+
+        totals = {}
+        for food, calories in entries:
+            count, total = totals.get(food, (0, 0))
+            totals[food] = (count + 1, total + calories)
+        expected = sorted(totals, key=lambda food: (-totals[food][1], -totals[food][0], food))[:10]
+
+        assert [row["food"] for row in stats.top(10)] == expected
+        assert sum(row["share"] for row in stats.top(200)) == pytest.approx(100, abs=0.5)
+
+    def test_names_are_normalized(self):
+        stats = FoodStats().update([("Greek  Yogurt", 120), ("greek yogurt", 150), ("Apple", 95)])
+
+        assert stats.top(by="entries")[0] == {"food": "Greek Yogurt", "entries": 2, "calories": 270, "share": 66.7}
+
+    def test_ties_ordered_by_name(self):
+        stats = FoodStats().update([("Pear", 100), ("Apple", 100)])
+
+        assert [row["food"] for row in stats.top(2)] == ["Apple", "Pear"]
+
+    def test_histogram(self):
+        stats = FoodStats(bucket=50).update([("A", 10), ("B", 49), ("C", 160), ("D", -5)])
+
+        assert stats.histogram() == [
+            {"low": -50, "high": 0, "count": 1},
+            {"low": 0, "high": 50, "count": 2},
+            {"low": 50, "high": 100, "count": 0},
+            {"low": 100, "high": 150, "count": 0},
+            {"low": 150, "high": 200, "count": 1},
+        ]
+
+    def test_histogram_with_outlier(self):
+        """Test one far-off value does not fill the histogram with empty buckets."""
+        stats = FoodStats(bucket=10).update([("A", 95), ("B", 110), ("C", 50_000)])
+
+        assert stats.histogram() == [
+            {"low": 90, "high": 100, "count": 1},
+            {"low": 110, "high": 120, "count": 1},
+            {"low": 50_000, "high": 50_010, "count": 1},
+        ]
+        assert len(histogram_rows({0: 1, 49: 1}, 10)) == 50
+        assert len(histogram_rows({0: 1, 50: 1}, 10)) == 2
+
+    def test_empty(self):
+        stats = FoodStats()
+
+        assert stats.top() == []
+        assert stats.histogram() == []
+        assert histogram_rows({}, 100) == []
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            FoodStats(bucket=0)
+        with pytest.raises(ValueError, match="Unknown ranking"):
+            FoodStats().top(by="protein")
@@ -0,0 +1,109 @@
+"""
+Tests for rolling-window and trend analytics.
+"""
+import random
+import statistics
+import pytest
+from datetime import date, timedelta
+from myapp.analytics.trends import compute_trends
+
+START = date(2024, 1, 1)
+
+
+def naive_rolling(calories, tracked, window):
+    # O(days x window) reference: average the tracked days of each window
+    result = []
+    for i in range(len(calories)):
+        days = [calories[j] for j in range(max(0, i - window + 1), i + 1) if tracked[j]]
+        result.append(round(sum(days) / len(days), 1) if days else None)
+    return result
+
+
+def random_rows(days, seed=7):
+    rng = random.Random(seed)
+    return [
+        (START + timedelta(days=offset), 3, rng.randint(1200, 2800))
+        for offset in range(days) if rng.random() < 0.8
+    ]
+
+
+@pytest.mark.unit
+class TestComputeTrends:
+    """Test cases for compute_trends on the pure-Python path."""
+
+    def test_rolling_averages_match_naive(self):
+        """Test the sliding windows against a per-day recomputation."""
+        days = 120
+        rows = random_rows(days)
+        by_date = {day: calories for day, _, calories in rows}
+        calories = [by_date.get(START + timedelta(days=i), 0) for i in range(days)]
+        tracked = [START + timedelta(days=i) in by_date for i in range(days)]
+
+        trends = compute_trends(START, START + timedelta(days=days - 1), rows, use_numpy=False)
+
+        assert [row["rolling_7"] for row in trends["daily"]] == naive_rolling(calories, tracked, 7)
+        assert [row["rolling_30"] for row in trends["daily"]] == naive_rolling(calories, tracked, 30)
+        assert trends["stddev_daily_calories"] == round(statistics.pstdev(by_date.values()), 1)
+        assert trends["days_tracked"] == len(rows)
+
+    def test_untracked_days_are_missing(self):
+        """Test that gaps are not averaged in as zero calories."""
+        rows = [(date(2024, 1, 1), 1, 2000), (date(2024, 1, 4), 2, 1000)]
+
+        trends = compute_trends(date(2024, 1, 1), date(2024, 1, 4), rows)
+
+        assert [row["calories"] for row in trends["daily"]] == [2000, None, None, 1000]
+        assert [row["rolling_7"] for row in trends["daily"]] == [2000.0, 2000.0, 2000.0, 1500.0]
+        assert trends["avg_daily_calories"] == 1500.0
+
+    def test_week_over_week(self):
+        """Test weekly blocks from the start date and their change."""
+        rows = [(START + timedelta(days=i), 1, 1000 if i < 7 else 1500) for i in range(10)]
+
+        weeks = compute_trends(START, START + timedelta(days=13), rows)["weeks"]
+
+        assert weeks[0] == {
+            "week_start": "2024-01-01", "calories": 7000, "days_tracked": 7,
+            "avg_daily_calories": 1000.0, "change": None, "change_percent": None,
+        }
+        assert weeks[1]["days_tracked"] == 3
+        assert (weeks[1]["change"], weeks[1]["change_percent"]) == (500.0, 50.0)
+
+    def test_goal_streaks(self):
+        """Test current and longest runs of tracked days at or under the goal."""
+        calories = [1800, 1900, 2100, 1700, 1600, 1500, None, 1900, 2000]
+        rows = [(START + timedelta(days=i), 1, c) for i, c in enumerate(calories) if c is not None]
+
+        trends = compute_trends(START, START + timedelta(days=len(calories) - 1), rows, daily_goal=2000)
+
+        assert trends["longest_streak_under_goal"] == 3
+        assert trends["current_streak_under_goal"] == 2
+        assert "current_streak_under_goal" not in compute_trends(START, START, rows)
+
+    def test_empty_and_invalid_ranges(self):
+        trends = compute_trends(START, START + timedelta(days=2), [], daily_goal=2000)
+        assert trends["days_tracked"] == 0
+        assert trends["stddev_daily_calories"] is None
+        assert trends["current_streak_under_goal"] == 0
+
+        with pytest.raises(ValueError):
+            compute_trends(START, START - timedelta(days=1), [])
+
+
+@pytest.mark.unit
+class TestComputeTrendsNumpy:
+    """Test cases for the NumPy path, which must agree with the Python one."""
+
+    def test_paths_agree(self):
+        pytest.importorskip("numpy")
+        end = START + timedelta(days=3 * 365)
+        rows = random_rows(3 * 365 + 1, seed=11)
+
+        assert compute_trends(START, end, rows, 2000, use_numpy=True) == compute_trends(START, end, rows, 2000, use_numpy=False)
+
+    def test_missing_numpy(self, monkeypatch):
+        monkeypatch.setattr("myapp.analytics.trends.HAVE_NUMPY", False)
+
+        with pytest.raises(RuntimeError):
+            compute_trends(START, START, [], use_numpy=True)
+        assert compute_trends(START, START + timedelta(days=800), [])["days_tracked"] == 0
@@ -0,0 +1,142 @@
+"""
+Tests for the interactive shell and the socket daemon.
+"""
+import socket
+import threading
+import pytest
+from typer.testing import CliRunner
+from unittest.mock import patch
+from myapp.cli.__main__ import app as main_app
+from myapp.cli.client import DaemonClient
+from myapp.cli.daemon import make_server, run_command
+from myapp.controllers.report_cache import get_report_cache
+from myapp.controllers.user_controller import get_all_users
+
+
+@pytest.fixture
+def cli_db(test_db):
+    """Route the user and food sub-apps to the test database."""
+    with patch('myapp.cli.user.get_db') as user_db, patch('myapp.cli.food.get_db') as food_db:
+        user_db.return_value.__enter__.return_value = test_db
+        food_db.return_value.__enter__.return_value = test_db
+        yield test_db
+
+
+@pytest.fixture
+def daemon(tmp_path, cli_db):
+    """Run the command server on a temporary socket in a background thread."""
+    socket_path = str(tmp_path / "daemon.sock")
+    server = make_server(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.cli
+class TestRunCommand:
+    """Test cases for running commands in-process."""
+
+    def test_runs_command_and_captures_output(self, cli_db):
+        exit_code, output = run_command(["user", "add-user", "alice"])
+
+        assert exit_code == 0
+        assert "User created with ID 1 and name 'alice'" in output
+        assert [user.name for user in get_all_users(cli_db)] == ["alice"]
+
+    def test_usage_error(self):
+        exit_code, output = run_command(["no-such-command"])
+
+        assert exit_code == 2
+        assert "No such command" in output
+
+    def test_exit_code_is_returned(self, cli_db):
+        exit_code, output = run_command(["food", "add-food", "1", "Apple", "95", "--date", "bad"])
+
+        assert exit_code == 1
+        assert "Invalid date format" in output
+
+    def test_refuses_nested_daemon(self):
+        exit_code, _ = run_command(["serve"])
+        assert exit_code == 1
+
+    def test_report_cache_stats(self, cli_db):
+        """Test the cache counters are only offered where the process outlives the command."""
+        run_command(["user", "add-user", "alice"])
+        run_command(["food", "add-food", "1", "Apple", "95", "--date", "2024-01-01"])
+        with patch('myapp.cli.report.get_db') as report_db:
+            report_db.return_value.__enter__.return_value = cli_db
+            for _ in range(2):
+                run_command(["report", "user-report", "1", "2024-01-01", "2024-01-01"])
+            exit_code, output = run_command(["report", "cache-stats"])
+        cache = get_report_cache(cli_db)
+
+        assert exit_code == 0
+        assert cache.hits >= 1
+        assert f"hits: {cache.hits}" in output
+        assert f"misses: {cache.misses}" in output
+        assert CliRunner().invoke(main_app, ["report", "cache-stats"]).exit_code == 2
+
+
+@pytest.mark.cli
+class TestDaemon:
+    """Test cases for the socket daemon and thin client."""
+
+    def test_client_round_trips(self, daemon, cli_db):
+        with DaemonClient(daemon) as client:
+            assert client.run(["user", "add-user", "bob"]) == (0, "User created with ID 1 and name 'bob'\n")
+            assert client.run(["user", "list-users"]) == (0, "ID: 1, Name: bob\n")
+            exit_code, output = client.run(["user", "bogus"])
+
+        assert exit_code == 2
+        assert "No such command" in output
+
+    def test_replaces_stale_socket(self, tmp_path, cli_db):
+        socket_path = str(tmp_path / "stale.sock")
+        # A socket file left behind by a daemon that exited without cleanup
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+
+        server = make_server(socket_path)
+        server.server_close()
+
+    def test_keeps_a_live_socket(self, daemon):
+        with pytest.raises(FileExistsError, match="already listening"):
+            make_server(daemon)
+        with DaemonClient(daemon) as client:
+            assert client.run(["user", "list-users"])[0] == 0
+
+    def test_keeps_a_regular_file(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_text("keep me")
+
+        with pytest.raises(FileExistsError, match="not a socket"):
+            make_server(str(path))
+        assert path.read_text() == "keep me"
+
+    def test_serve_exits_with_an_error(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_text("keep me")
+
+        with patch('myapp.cli.daemon.warm_up'):
+            result = CliRunner(mix_stderr=False).invoke(main_app, ["serve", "--socket", str(path)])
+
+        assert result.exit_code == 1
+        assert "not a socket" in result.stderr
+        assert path.exists()
+
+
+@pytest.mark.cli
+class TestShell:
+    """Test cases for the interactive shell."""
+
+    @patch('myapp.cli.daemon.warm_up')
+    def test_shell_runs_commands_until_exit(self, mock_warm_up, cli_db):
+        result = CliRunner().invoke(main_app, ["shell"], input='user add-user "carol smith"\nuser list-users\nexit\nuser add-user ignored\n')
+
+        assert result.exit_code == 0
+        assert "User created with ID 1 and name 'carol smith'" in result.stdout
+        assert "ID: 1, Name: carol smith" in result.stdout
+        assert [user.name for user in get_all_users(cli_db)] == ["carol smith"]
@@ -0,0 +1,126 @@
+"""
+Tests for the 'export' commands.
+"""
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import date
+from typer.testing import CliRunner
+from unittest.mock import patch
+from myapp.cli.export import app as export_app
+from myapp.controllers.food_entry_controller import bulk_create_food_entries
+from myapp.controllers.goal_controller import create_goal
+from myapp.controllers.meal_plan_controller import create_meal_plan
+
+
+@pytest.fixture
+def history(test_db, sample_user):
+    """Create entries, a goal and a meal plan for the sample user."""
+    bulk_create_food_entries(test_db, [
+        {"user_id": sample_user.id, "food": food, "calories": calories, "date": date(2024, 1, day)}
+        for day, (food, calories) in enumerate([("Apple", 95), ("Pizza", 800), ("Oatmeal", 150)], start=1)
+    ])
+    create_goal(test_db, sample_user.id, 2000, 14000)
+    create_meal_plan(test_db, sample_user.id, 1, "Salads, with a comma")
+    return sample_user
+
+
+@pytest.mark.cli
+class TestExportCommands:
+    """Test cases for exporting a user's history."""
+
+    def setup_method(self):
+        self.runner = CliRunner(mix_stderr=False)
+
+    @patch('myapp.cli.export.get_db')
+    def test_csv_to_stdout(self, mock_get_db, test_db, history):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(export_app, ["food-entries", "--user-id", str(history.id)])
+
+        assert result.exit_code == 0
+        rows = list(csv.reader(io.StringIO(result.stdout)))
+        assert rows[0] == ["id", "user_id", "food", "calories", "date"]
+        assert rows[1:] == [
+            ["1", str(history.id), "Apple", "95", "2024-01-01"],
+            ["2", str(history.id), "Pizza", "800", "2024-01-02"],
+            ["3", str(history.id), "Oatmeal", "150", "2024-01-03"],
+        ]
+        assert "Exported 3 food entries" in result.stderr
+        assert "--since 3" in result.stderr
+
+    @patch('myapp.cli.export.get_db')
+    def test_incremental_gzip_ndjson(self, mock_get_db, test_db, history, tmp_path):
+        mock_get_db.return_value.__enter__.return_value = test_db
+        output = tmp_path / "entries.ndjson.gz"
+
+        result = self.runner.invoke(export_app, ["food-entries", str(output), "--since", "1", "--batch-size", "1"])
+
+        assert result.exit_code == 0
+        with gzip.open(output, "rt", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        assert [row["food"] for row in rows] == ["Pizza", "Oatmeal"]
+        assert rows[0] == {"id": 2, "user_id": history.id, "food": "Pizza", "calories": 800, "date": "2024-01-02"}
+
+    @patch('myapp.cli.export.get_db')
+    def test_nothing_new_keeps_mark(self, mock_get_db, test_db, history):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(export_app, ["goals", "--since", "1", "--format", "ndjson"])
+
+        assert result.exit_code == 0
+        assert result.stdout == ""
+        assert "Exported 0 goals" in result.stderr
+        assert "--since 1" in result.stderr
+
+    @patch('myapp.cli.export.get_db')
+    def test_mark_past_every_id(self, mock_get_db, test_db, history, tmp_path):
+        """Test a mark from a replaced database fails instead of skipping rows."""
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(export_app, ["goals", str(tmp_path / "goals.csv"), "--since", "5"])
+
+        assert result.exit_code == 1
+        assert "past the last goals id ever issued (1)" in result.stderr
+        assert not (tmp_path / "goals.csv").exists()
+
+    @patch('myapp.cli.export.get_db')
+    def test_all_with_manifest(self, mock_get_db, test_db, history, tmp_path):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(export_app, ["all", str(tmp_path / "full")])
+
+        assert result.exit_code == 0
+        manifest = json.loads((tmp_path / "full" / "manifest.json").read_text())
+        assert {table: info["rows"] for table, info in manifest["tables"].items()} == {
+            "food_entries": 3, "goals": 1, "meal_plans": 1
+        }
+        with open(tmp_path / "full" / "meal_plans.csv", newline="", encoding="utf-8") as f:
+            assert list(csv.reader(f))[1][3] == "Salads, with a comma"
+
+        bulk_create_food_entries(test_db, [{"user_id": history.id, "food": "Apple", "calories": 90, "date": date(2024, 1, 4)}])
+        result = self.runner.invoke(export_app, [
+            "all", str(tmp_path / "increment"), "--since", str(tmp_path / "full" / "manifest.json"), "--format", "ndjson", "--gzip"
+        ])
+
+        assert result.exit_code == 0
+        manifest = json.loads((tmp_path / "increment" / "manifest.json").read_text())
+        assert manifest["tables"]["food_entries"] == {
+            "file": "food_entries.ndjson.gz", "rows": 1, "since": 3, "high_water_mark": 4
+        }
+        assert manifest["tables"]["goals"]["rows"] == 0
+        assert manifest["tables"]["goals"]["high_water_mark"] == 1
+
+    def test_invalid_format(self):
+        result = self.runner.invoke(export_app, ["goals", "--format", "xml"])
+
+        assert result.exit_code == 1
+        assert "Invalid format" in result.stdout
+
+    def test_unreadable_manifest(self, tmp_path):
+        result = self.runner.invoke(export_app, ["all", str(tmp_path / "out"), "--since", str(tmp_path / "missing.json")])
+
+        assert result.exit_code == 1
+        assert "Cannot read manifest" in result.stderr
@@ -0,0 +1,87 @@
+"""
+Tests for the 'food bulk-update' and 'food bulk-delete' commands.
+"""
+import pytest
+from datetime import date
+from typer.testing import CliRunner
+from unittest.mock import patch
+from myapp.cli.food import app as food_app
+from myapp.controllers.food_entry_controller import FoodEntryFilter, bulk_create_food_entries, count_food_entries
+
+
+@pytest.fixture
+def entries(test_db, sample_user):
+    """Create a few entries for the sample user."""
+    bulk_create_food_entries(test_db, [
+        {"user_id": sample_user.id, "food": food, "calories": calories, "date": date(2024, 1, 1)}
+        for food, calories in [("Apple", 95), ("Apple", 100), ("Pizza", 800)]
+    ])
+    return sample_user
+
+
+@pytest.mark.cli
+class TestFoodBulkCommands:
+    """Test cases for the filter-based bulk commands."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    @patch('myapp.cli.food.get_db')
+    def test_bulk_update(self, mock_get_db, test_db, entries):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(food_app, ["bulk-update", "--food", "Apple", "--scale-calories", "2"])
+
+        assert result.exit_code == 0
+        assert "Updated 2 food entries" in result.stdout
+        assert count_food_entries(test_db, FoodEntryFilter(food="Apple", min_calories=190)) == 2
+
+    @patch('myapp.cli.food.get_db')
+    def test_bulk_delete_dry_run(self, mock_get_db, test_db, entries):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(food_app, ["bulk-delete", "--user-id", str(entries.id), "--dry-run"])
+
+        assert result.exit_code == 0
+        assert "Would delete 3 food entries" in result.stdout
+        assert count_food_entries(test_db, FoodEntryFilter(user_id=entries.id)) == 3
+
+    @patch('myapp.cli.food.get_db')
+    def test_bulk_delete(self, mock_get_db, test_db, entries):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(food_app, ["bulk-delete", "--min-calories", "500", "--end-date", "2024-01-31"])
+
+        assert result.exit_code == 0
+        assert "Deleted 1 food entries" in result.stdout
+
+    @patch('myapp.cli.food.get_db')
+    def test_requires_filter(self, mock_get_db):
+        result = self.runner.invoke(food_app, ["bulk-delete"])
+
+        assert result.exit_code == 1
+        assert "at least one filter" in result.stdout
+        mock_get_db.assert_not_called()
+
+    @patch('myapp.cli.food.get_db')
+    def test_requires_new_value(self, mock_get_db):
+        result = self.runner.invoke(food_app, ["bulk-update", "--food", "Apple"])
+
+        assert result.exit_code == 1
+        assert "Nothing to update" in result.stdout
+        mock_get_db.assert_not_called()
+
+    @patch('myapp.cli.food.get_db')
+    def test_blank_food(self, mock_get_db):
+        result = self.runner.invoke(food_app, ["bulk-update", "--user-id", "1", "--set-food", "  "])
+
+        assert result.exit_code == 1
+        assert "Food name cannot be empty" in result.stdout
+        mock_get_db.assert_not_called()
+
+    @patch('myapp.cli.food.get_db')
+    def test_invalid_date(self, mock_get_db):
+        result = self.runner.invoke(food_app, ["bulk-delete", "--start-date", "01/01/2024"])
+
+        assert result.exit_code == 1
+        assert "Invalid date format" in result.stdout
@@ -0,0 +1,112 @@
+"""
+Tests for the food import command.
+"""
+import json
+import pytest
+from typer.testing import CliRunner
+from unittest.mock import patch
+from datetime import date
+from myapp.cli.food import app as food_app
+from myapp.controllers.food_entry_controller import get_food_entries_by_user
+from myapp.controllers.user_controller import create_user
+
+
+@pytest.mark.cli
+class TestFoodImportCommand:
+    """Test cases for `food import`."""
+
+    def setup_method(self):
+        """Set up test runner."""
+        self.runner = CliRunner()
+
+    @patch('myapp.cli.food.get_db')
+    def test_import_csv_file(self, mock_get_db, test_db, sample_user, tmp_path):
+        mock_get_db.return_value.__enter__.return_value = test_db
+        csv_file = tmp_path / "history.csv"
+        csv_file.write_text(
+            "user_id,food,calories,date\n"
+            f"{sample_user.id},Apple,95,2024-01-01\n"
+            f"{sample_user.id},Banana,105,2024-01-02\n"
+        )
+
+        result = self.runner.invoke(food_app, ["import", str(csv_file), "--chunk-size", "1"])
+
+        assert result.exit_code == 0
+        assert "Imported 2 food entries" in result.stdout
+        assert "rows/s" in result.stdout
+        entries = get_food_entries_by_user(test_db, sample_user.id)
+        assert [(e.food, e.calories, e.date) for e in entries] == [
+            ("Apple", 95, date(2024, 1, 1)),
+            ("Banana", 105, date(2024, 1, 2)),
+        ]
+
+    @patch('myapp.cli.food.get_db')
+    def test_import_ndjson_from_stdin(self, mock_get_db, test_db, sample_user):
+        mock_get_db.return_value.__enter__.return_value = test_db
+        lines = "\n".join(
+            json.dumps({"food": f"Food {i}", "calories": 100, "date": "2024-01-01"}) for i in range(5)
+        )
+
+        result = self.runner.invoke(
+            food_app, ["import", "-", "--format", "ndjson", "--user-id", str(sample_user.id)], input=lines
+        )
+
+        assert result.exit_code == 0
+        assert "Imported 5 food entries" in result.stdout
+        assert len(get_food_entries_by_user(test_db, sample_user.id)) == 5
+
+    @patch('myapp.cli.food.get_db')
+    def test_import_invalid_row(self, mock_get_db, test_db, sample_user, tmp_path):
+        mock_get_db.return_value.__enter__.return_value = test_db
+        csv_file = tmp_path / "bad.csv"
+        csv_file.write_text(
+            "user_id,food,calories,date\n"
+            f"{sample_user.id},Apple,95,2024-01-01\n"
+            f"{sample_user.id},Banana,lots,2024-01-02\n"
+        )
+
+        result = self.runner.invoke(food_app, ["import", str(csv_file)])
+
+        assert result.exit_code == 1
+        assert "Row 2" in result.stdout
+        assert get_food_entries_by_user(test_db, sample_user.id) == []
+
+    @patch('myapp.cli.food.get_db')
+    def test_import_ndjson_row_not_an_object(self, mock_get_db, test_db, sample_user):
+        mock_get_db.return_value.__enter__.return_value = test_db
+        lines = '{"food": "Apple", "calories": 95, "date": "2024-01-01"}\n[1, 2]\n'
+
+        result = self.runner.invoke(food_app, ["import", "-", "--format", "ndjson", "--user-id", str(sample_user.id)], input=lines)
+
+        assert result.exit_code == 1
+        assert "Row 2: expected an object, got list" in result.stdout
+        assert get_food_entries_by_user(test_db, sample_user.id) == []
+
+    @patch('myapp.cli.food.get_db')
+    def test_import_ndjson_malformed_line(self, mock_get_db, test_db, sample_user):
+        mock_get_db.return_value.__enter__.return_value = test_db
+        lines = '{"food": "Apple", "calories": 95, "date": "2024-01-01"}\n\n{"food": "Pear",\n'
+
+        result = self.runner.invoke(food_app, ["import", "-", "--format", "ndjson", "--user-id", str(sample_user.id)], input=lines)
+
+        assert result.exit_code == 1
+        assert "Row 2:" in result.stdout
+        assert get_food_entries_by_user(test_db, sample_user.id) == []
+
+    @patch('myapp.cli.food.get_db')
+    def test_import_unknown_user(self, mock_get_db, prod_db, tmp_path):
+        """Test that a row for a user that does not exist fails the import cleanly."""
+        mock_get_db.return_value.__enter__.return_value = prod_db
+        user = create_user(prod_db, "importer")
+        csv_file = tmp_path / "history.csv"
+        csv_file.write_text(
+            "user_id,food,calories,date\n"
+            f"{user.id},Apple,95,2024-01-01\n"
+            "99,Banana,105,2024-01-02\n"
+        )
+
+        result = self.runner.invoke(food_app, ["import", str(csv_file)])
+
+        assert result.exit_code == 1
+        assert "Import failed, no entries were imported" in result.stdout
+        assert get_food_entries_by_user(prod_db, user.id) == []
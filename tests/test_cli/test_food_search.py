@@ -0,0 +1,65 @@
+"""
+Tests for the 'food search' command.
+"""
+import pytest
+from datetime import date
+from typer.testing import CliRunner
+from unittest.mock import patch
+from myapp.cli.food import app as food_app
+from myapp.controllers.food_entry_controller import bulk_create_food_entries
+
+
+@pytest.fixture
+def entries(test_db, sample_user):
+    """Create a few entries for the sample user."""
+    bulk_create_food_entries(test_db, [
+        {"user_id": sample_user.id, "food": food, "calories": calories, "date": entry_date}
+        for food, calories, entry_date in [
+            ("Apple", 95, date(2024, 1, 1)), ("Apple Pie", 300, date(2024, 1, 2)), ("Pizza", 800, date(2024, 1, 3)),
+        ]
+    ])
+    return sample_user
+
+
+@pytest.mark.cli
+class TestFoodSearchCommand:
+    """Test cases for searching food entries by name."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    @patch('myapp.cli.food.get_db')
+    def test_search(self, mock_get_db, test_db, entries):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(food_app, ["search", "app", "--user-id", str(entries.id)])
+
+        assert result.exit_code == 0
+        lines = result.stdout.splitlines()
+        assert len(lines) == 2
+        assert "Food: Apple, Calories: 95" in lines[0]
+        assert "Food: Apple Pie, Calories: 300" in lines[1]
+
+    @patch('myapp.cli.food.get_db')
+    def test_search_with_date_and_limit(self, mock_get_db, test_db, entries):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(food_app, ["search", "app", "--start-date", "2024-01-02", "--limit", "1"])
+
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [f"ID: 2, User: {entries.id}, Food: Apple Pie, Calories: 300, Date: 2024-01-02"]
+
+    @patch('myapp.cli.food.get_db')
+    def test_no_match(self, mock_get_db, test_db, entries):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(food_app, ["search", "tofu"])
+
+        assert result.exit_code == 0
+        assert "No matching food entries" in result.stdout
+
+    def test_invalid_date(self):
+        result = self.runner.invoke(food_app, ["search", "app", "--end-date", "01/02/2024"])
+
+        assert result.exit_code == 1
+        assert "Invalid date format" in result.stdout
@@ -0,0 +1,35 @@
+"""
+Tests for the 'food update-food-entry-cmd' command.
+"""
+import pytest
+from typer.testing import CliRunner
+from unittest.mock import patch
+from myapp.cli.food import app as food_app
+from myapp.models.food_entry import FoodEntry
+
+
+@pytest.mark.cli
+class TestFoodUpdateCommand:
+    """Test cases for updating a single food entry."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    @patch('myapp.cli.food.get_db')
+    def test_update(self, mock_get_db, test_db, sample_food_entry):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(food_app, ["update-food-entry-cmd", str(sample_food_entry.id), "--food", "Pear"])
+
+        assert result.exit_code == 0
+        assert f"Updated food entry ID {sample_food_entry.id}" in result.stdout
+        assert test_db.get(FoodEntry, sample_food_entry.id).food == "Pear"
+
+    @patch('myapp.cli.food.get_db')
+    def test_blank_food(self, mock_get_db, test_db, sample_food_entry):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(food_app, ["update-food-entry-cmd", str(sample_food_entry.id), "--food", " "])
+
+        assert result.exit_code == 1
+        assert "Food name cannot be empty" in result.stdout
@@ -0,0 +1,61 @@
+"""
+Tests for paginated and streaming list commands.
+"""
+import pytest
+from typer.testing import CliRunner
+from unittest.mock import patch
+from myapp.cli.food import app as food_app
+from myapp.cli.listing import LineWriter
+
+
+@pytest.fixture
+def food_db(test_db):
+    with patch('myapp.cli.food.get_db') as mock_get_db:
+        mock_get_db.return_value.__enter__.return_value = test_db
+        yield test_db
+
+
+@pytest.mark.cli
+class TestListFoodEntries:
+    """Test cases for list-food-entries paging options."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    def test_limit_and_after_id(self, food_db, multiple_food_entries, sample_user):
+        ids = [entry.id for entry in multiple_food_entries]
+
+        result = self.runner.invoke(food_app, ["list-food-entries", str(sample_user.id), "--limit", "2"])
+        assert result.exit_code == 0
+        assert f"ID: {ids[0]}, Food: Apple" in result.stdout
+        assert f"ID: {ids[1]}, Food: Banana" in result.stdout
+        assert "Orange" not in result.stdout
+        assert f"More results: --after-id {ids[1]}" in result.stdout
+
+        result = self.runner.invoke(food_app, ["list-food-entries", str(sample_user.id), "--after-id", str(ids[1])])
+        assert result.exit_code == 0
+        assert result.stdout.splitlines()[0].startswith(f"ID: {ids[2]}, Food: Orange")
+        assert "More results" not in result.stdout
+
+    def test_stream_matches_list(self, food_db, multiple_food_entries, sample_user):
+        listed = self.runner.invoke(food_app, ["list-food-entries", str(sample_user.id)])
+        streamed = self.runner.invoke(food_app, ["list-food-entries", str(sample_user.id), "--stream"])
+
+        assert streamed.exit_code == 0
+        assert streamed.stdout == listed.stdout
+        assert len(streamed.stdout.splitlines()) == 3
+
+
+class TestLineWriter:
+    """Test cases for the buffered line writer."""
+
+    def test_writes_in_blocks(self, capsys):
+        with LineWriter(buffer_size=2) as out:
+            out.write("a")
+            assert capsys.readouterr().out == ""
+            out.write("b")
+            assert capsys.readouterr().out == "a\nb\n"
+            out.write("c")
+
+        assert capsys.readouterr().out == "c\n"
+        assert out.count == 3
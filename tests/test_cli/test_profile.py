@@ -0,0 +1,35 @@
+"""
+Tests for the global --profile flag.
+"""
+import pytest
+from typer.testing import CliRunner
+from unittest.mock import patch
+from myapp.cli.__main__ import app
+
+
+@pytest.mark.cli
+class TestProfileFlag:
+    """Test cases for printing a query summary after a command."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    @patch('myapp.cli.user.get_db')
+    def test_profile_prints_summary(self, mock_get_db, test_db, multiple_users):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(app, ["--profile", "user", "list-users"])
+
+        assert result.exit_code == 0
+        assert "ID: " in result.output
+        assert "1 statements" in result.output
+        assert "user_controller.get_all_users" in result.output
+
+    @patch('myapp.cli.user.get_db')
+    def test_no_summary_without_flag(self, mock_get_db, test_db, multiple_users):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(app, ["user", "list-users"])
+
+        assert result.exit_code == 0
+        assert "statements" not in result.output
@@ -0,0 +1,170 @@
+"""
+Tests for the batch report command and report caching.
+"""
+import json
+import pytest
+from datetime import date
+from typer.testing import CliRunner
+from unittest.mock import patch
+from myapp.cli.report import app as report_app
+from myapp.controllers.report_cache import get_report_cache
+from myapp.models.food_entry import FoodEntry
+
+
+@pytest.mark.cli
+class TestAllUsersReport:
+    """Test cases for 'report all-users'."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    @patch('myapp.cli.report.get_db')
+    def test_writes_ndjson(self, mock_get_db, test_db, multiple_users, tmp_path):
+        mock_get_db.return_value.__enter__.return_value = test_db
+        test_db.add(FoodEntry(user_id=multiple_users[0].id, food="Apple", calories=95, date=date(2024, 1, 2)))
+        test_db.commit()
+        output = tmp_path / "reports.ndjson"
+
+        result = self.runner.invoke(report_app, ["all-users", "2024-01-01", "2024-01-07", "--output", str(output)])
+
+        assert result.exit_code == 0
+        assert "Wrote 3 reports" in result.stdout
+        reports = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [report["user_id"] for report in reports] == [user.id for user in multiple_users]
+        assert reports[0]["start_date"] == "2024-01-01"
+        assert reports[0]["daily_breakdown"] == {"2024-01-02": 95}
+        assert reports[1]["total_entries"] == 0
+
+    def test_invalid_date(self):
+        result = self.runner.invoke(report_app, ["all-users", "2024-13-01", "2024-01-07"])
+
+        assert result.exit_code == 1
+        assert "Invalid date format" in result.stdout
+
+
+@pytest.mark.cli
+class TestUserReportCache:
+    """Test cases for 'report user-report' with the report cache."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    @patch('myapp.cli.report.get_db')
+    def test_cached_and_uncached(self, mock_get_db, test_db, sample_food_entry):
+        mock_get_db.return_value.__enter__.return_value = test_db
+        day = sample_food_entry.date.isoformat()
+        args = ["user-report", str(sample_food_entry.user_id), day, day]
+        cache = get_report_cache(test_db)
+
+        first = self.runner.invoke(report_app, args)
+        second = self.runner.invoke(report_app, args)
+        uncached = self.runner.invoke(report_app, args + ["--no-cache"])
+
+        assert first.exit_code == second.exit_code == uncached.exit_code == 0
+        assert first.stdout == second.stdout == uncached.stdout
+        assert "Total entries: 1" in first.stdout
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.cli
+class TestTrendsReport:
+    """Test cases for 'report trends'."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    @patch('myapp.cli.report.get_db')
+    def test_trends(self, mock_get_db, test_db, sample_user):
+        mock_get_db.return_value.__enter__.return_value = test_db
+        for day, calories in [(1, 1800), (2, 2200), (9, 1500)]:
+            test_db.add(FoodEntry(user_id=sample_user.id, food="Meal", calories=calories, date=date(2024, 1, day)))
+        test_db.commit()
+
+        result = self.runner.invoke(report_app, ["trends", str(sample_user.id), "2024-01-01", "2024-01-10", "--daily"])
+
+        assert result.exit_code == 0
+        assert "Average daily calories: 1,833.3" in result.stdout
+        assert "2024-01-08: 1,500 calories, 1 days tracked, avg 1,500.0, change -500.0 (-25.0%)" in result.stdout
+        assert "2024-01-03: - calories, 7-day 2,000.0, 30-day 2,000.0" in result.stdout
+
+    @patch('myapp.cli.report.get_db')
+    def test_trends_json(self, mock_get_db, test_db, sample_user):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(report_app, ["trends", str(sample_user.id), "2024-01-01", "2024-01-03", "--json", "--engine", "python"])
+
+        assert result.exit_code == 0
+        trends = json.loads(result.stdout)
+        assert trends["days_tracked"] == 0
+        assert [row["rolling_7"] for row in trends["daily"]] == [None, None, None]
+
+    def test_invalid_engine(self):
+        result = self.runner.invoke(report_app, ["trends", "1", "2024-01-01", "2024-01-03", "--engine", "rust"])
+
+        assert result.exit_code == 1
+        assert "Invalid engine" in result.stdout
+
+
+@pytest.mark.cli
+class TestTopFoodsReport:
+    """Test cases for 'report top-foods'."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    @patch('myapp.cli.report.get_db')
+    def test_top_foods(self, mock_get_db, test_db, sample_user):
+        mock_get_db.return_value.__enter__.return_value = test_db
+        for food, calories in [("Pizza", 900), ("Apple", 95), ("Apple", 80), ("Salad", 350)]:
+            test_db.add(FoodEntry(user_id=sample_user.id, food=food, calories=calories, date=date(2024, 1, 2)))
+        test_db.commit()
+
+        result = self.runner.invoke(report_app, ["top-foods", "2024-01-01", "2024-01-31", "--limit", "2", "--bucket", "300"])
+
+        assert result.exit_code == 0
+        assert " 1. Pizza: 900 calories, 1 entries (63.2%)" in result.stdout
+        assert " 2. Salad: 350 calories, 1 entries (24.6%)" in result.stdout
+        assert "Apple" not in result.stdout
+        assert "    0-299 | " + "█" * 40 + " 2" in result.stdout
+        assert "  600-899 |  0" in result.stdout
+        assert "900-1,199 | " + "█" * 20 + " 1" in result.stdout
+
+    def test_histogram_with_outlier(self, tmp_path):
+        path = tmp_path / "entries.csv"
+        path.write_text(
+            "user_id,food,calories,date\n"
+            "1,Apple,95,2024-01-02\n"
+            "1,Pear,110,2024-01-02\n"
+            "1,Feast,50000,2024-01-03\n"
+        )
+
+        result = self.runner.invoke(report_app, ["top-foods", "2024-01-01", "2024-01-31", "--input", str(path), "--bucket", "10"])
+
+        assert result.exit_code == 0
+        histogram = result.stdout.split("CALORIES PER ENTRY")[1].strip().splitlines()
+        assert [line.split("|")[0].strip() for line in histogram] == ["90-99", "...", "110-119", "...", "50,000-50,009"]
+
+    def test_from_input_file(self, tmp_path):
+        path = tmp_path / "entries.csv"
+        path.write_text(
+            "user_id,food,calories,date\n"
+            "1,Apple,95,2024-01-02\n"
+            "1,apple,80,2024-01-03\n"
+            "2,Pizza,900,2024-01-03\n"
+            "1,Pizza,900,2024-02-01\n"
+        )
+
+        result = self.runner.invoke(report_app, ["top-foods", "2024-01-01", "2024-01-31", "--input", str(path), "--by", "entries", "--json"])
+
+        assert result.exit_code == 0
+        output = json.loads(result.stdout)
+        assert [(row["food"], row["entries"]) for row in output["foods"]] == [("Apple", 2), ("Pizza", 1)]
+        assert sum(row["count"] for row in output["histogram"]) == 3
+
+    def test_invalid_options(self, tmp_path):
+        result = self.runner.invoke(report_app, ["top-foods", "2024-01-01", "2024-01-31", "--by", "protein"])
+        assert result.exit_code == 1
+        assert "Invalid ranking" in result.stdout
+
+        result = self.runner.invoke(report_app, ["top-foods", "2024-01-01", "2024-01-31", "--input", "-", "--per-day"])
+        assert result.exit_code == 1
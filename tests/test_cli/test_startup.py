@@ -0,0 +1,60 @@
+"""
+Startup regression tests for the lazily loaded CLI.
+"""
+import os
+import subprocess
+import sys
+import time
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Wall-clock budget for `--help`, in seconds. Override on slow machines.
+STARTUP_BUDGET = float(os.environ.get("HEALTH_TRACKER_STARTUP_BUDGET", "1.5"))
+
+
+# Runs the CLI in a fresh interpreter and prints every module it loaded
+LIST_MODULES = """
+import sys
+from myapp.cli.__main__ import app
+try:
+    app(sys.argv[1:])
+except SystemExit:
+    pass
+print("\\n".join(sys.modules), file=sys.stderr)
+"""
+
+
+def imported_modules(*args: str) -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", LIST_MODULES, *args],
+        cwd=PROJECT_DIR, capture_output=True, text=True,
+    )
+    return set(result.stderr.split())
+
+
+@pytest.mark.slow
+class TestCLIStartup:
+    """The root CLI must not import sub-apps, controllers or SQLAlchemy eagerly."""
+
+    def test_root_help_skips_heavy_imports(self):
+        modules = imported_modules("--help")
+
+        assert "sqlalchemy" not in modules
+        assert not {name for name in modules if name.startswith(("myapp.controllers", "myapp.models", "myapp.db"))}
+
+    def test_subcommand_imports_only_its_own_app(self):
+        modules = imported_modules("goal", "--help")
+
+        assert "myapp.cli.goal" in modules
+        assert not {"myapp.cli.user", "myapp.cli.food", "myapp.cli.meal_plan", "myapp.cli.report"} & modules
+        assert "myapp.controllers.report_controller" not in modules
+
+    def test_root_help_within_budget(self):
+        samples = []
+        for _ in range(3):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "-m", "myapp.cli", "--help"], cwd=PROJECT_DIR, capture_output=True)
+            samples.append(time.perf_counter() - started)
+
+        assert min(samples) < STARTUP_BUDGET, f"--help took {min(samples):.2f}s (budget {STARTUP_BUDGET}s)"
@@ -0,0 +1,48 @@
+"""
+Tests for CLI commands given a user ID that does not exist.
+"""
+import pytest
+from typer.testing import CliRunner
+from unittest.mock import patch
+from sqlalchemy import func, select
+from myapp.cli.food import app as food_app
+from myapp.cli.goal import app as goal_app
+from myapp.cli.meal_plan import app as meal_plan_app
+from myapp.models.food import Food
+
+
+@pytest.mark.cli
+class TestUnknownUser:
+    """Test that foreign key failures are reported, not raised."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    @patch('myapp.cli.food.get_db')
+    def test_add_food(self, mock_get_db, prod_db):
+        mock_get_db.return_value.__enter__.return_value = prod_db
+
+        result = self.runner.invoke(food_app, ["add-food", "99", "Pear", "50"])
+
+        assert result.exit_code == 1
+        assert "User not found" in result.stdout
+        # The food the failed entry created is rolled back with it
+        assert prod_db.scalar(select(func.count(Food.id))) == 0
+
+    @patch('myapp.cli.goal.get_db')
+    def test_add_goal(self, mock_get_db, prod_db):
+        mock_get_db.return_value.__enter__.return_value = prod_db
+
+        result = self.runner.invoke(goal_app, ["add-goal", "99", "2000", "14000"])
+
+        assert result.exit_code == 1
+        assert "User not found" in result.stdout
+
+    @patch('myapp.cli.meal_plan.get_db')
+    def test_add_meal_plan(self, mock_get_db, prod_db):
+        mock_get_db.return_value.__enter__.return_value = prod_db
+
+        result = self.runner.invoke(meal_plan_app, ["add-meal-plan", "99", "1", "Salads"])
+
+        assert result.exit_code == 1
+        assert "User not found" in result.stdout
@@ -0,0 +1,42 @@
+"""
+Tests for the 'user purge' command.
+"""
+import pytest
+from datetime import date
+from typer.testing import CliRunner
+from unittest.mock import patch
+from myapp.cli.user import app as user_app
+from myapp.controllers.food_entry_controller import bulk_create_food_entries
+from myapp.controllers.user_controller import get_user
+
+
+@pytest.mark.cli
+class TestUserPurge:
+    """Test cases for purging users."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    @patch('myapp.cli.user.get_db')
+    def test_purge_reports_progress(self, mock_get_db, test_db, sample_user):
+        mock_get_db.return_value.__enter__.return_value = test_db
+        user_id = sample_user.id
+        bulk_create_food_entries(test_db, [
+            {"user_id": user_id, "food": "Meal", "calories": 100, "date": date(2024, 1, 1)} for _ in range(7)
+        ])
+
+        result = self.runner.invoke(user_app, ["purge", str(user_id), "--chunk-size", "3"])
+
+        assert result.exit_code == 0
+        assert "Deleting food entries" in result.stdout
+        assert f"Purged user {user_id} and 7 food entries" in result.stdout
+        assert get_user(test_db, user_id) is None
+
+    @patch('myapp.cli.user.get_db')
+    def test_purge_unknown_user(self, mock_get_db, test_db):
+        mock_get_db.return_value.__enter__.return_value = test_db
+
+        result = self.runner.invoke(user_app, ["purge", "99999"])
+
+        assert result.exit_code == 1
+        assert "User not found" in result.stdout
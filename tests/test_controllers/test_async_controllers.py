@@ -0,0 +1,95 @@
+"""
+Tests for the async controller layer.
+"""
+import asyncio
+import pytest
+from datetime import date
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from myapp.db.database import Base
+from myapp.controllers.aio import user_controller, food_entry_controller, goal_controller, meal_plan_controller
+from myapp.controllers.aio.report_controller import generate_user_report
+
+
+@pytest.fixture
+def async_session_factory(tmp_path):
+    """Create an async session factory bound to a temporary database."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    yield async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+@pytest.mark.integration
+class TestAsyncControllers:
+    """Test cases for the async controllers."""
+
+    def test_crud_round_trip(self, async_session_factory):
+        async def scenario():
+            async with async_session_factory() as db:
+                user = await user_controller.create_user(db, "async_user")
+                entry = await food_entry_controller.create_food_entry(db, user.id, "Apple", 95, date(2024, 1, 1))
+                goal = await goal_controller.create_goal(db, user.id, 2000, 14000)
+                plan = await meal_plan_controller.create_meal_plan(db, user.id, 1, "Oats")
+
+                assert (await user_controller.get_user_by_name(db, "async_user")).id == user.id
+                assert [e.food for e in await food_entry_controller.get_food_entries_by_user(db, user.id)] == ["Apple"]
+
+                updated = await food_entry_controller.update_food_entry(db, entry.id, calories=80)
+                assert updated.calories == 80
+                assert (await goal_controller.update_goal(db, goal.id, daily=1800)).daily == 1800
+                assert (await meal_plan_controller.update_meal_plan(db, plan.id, plan="Eggs")).plan == "Eggs"
+
+                assert await food_entry_controller.delete_food_entry(db, entry.id) is True
+                assert await food_entry_controller.get_food_entry(db, entry.id) is None
+                assert await user_controller.delete_user(db, user.id) is True
+                assert await user_controller.get_all_users(db) == []
+                assert await goal_controller.get_goals_by_user(db, user.id) == []
+
+        asyncio.run(scenario())
+
+    def test_food_names_and_default_calories(self, async_session_factory):
+        """Test the async food entry controllers resolve foods as the sync ones do."""
+        async def scenario():
+            async with async_session_factory() as db:
+                user = await user_controller.create_user(db, "async_foods")
+                first = await food_entry_controller.create_food_entry(db, user.id, "Green  apple", 90, date(2024, 1, 1))
+                # Without calories the catalog's default is used
+                second = await food_entry_controller.create_food_entry(db, user.id, "green apple", None, date(2024, 1, 2))
+                assert (second.food, second.calories) == ("Green apple", 90)
+                assert second.food_id == first.food_id
+
+                with pytest.raises(ValueError, match="has no default"):
+                    await food_entry_controller.create_food_entry(db, user.id, "Mystery", None, date(2024, 1, 1))
+                with pytest.raises(ValueError, match="cannot be empty"):
+                    await food_entry_controller.update_food_entry(db, first.id, food="  ")
+                assert (await food_entry_controller.get_food_entry(db, first.id)).food == "Green apple"
+
+        asyncio.run(scenario())
+
+    def test_concurrent_reports(self, async_session_factory):
+        async def scenario():
+            async with async_session_factory() as db:
+                users = [await user_controller.create_user(db, f"user_{i}") for i in range(5)]
+                for i, user in enumerate(users):
+                    await goal_controller.create_goal(db, user.id, 2000, 14000)
+                    for day in range(1, 4):
+                        await food_entry_controller.create_food_entry(db, user.id, "Meal", 100 * (i + 1), date(2024, 1, day))
+
+            async def report(user_id):
+                async with async_session_factory() as db:
+                    return await generate_user_report(db, user_id, date(2024, 1, 1), date(2024, 1, 7))
+
+            return users, await asyncio.gather(*(report(user.id) for user in users))
+
+        users, reports = asyncio.run(scenario())
+
+        for i, (user, report) in enumerate(zip(users, reports)):
+            assert report["user_id"] == user.id
+            assert report["total_entries"] == 3
+            assert report["total_calories"] == 300 * (i + 1)
+            assert report["has_goal"] is True
@@ -0,0 +1,39 @@
+"""
+Tests for the process-pool batch report controller.
+"""
+import pytest
+from datetime import date
+from sqlalchemy import text
+from myapp.controllers.batch_report_controller import generate_user_reports_parallel, worker_config, _init_worker
+from myapp.controllers import batch_report_controller
+from myapp.controllers.report_controller import generate_user_reports
+from myapp.models.food_entry import FoodEntry
+
+
+@pytest.mark.integration
+class TestBatchReportController:
+    """Test cases for sharding reports across worker processes."""
+
+    def test_parallel_matches_in_process(self, test_db, multiple_users):
+        for i, user in enumerate(multiple_users):
+            test_db.add(FoodEntry(user_id=user.id, food="Meal", calories=100 * (i + 1), date=date(2024, 1, 1)))
+        test_db.commit()
+        start, end = date(2024, 1, 1), date(2024, 1, 7)
+
+        reports = list(generate_user_reports_parallel(test_db, start, end, workers=2, chunk_size=1))
+
+        assert reports == list(generate_user_reports(test_db, start, end))
+
+    def test_worker_connection_is_read_only(self, test_db, monkeypatch):
+        config = worker_config(test_db)
+        assert config.url == str(test_db.get_bind().url)
+        assert config.pragmas["query_only"] == "ON"
+
+        monkeypatch.setattr(batch_report_controller, "_worker_db", None)
+        _init_worker(config)
+        worker_db = batch_report_controller._worker_db
+        try:
+            assert worker_db.execute(text("PRAGMA query_only")).scalar() == 1
+        finally:
+            worker_db.close()
+            worker_db.get_bind().dispose()
@@ -0,0 +1,59 @@
+"""
+Tests for streaming rows out for export.
+"""
+import pytest
+from datetime import date
+from myapp.controllers.export_controller import export_columns, iter_export_batches
+from myapp.controllers.food_entry_controller import bulk_create_food_entries
+from myapp.controllers.goal_controller import create_goal, delete_goal
+
+
+@pytest.mark.integration
+class TestExportController:
+    """Test cases for export batches."""
+
+    def test_batches_in_id_order(self, test_db, multiple_users):
+        """Test that rows come in id order, batch_size at a time, with the food name."""
+        user_ids = [user.id for user in multiple_users]
+        bulk_create_food_entries(test_db, [
+            {"user_id": user_ids[i % 3], "food": f"Food {i}", "calories": 100 + i, "date": date(2024, 1, 1 + i)}
+            for i in range(7)
+        ])
+
+        batches = list(iter_export_batches(test_db, "food_entries", batch_size=3))
+
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        rows = [tuple(row) for batch in batches for row in batch]
+        assert [row[0] for row in rows] == list(range(1, 8))
+        assert rows[0] == (1, user_ids[0], "Food 0", 100, date(2024, 1, 1))
+        assert export_columns("food_entries") == ["id", "user_id", "food", "calories", "date"]
+
+    def test_user_and_since_filters(self, test_db, multiple_users):
+        """Test that only the user's rows after the high-water mark are exported."""
+        user_ids = [user.id for user in multiple_users]
+        goal_ids = [create_goal(test_db, user_id, 2000 + n, 14000).id for n, user_id in enumerate(user_ids * 2)]
+
+        rows = [tuple(row) for batch in iter_export_batches(test_db, "goals", user_id=user_ids[1]) for row in batch]
+        assert [row[0] for row in rows] == [goal_ids[1], goal_ids[4]]
+
+        rows = [tuple(row) for batch in iter_export_batches(test_db, "goals", since=goal_ids[3]) for row in batch]
+        assert [row[0] for row in rows] == goal_ids[4:]
+        assert list(iter_export_batches(test_db, "meal_plans")) == []
+
+    def test_since_after_newest_row_deleted(self, test_db, sample_user):
+        """Test a row added after the newest one is deleted gets a new id past the mark."""
+        goal_ids = [create_goal(test_db, sample_user.id, 2000 + n, 14000).id for n in range(3)]
+        mark = goal_ids[-1]
+        delete_goal(test_db, mark)
+
+        new_id = create_goal(test_db, sample_user.id, 1800, 12600).id
+
+        assert new_id > mark
+        rows = [tuple(row) for batch in iter_export_batches(test_db, "goals", since=mark) for row in batch]
+        assert [row[0] for row in rows] == [new_id]
+
+    def test_since_past_every_issued_id(self, test_db, sample_user):
+        create_goal(test_db, sample_user.id, 2000, 14000)
+
+        with pytest.raises(ValueError, match="past the last goals id ever issued"):
+            iter_export_batches(test_db, "goals", since=10)
@@ -0,0 +1,140 @@
+"""
+Tests for the food catalog and its name cache.
+"""
+import pytest
+from datetime import date
+from sqlalchemy import func, select, update
+from myapp.controllers.food_controller import get_food_by_name, get_food_id, get_foods, get_or_create_food, search_foods
+from myapp.controllers.food_entry_controller import (
+    create_food_entry, bulk_create_food_entries, get_food_entry, update_food_entry, FoodEntryFilter, count_food_entries,
+    search_food_entries
+)
+from myapp.models.food import Food
+from myapp.models.food_entry import FoodEntry
+
+
+@pytest.mark.integration
+class TestFoodCatalog:
+    """Test cases for interning food names."""
+
+    def test_names_are_normalized(self, test_db):
+        """Test that case and whitespace variants share one catalog row."""
+        first = get_or_create_food(test_db, "Chicken  Breast", 165)
+        second = get_or_create_food(test_db, " chicken breast ")
+        test_db.commit()
+
+        assert first is second
+        assert first.name == "Chicken Breast"
+        assert first.default_calories == 165
+        assert test_db.scalar(select(func.count()).select_from(Food)) == 1
+        assert get_food_by_name(test_db, "CHICKEN BREAST") is first
+        assert get_food_by_name(test_db, "Tofu") is None
+
+    def test_empty_name_rejected(self, test_db):
+        with pytest.raises(ValueError):
+            get_or_create_food(test_db, "   ")
+
+    def test_cached_lookup_costs_no_sql(self, test_db, count_queries):
+        food_id = get_food_id(test_db, "Apple", 95)
+        test_db.commit()
+
+        with count_queries() as statements:
+            assert get_food_id(test_db, "apple") == food_id
+
+        assert statements == []
+
+    def test_rolled_back_food_is_not_cached(self, test_db):
+        """Test that a catalog row from a rolled-back transaction is created again."""
+        get_food_id(test_db, "Mango", 60)
+        test_db.rollback()
+
+        food_id = get_food_id(test_db, "Mango", 60)
+        test_db.commit()
+
+        assert test_db.get(Food, food_id).name == "Mango"
+
+    def test_entries_share_catalog_rows(self, test_db, sample_user):
+        """Test that entries created through every path point at one food."""
+        user_id = sample_user.id
+        create_food_entry(test_db, user_id, "Apple", 95, date(2024, 1, 1))
+        bulk_create_food_entries(test_db, [{"user_id": user_id, "food": "APPLE", "calories": 90, "date": date(2024, 1, 2)}])
+        test_db.add(FoodEntry(user_id=user_id, food="apple", calories=80, date=date(2024, 1, 3)))
+        test_db.commit()
+
+        assert [food.name for food in get_foods(test_db)] == ["Apple"]
+        assert count_food_entries(test_db, FoodEntryFilter(food="apple")) == 3
+
+    def test_default_calories(self, test_db, sample_user):
+        """Test that an entry without calories uses the catalog default."""
+        create_food_entry(test_db, sample_user.id, "Oatmeal", 150, date(2024, 1, 1))
+
+        entry = create_food_entry(test_db, sample_user.id, "oatmeal", None, date(2024, 1, 2))
+
+        assert entry.calories == 150
+        with pytest.raises(ValueError):
+            create_food_entry(test_db, sample_user.id, "Unknown Food", None, date(2024, 1, 2))
+
+    def test_rename_entry(self, test_db, sample_food_entry):
+        """Test that changing an entry's food points it at another catalog row."""
+        entry = update_food_entry(test_db, sample_food_entry.id, food="Green Apple")
+        test_db.expire_all()
+
+        assert get_food_entry(test_db, entry.id).food == "Green Apple"
+        assert {food.name for food in get_foods(test_db)} == {"Apple", "Green Apple"}
+
+
+@pytest.mark.integration
+class TestFoodSearch:
+    """Test cases for full-text search over the catalog."""
+
+    @pytest.fixture
+    def foods(self, test_db, sample_user):
+        """Enter a few foods for the sample user, one per day."""
+        names = ["Apple", "Apple Pie", "Pineapple", "Crème Brûlée", "Green Apple Juice"]
+        bulk_create_food_entries(test_db, [
+            {"user_id": sample_user.id, "food": name, "calories": 100, "date": date(2024, 1, day)}
+            for day, name in enumerate(names, start=1)
+        ])
+        return sample_user
+
+    def test_prefix_and_ranking(self, test_db, foods):
+        """Test that words match by prefix and shorter names rank first."""
+        assert [food.name for food in search_foods(test_db, "app")] == ["Apple", "Apple Pie", "Green Apple Juice"]
+        assert [food.name for food in search_foods(test_db, "APPLE pi")] == ["Apple Pie"]
+        assert [food.name for food in search_foods(test_db, "creme brul")] == ["Crème Brûlée"]
+        assert search_foods(test_db, "app", limit=1)[0].name == "Apple"
+        assert search_foods(test_db, "  ") == []
+
+    def test_index_follows_catalog_changes(self, test_db, foods):
+        """Test that new and renamed foods are found through the index."""
+        create_food_entry(test_db, foods.id, "Apricot", 50, date(2024, 2, 1))
+        test_db.execute(update(Food).where(Food.name == "Pineapple").values(name="Mango"))
+        test_db.commit()
+
+        assert [food.name for food in search_foods(test_db, "apr")] == ["Apricot"]
+        assert [food.name for food in search_foods(test_db, "mango")] == ["Mango"]
+        assert search_foods(test_db, "pineapple") == []
+
+    def test_search_entries(self, test_db, foods, multiple_users):
+        """Test that entries come best-ranked food first, newest first, within the filters."""
+        other_id = multiple_users[0].id
+        create_food_entry(test_db, foods.id, "Apple", 90, date(2024, 3, 1))
+        create_food_entry(test_db, other_id, "Apple", 80, date(2024, 3, 2))
+
+        entries = search_food_entries(test_db, "apple", FoodEntryFilter(user_id=foods.id))
+        assert [(e.food, e.date) for e in entries] == [
+            ("Apple", date(2024, 3, 1)), ("Apple", date(2024, 1, 1)),
+            ("Apple Pie", date(2024, 1, 2)), ("Green Apple Juice", date(2024, 1, 5)),
+        ]
+
+        entries = search_food_entries(test_db, "apple", FoodEntryFilter(start_date=date(2024, 2, 1)), limit=1)
+        assert [(e.user_id, e.date) for e in entries] == [(other_id, date(2024, 3, 2))]
+
+    def test_search_entries_query_count(self, test_db, foods, count_queries):
+        """Test that the entries of every matching food come from one statement."""
+        for filters in (FoodEntryFilter(user_id=foods.id), FoodEntryFilter()):
+            with count_queries() as statements:
+                entries = search_food_entries(test_db, "apple", filters)
+                assert [e.food for e in entries] == ["Apple", "Apple Pie", "Green Apple Juice"]
+            # The FTS index check, the ranked foods and their entries
+            assert len(statements) == 3
@@ -4,9 +4,13 @@ Tests for the food entry controller functions.
 import pytest
 from datetime import date, timedelta
 from myapp.controllers.food_entry_controller import (
-    create_food_entry, get_food_entry, get_food_entries_by_user,
-    update_food_entry, delete_food_entry
+    create_food_entry, bulk_create_food_entries, create_food_entries, get_food_entry, get_food_entries_by_user, iter_food_entries_by_user,
+    update_food_entry, delete_food_entry, FoodEntryFilter, count_food_entries, bulk_update_food_entries,
+    bulk_delete_food_entries
 )
+from myapp.controllers.report_cache import get_report_cache
+from myapp.controllers.report_controller import get_cached_user_report
+from myapp.controllers.rollup_controller import check_daily_totals
 from myapp.models.food_entry import FoodEntry
 
 
@@ -55,6 +59,24 @@ class TestFoodEntryController:
         assert "Banana" in foods
         assert "Orange" in foods
     
+    def test_get_food_entries_by_user_pages(self, test_db, multiple_food_entries, sample_user):
+        """Test keyset pagination over a user's food entries."""
+        ids = [entry.id for entry in multiple_food_entries]
+
+        first_page = get_food_entries_by_user(test_db, sample_user.id, limit=2)
+        second_page = get_food_entries_by_user(test_db, sample_user.id, after_id=first_page[-1].id, limit=2)
+
+        assert [entry.id for entry in first_page] == ids[:2]
+        assert [entry.id for entry in second_page] == ids[2:]
+        assert get_food_entries_by_user(test_db, sample_user.id, after_id=ids[-1]) == []
+
+    def test_iter_food_entries_by_user(self, test_db, multiple_food_entries, sample_user):
+        """Test streaming a user's food entries in small batches."""
+        ids = [entry.id for entry in multiple_food_entries]
+
+        assert [entry.id for entry in iter_food_entries_by_user(test_db, sample_user.id, batch_size=1)] == ids
+        assert [entry.id for entry in iter_food_entries_by_user(test_db, sample_user.id, after_id=ids[0], limit=1)] == ids[1:2]
+
     def test_get_food_entries_by_user_empty(self, test_db, sample_user):
         """Test getting food entries for a user with no entries."""
         entries = get_food_entries_by_user(test_db, sample_user.id)
@@ -96,6 +118,12 @@ class TestFoodEntryController:
         assert updated_entry.calories == original_calories  # Unchanged
         assert updated_entry.date == original_date  # Unchanged
     
+    def test_update_food_entry_blank_food(self, test_db, sample_food_entry):
+        """Test a blank food name is rejected before anything is flushed."""
+        with pytest.raises(ValueError, match="cannot be empty"):
+            update_food_entry(test_db, sample_food_entry.id, food="  ")
+        assert test_db.get(FoodEntry, sample_food_entry.id).food == sample_food_entry.food
+
     def test_update_food_entry_not_found(self, test_db):
         """Test updating a food entry that doesn't exist."""
         updated_entry = update_food_entry(test_db, 99999, "Banana", 105)
@@ -129,3 +157,137 @@ class TestFoodEntryController:
         """Test deleting a food entry that doesn't exist."""
         success = delete_food_entry(test_db, 99999)
         assert success is False
+
+    def test_bulk_create_food_entries(self, test_db, sample_user):
+        """Test inserting entries from a generator in several chunks."""
+        rows = (
+            {"user_id": sample_user.id, "food": f"Food {i}", "calories": 100 + i, "date": date(2024, 1, 1)}
+            for i in range(25)
+        )
+        inserted = bulk_create_food_entries(test_db, rows, chunk_size=10)
+
+        assert inserted == 25
+        entries = get_food_entries_by_user(test_db, sample_user.id)
+        assert len(entries) == 25
+        assert sum(entry.calories for entry in entries) == sum(100 + i for i in range(25))
+
+    def test_bulk_create_food_entries_rolls_back_on_error(self, test_db, sample_user):
+        """Test that a failing row discards the whole import."""
+        def rows():
+            for i in range(15):
+                yield {"user_id": sample_user.id, "food": f"Food {i}", "calories": 100, "date": date(2024, 1, 1)}
+            raise ValueError("bad row")
+
+        with pytest.raises(ValueError):
+            bulk_create_food_entries(test_db, rows(), chunk_size=10)
+
+        assert get_food_entries_by_user(test_db, sample_user.id) == []
+
+    def test_create_food_entries_returns_ids_in_order(self, test_db, sample_user):
+        """Test the multi-row insert returns ids in input order and uses catalog defaults."""
+        create_food_entry(test_db, sample_user.id, "Banana", 105, date(2024, 1, 1))
+        rows = [
+            {"user_id": sample_user.id, "food": "Pear", "calories": 80, "date": date(2024, 1, 3)},
+            {"user_id": sample_user.id, "food": "banana", "calories": None, "date": date(2024, 1, 2)},
+        ]
+
+        ids = create_food_entries(test_db, rows)
+
+        assert [(get_food_entry(test_db, i).food, get_food_entry(test_db, i).calories) for i in ids] == [("Pear", 80), ("Banana", 105)]
+        assert check_daily_totals(test_db) == []
+
+
+@pytest.fixture
+def mixed_entries(test_db, multiple_users):
+    """Give two users entries across two days with varying calories."""
+    rows = []
+    for user in multiple_users[:2]:
+        for food, calories, day in [("Apple", 95, 1), ("Apple", 100, 2), ("Pizza", 800, 1), ("Salad", 250, 2)]:
+            rows.append({"user_id": user.id, "food": food, "calories": calories, "date": date(2024, 1, day)})
+    bulk_create_food_entries(test_db, rows)
+    return multiple_users
+
+
+@pytest.mark.integration
+class TestBulkFoodEntryChanges:
+    """Test cases for filter-based bulk updates and deletes."""
+
+    def test_count_matches_filters(self, test_db, mixed_entries):
+        """Test that every set filter field narrows the match."""
+        user_id = mixed_entries[0].id
+
+        assert count_food_entries(test_db, FoodEntryFilter(food="Apple")) == 4
+        assert count_food_entries(test_db, FoodEntryFilter(user_id=user_id, food="Apple")) == 2
+        assert count_food_entries(test_db, FoodEntryFilter(start_date=date(2024, 1, 2), end_date=date(2024, 1, 2))) == 4
+        assert count_food_entries(test_db, FoodEntryFilter(min_calories=100, max_calories=250)) == 4
+
+    def test_bulk_update_scales_calories(self, test_db, mixed_entries):
+        """Test that scaled calories are rounded and the rollup stays consistent."""
+        user_id = mixed_entries[0].id
+
+        updated = bulk_update_food_entries(
+            test_db, FoodEntryFilter(user_id=user_id, food="Apple"), scale_calories=1.1
+        )
+
+        assert updated == 2
+        calories = sorted(entry.calories for entry in get_food_entries_by_user(test_db, user_id) if entry.food == "Apple")
+        assert calories == [105, 110]
+        assert check_daily_totals(test_db) == []
+
+    def test_bulk_update_moves_entries(self, test_db, mixed_entries):
+        """Test renaming and re-dating entries in one statement."""
+        updated = bulk_update_food_entries(
+            test_db, FoodEntryFilter(food="Pizza"), food="Flatbread", calories=600, entry_date=date(2024, 1, 3)
+        )
+
+        assert updated == 2
+        moved = FoodEntryFilter(food="Flatbread", min_calories=600, max_calories=600, start_date=date(2024, 1, 3))
+        assert count_food_entries(test_db, moved) == 2
+        assert count_food_entries(test_db, FoodEntryFilter(food="Pizza")) == 0
+        assert check_daily_totals(test_db) == []
+
+    def test_bulk_update_expires_loaded_entries(self, test_db, mixed_entries):
+        """Test that entries already loaded in the session see the new values."""
+        user_id = mixed_entries[0].id
+        entries = get_food_entries_by_user(test_db, user_id)
+
+        bulk_update_food_entries(test_db, FoodEntryFilter(user_id=user_id), calories=1)
+
+        assert {entry.calories for entry in entries} == {1}
+
+    def test_bulk_delete(self, test_db, mixed_entries):
+        """Test deleting by filter leaves other rows and the rollup intact."""
+        deleted = bulk_delete_food_entries(test_db, FoodEntryFilter(min_calories=250))
+
+        assert deleted == 4
+        assert count_food_entries(test_db, FoodEntryFilter(food="Apple")) == 4
+        assert check_daily_totals(test_db) == []
+
+    def test_empty_filter_rejected(self, test_db, mixed_entries):
+        """Test that a filter matching everything is refused."""
+        with pytest.raises(ValueError):
+            bulk_delete_food_entries(test_db, FoodEntryFilter())
+        with pytest.raises(ValueError):
+            bulk_update_food_entries(test_db, FoodEntryFilter(), calories=1)
+
+    def test_invalid_update_values(self, test_db, mixed_entries):
+        """Test that conflicting or missing new values are refused."""
+        filters = FoodEntryFilter(food="Apple")
+        with pytest.raises(ValueError):
+            bulk_update_food_entries(test_db, filters)
+        with pytest.raises(ValueError):
+            bulk_update_food_entries(test_db, filters, calories=100, scale_calories=2)
+        with pytest.raises(ValueError, match="cannot be empty"):
+            bulk_update_food_entries(test_db, filters, food="  ")
+
+    def test_bulk_delete_invalidates_cached_reports(self, test_db, mixed_entries):
+        """Test that cached reports covering the changed rows are dropped."""
+        user_id = mixed_entries[0].id
+        get_report_cache(test_db).clear()
+        start, end = date(2024, 1, 1), date(2024, 1, 2)
+        before = get_cached_user_report(test_db, user_id, start, end)
+
+        bulk_delete_food_entries(test_db, FoodEntryFilter(user_id=user_id, food="Pizza"))
+
+        after = get_cached_user_report(test_db, user_id, start, end)
+        assert after["total_calories"] == before["total_calories"] - 800
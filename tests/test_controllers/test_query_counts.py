@@ -0,0 +1,146 @@
+"""
+Statement counts for controller operations, to catch N+1 and redundant round trips.
+"""
+import asyncio
+import pytest
+from datetime import date
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from myapp.db.database import Base
+from myapp.db.db import transaction
+from myapp.controllers.user_controller import create_user, get_user, get_users
+from myapp.controllers.food_entry_controller import (
+    create_food_entry, get_food_entry, get_food_entries, update_food_entry, delete_food_entry
+)
+from myapp.controllers.goal_controller import get_goal, get_goals, update_goal
+from myapp.controllers.meal_plan_controller import get_meal_plan, get_meal_plans
+from myapp.controllers.aio import food_entry_controller as async_food_entry_controller
+from myapp.controllers.aio import user_controller as async_user_controller
+
+
+def verbs(statements):
+    return [statement.split()[0].upper() for statement in statements]
+
+
+@pytest.mark.integration
+class TestPrimaryKeyLookups:
+    """Primary-key access goes through the session identity map."""
+
+    def test_loaded_objects_cost_no_sql(self, test_db, count_queries, sample_user, sample_food_entry, sample_goal, sample_meal_plan):
+        # Each fixture's commit expired the objects created before it
+        for obj in (sample_user, sample_food_entry, sample_goal, sample_meal_plan):
+            test_db.refresh(obj)
+
+        with count_queries() as statements:
+            assert get_user(test_db, sample_user.id) is sample_user
+            assert get_food_entry(test_db, sample_food_entry.id) is sample_food_entry
+            assert get_goal(test_db, sample_goal.id) is sample_goal
+            assert get_meal_plan(test_db, sample_meal_plan.id) is sample_meal_plan
+
+        assert statements == []
+
+    def test_expired_object_is_reloaded_by_primary_key(self, test_db, count_queries, sample_food_entry):
+        test_db.expire_all()
+
+        with count_queries() as statements:
+            assert get_food_entry(test_db, sample_food_entry.id).food == "Apple"
+
+        assert verbs(statements) == ["SELECT"]
+
+    def test_missing_id(self, test_db, count_queries):
+        with count_queries() as statements:
+            assert get_user(test_db, 99999) is None
+
+        assert verbs(statements) == ["SELECT"]
+
+
+@pytest.mark.integration
+class TestGetMany:
+    """Batched lookups issue a single IN query for whatever is not loaded."""
+
+    def test_single_in_query(self, test_db, count_queries, multiple_food_entries):
+        ids = [entry.id for entry in multiple_food_entries]
+        test_db.expunge_all()
+
+        with count_queries() as statements:
+            entries = get_food_entries(test_db, list(reversed(ids)) + [99999, ids[0]])
+
+        assert [entry.id for entry in entries] == list(reversed(ids))
+        assert verbs(statements) == ["SELECT"]
+        assert " IN " in statements[0]
+
+    def test_loaded_objects_are_not_refetched(self, test_db, count_queries, multiple_users):
+        ids = [user.id for user in multiple_users]
+        test_db.expire(multiple_users[0])
+
+        with count_queries() as statements:
+            users = get_users(test_db, ids)
+
+        assert users == multiple_users
+        assert verbs(statements) == ["SELECT"]
+        with count_queries() as statements:
+            assert get_users(test_db, ids) == multiple_users
+        assert statements == []
+
+    def test_other_models(self, test_db, sample_goal, sample_meal_plan):
+        assert get_goals(test_db, [sample_goal.id]) == [sample_goal]
+        assert get_meal_plans(test_db, [sample_meal_plan.id, 99999]) == [sample_meal_plan]
+        assert get_goals(test_db, []) == []
+
+
+@pytest.mark.integration
+class TestWriteStatementCounts:
+    """Statements issued by the write helpers in each transaction mode."""
+
+    def test_auto_commit_update(self, test_db, count_queries, sample_food_entry):
+        with count_queries() as statements:
+            update_food_entry(test_db, sample_food_entry.id, calories=80)
+
+        # The UPDATE plus the refresh; the lookup itself is free
+        assert verbs(statements) == ["UPDATE", "SELECT"]
+
+    def test_auto_commit_delete(self, test_db, count_queries, sample_goal, sample_food_entry):
+        with count_queries() as statements:
+            delete_food_entry(test_db, sample_food_entry.id)
+            update_goal(test_db, sample_goal.id, daily=1800)
+
+        # The DELETE's commit expires the goal, so its lookup reloads it by primary key
+        assert verbs(statements) == ["DELETE", "SELECT", "UPDATE", "SELECT"]
+
+    def test_unit_of_work(self, test_db, count_queries):
+        with count_queries() as statements:
+            with transaction(test_db):
+                user = create_user(test_db, "counted")
+                entry = create_food_entry(test_db, user.id, "Apple", 95, date(2024, 1, 1))
+                update_food_entry(test_db, entry.id, calories=80)
+                assert get_food_entry(test_db, entry.id).calories == 80
+                delete_food_entry(test_db, entry.id)
+                # The catalog row is cached, so a second entry costs only its INSERT
+                create_food_entry(test_db, user.id, "apple", 95, date(2024, 1, 2))
+
+        # User, catalog upsert for the new food, entry, then the update and delete
+        assert verbs(statements) == ["INSERT", "INSERT", "INSERT", "UPDATE", "DELETE", "INSERT"]
+
+
+@pytest.mark.integration
+class TestAsyncLookups:
+    """The async controllers use the same identity-map lookups."""
+
+    def test_async_get_and_get_many(self, tmp_path):
+        async def scenario():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'lookups.db'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with async_sessionmaker(bind=engine, expire_on_commit=False)() as db:
+                user = await async_user_controller.create_user(db, "async_lookup")
+                entries = [
+                    await async_food_entry_controller.create_food_entry(db, user.id, food, 100, date(2024, 1, 1))
+                    for food in ("Apple", "Pear")
+                ]
+                assert await async_user_controller.get_user(db, user.id) is user
+                assert await async_food_entry_controller.get_food_entries(db, [entries[1].id, entries[0].id]) == entries[::-1]
+                db.expunge_all()
+                fetched = await async_food_entry_controller.get_food_entries(db, [entry.id for entry in entries])
+                assert [entry.food for entry in fetched] == ["Apple", "Pear"]
+            await engine.dispose()
+
+        asyncio.run(scenario())
@@ -0,0 +1,135 @@
+"""
+Tests for the report cache and its invalidation by the controllers.
+"""
+import pytest
+from datetime import date
+from myapp.db.db import transaction
+from myapp.controllers.report_cache import ReportCache
+from myapp.controllers.report_controller import generate_user_report, get_cached_user_report
+from myapp.controllers.food_entry_controller import (
+    create_food_entry, bulk_create_food_entries, update_food_entry, delete_food_entry
+)
+from myapp.controllers.goal_controller import create_goal
+
+JAN = (date(2024, 1, 1), date(2024, 1, 31))
+FEB = (date(2024, 2, 1), date(2024, 2, 29))
+
+
+@pytest.fixture
+def cache():
+    cache = ReportCache(max_entries=8)
+    yield cache
+    cache.close()
+
+
+def cached_keys(cache):
+    return set(cache._entries)
+
+
+@pytest.mark.integration
+class TestReportCache:
+    """Test cases for the cache itself."""
+
+    def test_hits_and_misses(self, test_db, sample_user, cache):
+        create_food_entry(test_db, sample_user.id, "Apple", 95, date(2024, 1, 5))
+
+        first = get_cached_user_report(test_db, sample_user.id, *JAN, cache=cache)
+        second = get_cached_user_report(test_db, sample_user.id, *JAN, cache=cache)
+
+        assert first == second == generate_user_report(test_db, sample_user.id, *JAN)
+        assert cache.stats() == {"hits": 1, "misses": 1, "disk_hits": 0, "invalidations": 0, "entries": 1}
+
+    def test_returns_copies(self, cache):
+        cache.put(1, *JAN, {"daily_breakdown": {"2024-01-01": 10}})
+
+        cache.get(1, *JAN)["daily_breakdown"]["2024-01-01"] = 0
+
+        assert cache.get(1, *JAN) == {"daily_breakdown": {"2024-01-01": 10}}
+
+    def test_lru_eviction(self):
+        cache = ReportCache(max_entries=2)
+        cache.put(1, *JAN, {"n": 1})
+        cache.put(2, *JAN, {"n": 2})
+        cache.get(1, *JAN)
+        cache.put(3, *JAN, {"n": 3})
+
+        assert cache.get(2, *JAN) is None
+        assert cache.get(1, *JAN) == {"n": 1}
+        assert cache.get(3, *JAN) == {"n": 3}
+
+    def test_disk_tier_is_shared(self, tmp_path, test_db, sample_user):
+        path = str(tmp_path / "reports.db")
+        writer = ReportCache(path=path, namespace="db")
+        reader = ReportCache(path=path, namespace="db")
+        other_db = ReportCache(path=path, namespace="other")
+        try:
+            report = get_cached_user_report(test_db, sample_user.id, *JAN, cache=writer)
+
+            assert reader.get(sample_user.id, *JAN) == report
+            assert reader.disk_hits == 1
+            assert other_db.get(sample_user.id, *JAN) is None
+
+            writer.invalidate(sample_user.id, date(2024, 1, 10), date(2024, 1, 10))
+            reader._entries.clear()
+            assert reader.get(sample_user.id, *JAN) is None
+        finally:
+            for cache in (writer, reader, other_db):
+                cache.close()
+
+
+@pytest.mark.integration
+class TestReportCacheInvalidation:
+    """Controller writes drop exactly the cached reports they affect."""
+
+    @pytest.fixture
+    def warm(self, test_db, sample_user, multiple_users, cache):
+        for user_id in (sample_user.id, multiple_users[0].id):
+            for window in (JAN, FEB):
+                get_cached_user_report(test_db, user_id, *window, cache=cache)
+        return cache
+
+    def test_entry_write_drops_overlapping_ranges(self, test_db, sample_user, multiple_users, warm):
+        entry = create_food_entry(test_db, sample_user.id, "Apple", 95, date(2024, 1, 15))
+        assert cached_keys(warm) == {(sample_user.id, *FEB), (multiple_users[0].id, *JAN), (multiple_users[0].id, *FEB)}
+
+        get_cached_user_report(test_db, sample_user.id, *JAN, cache=warm)
+        update_food_entry(test_db, entry.id, entry_date=date(2024, 2, 10))
+        assert (sample_user.id, *JAN) not in cached_keys(warm)
+        assert (sample_user.id, *FEB) not in cached_keys(warm)
+
+        get_cached_user_report(test_db, sample_user.id, *FEB, cache=warm)
+        delete_food_entry(test_db, entry.id)
+        assert (sample_user.id, *FEB) not in cached_keys(warm)
+        assert get_cached_user_report(test_db, sample_user.id, *FEB, cache=warm)["total_entries"] == 0
+
+    def test_bulk_insert_drops_touched_ranges(self, test_db, sample_user, multiple_users, warm):
+        bulk_create_food_entries(test_db, [
+            {"user_id": multiple_users[0].id, "food": "Pear", "calories": 5, "date": date(2024, 2, 3)},
+        ])
+
+        assert cached_keys(warm) == {(sample_user.id, *JAN), (sample_user.id, *FEB), (multiple_users[0].id, *JAN)}
+
+    def test_goal_write_drops_every_range_of_the_user(self, test_db, sample_user, multiple_users, warm):
+        create_goal(test_db, sample_user.id, 2000, 14000)
+
+        assert cached_keys(warm) == {(multiple_users[0].id, *JAN), (multiple_users[0].id, *FEB)}
+        assert get_cached_user_report(test_db, sample_user.id, *JAN, cache=warm)["has_goal"] is True
+
+    def test_unit_of_work_invalidates_again_on_commit(self, test_db, sample_user, warm):
+        with transaction(test_db):
+            create_food_entry(test_db, sample_user.id, "Apple", 95, date(2024, 1, 15))
+            # A report cached before the commit must not outlive it
+            warm.put(sample_user.id, *JAN, {"stale": True})
+
+        assert (sample_user.id, *JAN) not in cached_keys(warm)
+        assert get_cached_user_report(test_db, sample_user.id, *JAN, cache=warm)["total_calories"] == 95
+
+    def test_report_computed_during_a_write_is_not_stored(self, test_db, sample_user, cache):
+        def compute():
+            report = generate_user_report(test_db, sample_user.id, *JAN)
+            create_food_entry(test_db, sample_user.id, "Apple", 95, date(2024, 1, 15))
+            return report
+
+        cache.get_or_compute(sample_user.id, *JAN, compute)
+
+        assert cached_keys(cache) == set()
@@ -0,0 +1,212 @@
+"""
+Tests for the report controller functions.
+"""
+import pytest
+from datetime import date
+from myapp.analytics.food_stats import FoodStats
+from myapp.controllers.report_controller import (
+    calorie_histogram, generate_user_report, generate_user_reports, generate_user_trends, top_foods
+)
+from myapp.models.food_entry import FoodEntry
+from myapp.models.goal import Goal
+
+
+@pytest.fixture
+def week_of_entries(test_db, sample_user):
+    """Create food entries spread over a week, including days with no entries."""
+    rows = [
+        ("Breakfast", 500, date(2024, 1, 1)),
+        ("Lunch", 700, date(2024, 1, 1)),
+        ("Dinner", 800, date(2024, 1, 1)),
+        ("Breakfast", 400, date(2024, 1, 2)),
+        ("Lunch", 600, date(2024, 1, 2)),
+        ("Breakfast", 450, date(2024, 1, 4)),
+        ("Dinner", 900, date(2024, 1, 7)),
+        ("Out of range", 1000, date(2024, 1, 8)),
+    ]
+    for food, calories, day in rows:
+        test_db.add(FoodEntry(user_id=sample_user.id, food=food, calories=calories, date=day))
+    test_db.commit()
+    return rows
+
+
+@pytest.fixture
+def users_with_entries(test_db, multiple_users):
+    """Give each user a different number of entries; the last user has none."""
+    for i, user in enumerate(multiple_users[:-1]):
+        for day in range(1, i + 3):
+            test_db.add(FoodEntry(user_id=user.id, food="Meal", calories=100 * (i + 1), date=date(2024, 1, day)))
+    test_db.add(Goal(user_id=multiple_users[0].id, daily=1500, weekly=10500))
+    test_db.add(Goal(user_id=multiple_users[0].id, daily=1800, weekly=12600))
+    test_db.add(Goal(user_id=multiple_users[1].id, daily=2000, weekly=14000))
+    test_db.commit()
+    return multiple_users
+
+
+@pytest.mark.integration
+class TestReportController:
+    """Test cases for report controller functions."""
+
+    def test_report_totals(self, test_db, sample_user, week_of_entries):
+        """Test that the report aggregates entries within the date range."""
+        report = generate_user_report(test_db, sample_user.id, date(2024, 1, 1), date(2024, 1, 7))
+
+        assert report["total_entries"] == 7
+        assert report["total_calories"] == 4350
+        assert report["days_in_period"] == 7
+        assert report["days_tracked"] == 4
+        assert report["avg_daily_calories"] == 1087.5
+        assert report["daily_breakdown"] == {
+            "2024-01-01": 2000,
+            "2024-01-02": 1000,
+            "2024-01-04": 450,
+            "2024-01-07": 900,
+        }
+        assert report["has_goal"] is False
+
+    def test_report_sources_match(self, test_db, sample_user, week_of_entries):
+        """Test that the rollup, SQL aggregation and ORM fallback agree."""
+        test_db.add(Goal(user_id=sample_user.id, daily=2000, weekly=14000))
+        test_db.commit()
+
+        reports = [
+            generate_user_report(test_db, sample_user.id, date(2024, 1, 1), date(2024, 1, 7), source=source)
+            for source in ("rollup", "entries", "orm")
+        ]
+
+        assert reports[0] == reports[1] == reports[2]
+        assert list(reports[0]["daily_breakdown"]) == sorted(reports[0]["daily_breakdown"])
+
+    def test_unknown_source(self, test_db, sample_user):
+        """Test that an unknown report source is rejected."""
+        with pytest.raises(ValueError):
+            generate_user_report(test_db, sample_user.id, date(2024, 1, 1), date(2024, 1, 7), source="cache")
+
+    def test_report_uses_latest_goal(self, test_db, sample_user, week_of_entries):
+        """Test that the most recent goal is used for comparison."""
+        test_db.add(Goal(user_id=sample_user.id, daily=1500, weekly=10500))
+        test_db.add(Goal(user_id=sample_user.id, daily=2000, weekly=14000))
+        test_db.commit()
+
+        report = generate_user_report(test_db, sample_user.id, date(2024, 1, 1), date(2024, 1, 7))
+
+        assert report["has_goal"] is True
+        assert report["daily_goal"] == 2000
+        assert report["daily_goal_percent"] == 54.4
+        assert report["weekly_avg_calories"] == 4350.0
+        assert report["weekly_goal_percent"] == 31.1
+
+    def test_report_no_entries(self, test_db, sample_user):
+        """Test the report for a range with no entries."""
+        for source in ("rollup", "entries", "orm"):
+            report = generate_user_report(
+                test_db, sample_user.id, date(2024, 1, 1), date(2024, 1, 7), source=source
+            )
+            assert report["total_entries"] == 0
+            assert report["total_calories"] == 0
+            assert report["days_tracked"] == 0
+            assert report["avg_daily_calories"] == 0
+            assert report["daily_breakdown"] == {}
+
+
+@pytest.mark.integration
+class TestBatchReports:
+    """Test cases for generating reports for many users at once."""
+
+    def test_matches_single_user_reports(self, test_db, users_with_entries):
+        """Test that batch reports equal the per-user reports, in user order."""
+        start, end = date(2024, 1, 1), date(2024, 1, 7)
+
+        reports = list(generate_user_reports(test_db, start, end, chunk_size=2))
+
+        assert [report["user_id"] for report in reports] == [user.id for user in users_with_entries]
+        assert reports == [generate_user_report(test_db, user.id, start, end) for user in users_with_entries]
+        assert reports[0]["daily_goal"] == 1800
+        assert reports[2]["total_entries"] == 0
+        assert reports[2]["has_goal"] is False
+
+    def test_selected_users(self, test_db, users_with_entries):
+        """Test reporting on an explicit list of user IDs."""
+        user_ids = [users_with_entries[2].id, users_with_entries[0].id]
+
+        reports = list(generate_user_reports(test_db, date(2024, 1, 1), date(2024, 1, 7), user_ids=user_ids))
+
+        assert [report["user_id"] for report in reports] == user_ids
+
+
+@pytest.mark.integration
+class TestUserTrends:
+    """Test cases for trends read from the daily rollup."""
+
+    def test_trends_from_rollup(self, test_db, sample_user, week_of_entries):
+        """Test that trends see the same days as the report and use the latest goal."""
+        test_db.add(Goal(user_id=sample_user.id, daily=2000, weekly=14000))
+        test_db.commit()
+
+        trends = generate_user_trends(test_db, sample_user.id, date(2024, 1, 1), date(2024, 1, 7))
+
+        assert trends["user_id"] == sample_user.id
+        assert [row["calories"] for row in trends["daily"]] == [2000, 1000, None, 450, None, None, 900]
+        assert trends["daily"][-1]["rolling_7"] == 1087.5
+        assert trends["avg_daily_calories"] == 1087.5
+        assert trends["longest_streak_under_goal"] == 2
+        assert trends["current_streak_under_goal"] == 1
+        assert trends["weeks"][0]["calories"] == 4350
+
+    def test_no_goal(self, test_db, sample_user, week_of_entries):
+        trends = generate_user_trends(test_db, sample_user.id, date(2024, 1, 1), date(2024, 1, 2))
+
+        assert trends["daily_goal"] is None
+        assert "current_streak_under_goal" not in trends
+
+
+@pytest.mark.integration
+class TestTopFoods:
+    """Test cases for top foods and calorie histograms aggregated in SQL."""
+
+    def test_top_by_calories(self, test_db, sample_user, week_of_entries):
+        """Test ranking, shares and that entries outside the range are left out."""
+        foods = top_foods(test_db, date(2024, 1, 1), date(2024, 1, 7), sample_user.id, limit=2)
+
+        assert foods == [
+            {"food": "Dinner", "entries": 2, "calories": 1700, "share": 39.1},
+            {"food": "Breakfast", "entries": 3, "calories": 1350, "share": 31.0},
+        ]
+
+    def test_top_by_entries(self, test_db, sample_user, week_of_entries):
+        foods = top_foods(test_db, date(2024, 1, 1), date(2024, 1, 8), limit=3, by="entries")
+
+        # Ties on entries are broken by calories
+        assert [(row["food"], row["entries"]) for row in foods] == [("Breakfast", 3), ("Dinner", 2), ("Lunch", 2)]
+        assert foods[0]["share"] == 37.5
+
+    def test_unknown_ranking(self, test_db):
+        with pytest.raises(ValueError, match="Unknown ranking"):
+            top_foods(test_db, date(2024, 1, 1), date(2024, 1, 7), by="protein")
+
+    def test_histogram_fills_empty_buckets(self, test_db, sample_user, week_of_entries):
+        histogram = calorie_histogram(test_db, date(2024, 1, 1), date(2024, 1, 7), sample_user.id, bucket=200)
+
+        assert histogram == [
+            {"low": 400, "high": 600, "count": 3},
+            {"low": 600, "high": 800, "count": 2},
+            {"low": 800, "high": 1000, "count": 2},
+        ]
+
+    def test_histogram_per_day(self, test_db, sample_user, week_of_entries):
+        histogram = calorie_histogram(test_db, date(2024, 1, 1), date(2024, 1, 7), sample_user.id, bucket=500, per_day=True)
+
+        assert [(row["low"], row["count"]) for row in histogram] == [(0, 1), (500, 1), (1000, 1), (1500, 0), (2000, 1)]
+
+    def test_database_and_stream_agree(self, test_db, users_with_entries, week_of_entries):
+        """Test that the GROUP BY path and the streaming path give the same result."""
+        start, end = date(2024, 1, 1), date(2024, 1, 7)
+        entries = [
+            (entry.food, entry.calories) for entry in test_db.query(FoodEntry).all()
+            if start <= entry.date <= end
+        ]
+        stats = FoodStats(bucket=150).update(entries)
+
+        for by in ("calories", "entries"):
+            assert top_foods(test_db, start, end, limit=3, by=by) == stats.top(3, by)
+        assert calorie_histogram(test_db, start, end, bucket=150) == stats.histogram()
@@ -0,0 +1,93 @@
+"""
+Tests for the daily_totals rollup and its maintenance.
+"""
+import pytest
+from datetime import date
+from sqlalchemy import text
+from myapp.controllers.food_entry_controller import (
+    create_food_entry, bulk_create_food_entries, update_food_entry, delete_food_entry
+)
+from myapp.controllers.rollup_controller import rebuild_daily_totals, check_daily_totals
+from myapp.db.db import transaction
+from myapp.models.daily_total import DailyTotal
+
+
+def rollup(db, user_id):
+    rows = db.query(DailyTotal).filter(DailyTotal.user_id == user_id).order_by(DailyTotal.date).all()
+    return {row.date: (row.calories, row.entry_count) for row in rows}
+
+
+@pytest.mark.integration
+class TestDailyTotals:
+    """Test cases for keeping the rollup in sync with food entries."""
+
+    def test_create_updates_rollup(self, test_db, sample_user):
+        create_food_entry(test_db, sample_user.id, "Apple", 95, date(2024, 1, 1))
+        create_food_entry(test_db, sample_user.id, "Banana", 105, date(2024, 1, 1))
+        create_food_entry(test_db, sample_user.id, "Orange", 62, date(2024, 1, 2))
+
+        assert rollup(test_db, sample_user.id) == {
+            date(2024, 1, 1): (200, 2),
+            date(2024, 1, 2): (62, 1),
+        }
+
+    def test_update_moves_calories_between_days(self, test_db, sample_user):
+        entry = create_food_entry(test_db, sample_user.id, "Apple", 95, date(2024, 1, 1))
+        create_food_entry(test_db, sample_user.id, "Banana", 105, date(2024, 1, 1))
+
+        update_food_entry(test_db, entry.id, calories=80, entry_date=date(2024, 1, 3))
+
+        assert rollup(test_db, sample_user.id) == {
+            date(2024, 1, 1): (105, 1),
+            date(2024, 1, 3): (80, 1),
+        }
+        assert check_daily_totals(test_db) == []
+
+    def test_delete_removes_empty_days(self, test_db, sample_user):
+        entry = create_food_entry(test_db, sample_user.id, "Apple", 95, date(2024, 1, 1))
+        delete_food_entry(test_db, entry.id)
+
+        assert rollup(test_db, sample_user.id) == {}
+
+    def test_bulk_insert_updates_rollup(self, test_db, sample_user):
+        bulk_create_food_entries(test_db, (
+            {"user_id": sample_user.id, "food": "Meal", "calories": 100, "date": date(2024, 1, 1 + i % 3)}
+            for i in range(9)
+        ), chunk_size=4)
+
+        assert rollup(test_db, sample_user.id) == {
+            date(2024, 1, 1): (300, 3),
+            date(2024, 1, 2): (300, 3),
+            date(2024, 1, 3): (300, 3),
+        }
+
+    def test_check_and_rebuild(self, test_db, sample_user):
+        create_food_entry(test_db, sample_user.id, "Apple", 95, date(2024, 1, 1))
+        create_food_entry(test_db, sample_user.id, "Banana", 105, date(2024, 1, 2))
+        test_db.execute(text("DELETE FROM daily_totals WHERE date = '2024-01-01'"))
+        test_db.execute(text("UPDATE daily_totals SET calories = 1 WHERE date = '2024-01-02'"))
+        test_db.commit()
+
+        mismatches = check_daily_totals(test_db, sample_user.id)
+        assert [(m["date"], m["expected"], m["actual"]) for m in mismatches] == [
+            (date(2024, 1, 1), (95, 1), (0, 0)),
+            (date(2024, 1, 2), (105, 1), (1, 1)),
+        ]
+
+        assert rebuild_daily_totals(test_db, sample_user.id) == 2
+        assert check_daily_totals(test_db) == []
+
+    def test_rebuild_inside_unit_of_work_rolls_back(self, test_db, sample_user):
+        """Test that a rebuild joins the surrounding transaction instead of committing it."""
+        create_food_entry(test_db, sample_user.id, "Apple", 95, date(2024, 1, 1))
+        test_db.execute(text("UPDATE daily_totals SET calories = 1"))
+        test_db.commit()
+
+        with pytest.raises(RuntimeError):
+            with transaction(test_db):
+                create_food_entry(test_db, sample_user.id, "Banana", 105, date(2024, 1, 2))
+                rebuild_daily_totals(test_db, sample_user.id)
+                raise RuntimeError("abort")
+
+        # Neither the entry nor the rebuilt rollup survived the rollback
+        assert rollup(test_db, sample_user.id) == {date(2024, 1, 1): (1, 1)}
@@ -0,0 +1,102 @@
+"""
+Tests for running controller calls as a single unit of work.
+"""
+import asyncio
+import pytest
+from datetime import date
+from sqlalchemy import event, select
+from myapp.db.db import UNIT_OF_WORK, transaction
+from myapp.controllers.user_controller import create_user, get_user
+from myapp.controllers.food_entry_controller import (
+    create_food_entry, bulk_create_food_entries, update_food_entry, delete_food_entry, get_food_entries_by_user
+)
+from myapp.controllers.goal_controller import create_goal
+from myapp.controllers.aio import user_controller as async_user_controller
+from myapp.models.user import User
+
+
+@pytest.fixture
+def commits(test_db):
+    """Count commits and SELECT statements issued through the test session."""
+    counts = {"commits": 0, "selects": 0}
+
+    def after_commit(session):
+        counts["commits"] += 1
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            counts["selects"] += 1
+
+    engine = test_db.get_bind()
+    event.listen(test_db, "after_commit", after_commit)
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield counts
+    event.remove(test_db, "after_commit", after_commit)
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.integration
+class TestUnitOfWork:
+    """Test cases for the transaction-scoped controller mode."""
+
+    def test_commits_once_without_refreshing(self, test_db, commits):
+        with transaction(test_db):
+            user = create_user(test_db, "uow_user")
+            entry = create_food_entry(test_db, user.id, "Apple", 95, date(2024, 1, 1))
+            goal = create_goal(test_db, user.id, 2000, 14000)
+            assert user.id is not None and entry.id is not None and goal.id is not None
+            # Generated IDs come back from the INSERTs; nothing is re-selected
+            assert commits == {"commits": 0, "selects": 0}
+            update_food_entry(test_db, entry.id, calories=80)
+            assert commits["commits"] == 0
+
+        assert commits["commits"] == 1
+        assert UNIT_OF_WORK not in test_db.info
+        assert [e.calories for e in get_food_entries_by_user(test_db, user.id)] == [80]
+
+    def test_rolls_back_on_error(self, test_db, commits):
+        with pytest.raises(RuntimeError):
+            with transaction(test_db):
+                user = create_user(test_db, "doomed")
+                bulk_create_food_entries(test_db, [{"user_id": user.id, "food": "Pear", "calories": 5, "date": date(2024, 1, 1)}])
+                raise RuntimeError("boom")
+
+        assert commits["commits"] == 0
+        assert test_db.scalars(select(User)).all() == []
+
+    def test_delete_inside_unit_of_work(self, test_db, sample_food_entry, commits):
+        with transaction(test_db):
+            assert delete_food_entry(test_db, sample_food_entry.id) is True
+
+        assert commits["commits"] == 1
+        assert get_food_entries_by_user(test_db, sample_food_entry.user_id) == []
+
+    def test_default_mode_commits_each_call(self, test_db, commits):
+        user = create_user(test_db, "auto_user")
+        create_food_entry(test_db, user.id, "Apple", 95, date(2024, 1, 1))
+
+        assert commits["commits"] == 2
+        assert get_user(test_db, user.id).name == "auto_user"
+
+    def test_async_controllers_flush_in_unit_of_work(self, tmp_path):
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from myapp.db.database import Base
+
+        async def scenario():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+            async with factory() as db:
+                db.info[UNIT_OF_WORK] = True
+                user = await async_user_controller.create_user(db, "async_uow")
+                assert user.id is not None
+                await db.rollback()
+
+            async with factory() as db:
+                users = await async_user_controller.get_all_users(db)
+            await engine.dispose()
+            return users
+
+        assert asyncio.run(scenario()) == []
@@ -2,10 +2,39 @@
 Tests for the user controller functions.
 """
 import pytest
+from datetime import date, timedelta
+from sqlalchemy import func, select
 from myapp.controllers.user_controller import (
-    create_user, get_user, get_user_by_name, get_all_users, update_user, delete_user
+    create_user, get_user, get_user_by_name, get_all_users, iter_all_users, update_user, delete_user, purge_user
 )
+from myapp.controllers.food_entry_controller import bulk_create_food_entries
+from myapp.db.db import transaction
 from myapp.models.user import User
+from myapp.models.food_entry import FoodEntry
+from myapp.models.goal import Goal
+from myapp.models.meal_plan import MealPlan
+from myapp.models.daily_total import DailyTotal
+
+
+@pytest.fixture
+def user_with_history(test_db, multiple_users):
+    """Give the first user entries over several days plus a goal and a meal plan."""
+    user, other = multiple_users[0], multiple_users[1]
+    bulk_create_food_entries(test_db, [
+        {"user_id": owner.id, "food": "Meal", "calories": 100, "date": date(2024, 1, 1) + timedelta(days=i % 5)}
+        for owner in (user, other)
+        for i in range(20)
+    ])
+    test_db.add_all([Goal(user_id=user.id, daily=2000, weekly=14000), MealPlan(user_id=user.id, week=1, plan="Oats")])
+    test_db.commit()
+    return user.id, other.id
+
+
+def row_counts(db, user_id):
+    return {
+        model.__tablename__: db.scalar(select(func.count()).select_from(model).where(model.user_id == user_id))
+        for model in (FoodEntry, Goal, MealPlan, DailyTotal)
+    }
 
 
 @pytest.mark.integration
@@ -61,6 +90,14 @@ class TestUserController:
         assert "user_1" in user_names
         assert "user_2" in user_names
     
+    def test_get_all_users_pages(self, test_db, multiple_users):
+        """Test keyset pagination and streaming over users."""
+        ids = [user.id for user in multiple_users]
+
+        assert [user.id for user in get_all_users(test_db, limit=2)] == ids[:2]
+        assert [user.id for user in get_all_users(test_db, after_id=ids[1])] == ids[2:]
+        assert [user.id for user in iter_all_users(test_db, batch_size=2)] == ids
+
     def test_get_all_users_empty(self, test_db):
         """Test getting all users when none exist."""
         users = get_all_users(test_db)
@@ -114,3 +151,36 @@ class TestUserController:
         # This should raise an exception due to unique constraint
         with pytest.raises(Exception):
             create_user(test_db, "duplicate_name")
+
+
+@pytest.mark.integration
+class TestSetBasedUserDelete:
+    """Test cases for deleting users with large histories."""
+
+    def test_delete_user_removes_children_set_based(self, test_db, count_queries, user_with_history):
+        user_id, other_id = user_with_history
+        other_before = row_counts(test_db, other_id)
+
+        with count_queries() as statements:
+            assert delete_user(test_db, user_id) is True
+
+        # One DELETE per table, however many rows the user has
+        assert [statement.split()[0] for statement in statements].count("DELETE") == 5
+        assert not any(statement.startswith("SELECT food_entries") for statement in statements)
+        assert get_user(test_db, user_id) is None
+        assert row_counts(test_db, user_id) == {"food_entries": 0, "goals": 0, "meal_plans": 0, "daily_totals": 0}
+        assert row_counts(test_db, other_id) == other_before
+
+    def test_purge_user_in_chunks(self, test_db, user_with_history):
+        user_id, other_id = user_with_history
+
+        assert list(purge_user(test_db, user_id, chunk_size=8)) == [8, 8, 4]
+
+        assert get_user(test_db, user_id) is None
+        assert row_counts(test_db, user_id) == {"food_entries": 0, "goals": 0, "meal_plans": 0, "daily_totals": 0}
+        assert row_counts(test_db, other_id)["food_entries"] == 20
+
+    def test_purge_refuses_unit_of_work(self, test_db, user_with_history):
+        with pytest.raises(ValueError):
+            with transaction(test_db):
+                list(purge_user(test_db, user_with_history[0]))
@@ -0,0 +1,148 @@
+"""
+Tests for the single-writer write queue.
+"""
+import threading
+import time
+import pytest
+from dataclasses import replace
+from datetime import date
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+from myapp.controllers.goal_controller import delete_goal
+from myapp.controllers.user_controller import create_user
+from myapp.controllers.write_queue import WriteQueue
+from myapp.db.config import PROFILES
+from myapp.db.database import create_engine_from_config
+from myapp.db.migrations import upgrade_schema
+from myapp.models.daily_total import DailyTotal
+from myapp.models.food_entry import FoodEntry
+from myapp.models.goal import Goal
+from myapp.models.meal_plan import MealPlan
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    """Session factory for a fresh file database with the prod profile."""
+    engine = create_engine_from_config(replace(PROFILES["prod"], url=f"sqlite:///{tmp_path / 'queue.db'}"))
+    upgrade_schema(engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def user_id(sessions):
+    with sessions() as db:
+        return create_user(db, "producer").id
+
+
+@pytest.mark.integration
+class TestWriteQueue:
+    """Test cases for WriteQueue."""
+
+    def test_creates_resolve_to_ids(self, sessions, user_id):
+        with WriteQueue(sessions) as writes:
+            entry = writes.create_food_entry(user_id, "Apple", 95, date(2024, 1, 1))
+            goal = writes.create_goal(user_id, 2000, 14000)
+            plan = writes.create_meal_plan(user_id, 1, "Salads")
+            ids = entry.result(), goal.result(), plan.result()
+
+        with sessions() as db:
+            assert db.get(FoodEntry, ids[0]).calories == 95
+            assert db.get(Goal, ids[1]).daily == 2000
+            assert db.get(MealPlan, ids[2]).plan == "Salads"
+
+    def test_group_commit(self, sessions, user_id):
+        """Test that calls queued together share a transaction, up to max_batch per commit."""
+        writes = WriteQueue(sessions, max_batch=10, max_delay_ms=500)
+        futures = [writes.create_food_entry(user_id, "Apple", 100 + i, date(2024, 1, 1)) for i in range(35)]
+        writes.close()
+
+        assert len({future.result() for future in futures}) == 35
+        assert writes.committed == 35
+        assert writes.batches == 4
+        with sessions() as db:
+            assert db.scalar(select(DailyTotal.entry_count)) == 35
+
+    def test_failing_call_does_not_fail_the_batch(self, sessions, user_id):
+        with WriteQueue(sessions, max_delay_ms=200) as writes:
+            before = writes.create_food_entry(user_id, "Apple", 95, date(2024, 1, 1))
+            # No calories and no catalog default
+            failing = writes.create_food_entry(user_id, "Mystery", None, date(2024, 1, 1))
+            after = writes.create_food_entry(user_id, "Pear", 80, date(2024, 1, 1))
+
+            with pytest.raises(ValueError, match="has no default"):
+                failing.result()
+            assert before.result() and after.result()
+
+        with sessions() as db:
+            assert db.scalar(select(func.count(FoodEntry.id))) == 2
+
+    def test_submit_returns_controller_result(self, sessions, user_id):
+        with WriteQueue(sessions) as writes:
+            goal_id = writes.create_goal(user_id, 1800, 12600).result()
+            assert writes.submit(delete_goal, goal_id).result() is True
+            assert writes.submit(delete_goal, goal_id).result() is False
+
+    def test_close_applies_queued_calls(self, sessions, user_id):
+        writes = WriteQueue(sessions, max_delay_ms=1000)
+        future = writes.create_goal(user_id, 2000, 14000)
+        writes.close()
+
+        assert future.done()
+        with pytest.raises(RuntimeError, match="closed"):
+            writes.create_goal(user_id, 2000, 14000)
+
+    def test_submit_racing_close(self, sessions, user_id):
+        """Test a call being queued while close() runs is still applied."""
+        writes = WriteQueue(sessions)
+        putting = threading.Event()
+        put = writes._queue.put
+
+        def slow_put(item, *args, **kwargs):
+            if isinstance(item, tuple):
+                # Let close() run between the closed check and the put
+                putting.set()
+                time.sleep(0.1)
+            put(item, *args, **kwargs)
+
+        writes._queue.put = slow_put
+        futures = []
+        producer = threading.Thread(target=lambda: futures.append(writes.create_goal(user_id, 2000, 14000)))
+        producer.start()
+        putting.wait()
+        writes.close()
+        producer.join()
+
+        assert futures[0].result(timeout=2)
+
+    def test_flush(self, sessions, user_id):
+        with WriteQueue(sessions, max_delay_ms=1000) as writes:
+            future = writes.create_goal(user_id, 2000, 14000)
+            writes.flush()
+            assert future.done()
+
+    def test_concurrent_producers(self, sessions, user_id):
+        errors, ids = [], []
+        lock = threading.Lock()
+
+        with WriteQueue(sessions) as writes:
+            def produce(index: int):
+                try:
+                    futures = [writes.create_food_entry(user_id, f"Food {i % 7}", 100 + i, date(2024, 1, 1 + index)) for i in range(50)]
+                    with lock:
+                        ids.extend(future.result() for future in futures)
+                except Exception as exc:
+                    errors.append(exc)
+
+            producers = [threading.Thread(target=produce, args=(i,)) for i in range(16)]
+            for producer in producers:
+                producer.start()
+            for producer in producers:
+                producer.join()
+
+        assert errors == []
+        assert len(set(ids)) == 16 * 50
+        # Far fewer commits than calls
+        assert writes.batches < 16 * 50
+        with sessions() as db:
+            assert db.scalar(select(func.sum(DailyTotal.entry_count))) == 16 * 50
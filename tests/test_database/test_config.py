@@ -0,0 +1,65 @@
+"""
+Tests for the database configuration layer and engine profiles.
+"""
+import pytest
+from dataclasses import replace
+from sqlalchemy import text
+from myapp.db.config import PROFILES, load_config
+from myapp.db.database import create_engine_from_config
+
+
+@pytest.mark.unit
+class TestLoadConfig:
+    """Test cases for building the configuration from the environment."""
+
+    def test_default_profile_is_prod(self):
+        config = load_config({})
+        assert config == PROFILES["prod"]
+        assert config.echo is False
+        assert config.pragmas["journal_mode"] == "WAL"
+
+    def test_dev_profile_echoes(self):
+        config = load_config({"HEALTH_TRACKER_PROFILE": "dev"})
+        assert config.echo is True
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            load_config({"HEALTH_TRACKER_PROFILE": "staging"})
+
+    def test_env_overrides(self):
+        config = load_config({
+            "HEALTH_TRACKER_DATABASE_URL": "sqlite:///other.db",
+            "HEALTH_TRACKER_DB_ECHO": "true",
+            "HEALTH_TRACKER_DB_POOL_SIZE": "8",
+            "HEALTH_TRACKER_DB_POOL_TIMEOUT": "2.5",
+            "HEALTH_TRACKER_SQLITE_SYNCHRONOUS": "FULL",
+        })
+        assert config.url == "sqlite:///other.db"
+        assert config.echo is True
+        assert config.engine_kwargs() == {"echo": True, "pool_size": 8, "pool_timeout": 2.5}
+        assert config.pragmas["synchronous"] == "FULL"
+        assert config.pragmas["journal_mode"] == "WAL"
+
+
+@pytest.mark.integration
+class TestEnginePragmas:
+    """Test that profile pragmas are applied to new connections."""
+
+    def test_prod_pragmas_applied(self, tmp_path):
+        config = replace(PROFILES["prod"], url=f"sqlite:///{tmp_path / 'prod.db'}")
+        engine = create_engine_from_config(config)
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+            assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+            assert conn.execute(text("PRAGMA temp_store")).scalar() == 2
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -64000
+        engine.dispose()
+
+    def test_dev_profile_keeps_rollback_journal(self, tmp_path):
+        config = replace(PROFILES["dev"], url=f"sqlite:///{tmp_path / 'dev.db'}", echo=False)
+        engine = create_engine_from_config(config)
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+            assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        engine.dispose()
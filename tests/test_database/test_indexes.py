@@ -0,0 +1,187 @@
+"""
+Tests for the composite indexes and the schema upgrade path.
+"""
+import pytest
+from contextlib import contextmanager
+from datetime import date
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import Session
+from myapp.db.migrations import upgrade_schema
+from myapp.controllers.rollup_controller import check_daily_totals
+from myapp.controllers.food_controller import search_foods
+from myapp.controllers.food_entry_controller import get_food_entries_by_user
+from myapp.controllers.goal_controller import get_goals_by_user
+from myapp.controllers.meal_plan_controller import get_meal_plans_by_user
+from myapp.controllers.report_controller import generate_user_report
+
+
+@contextmanager
+def captured_selects(engine):
+    """Collect every SELECT statement (with parameters) issued on the engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def query_plan(engine, statement, parameters):
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.integration
+class TestIndexUsage:
+    """Every per-user controller query should be answered through an index."""
+
+    @pytest.mark.parametrize("operation", [
+        lambda db, user_id: get_food_entries_by_user(db, user_id),
+        lambda db, user_id: get_goals_by_user(db, user_id),
+        lambda db, user_id: get_meal_plans_by_user(db, user_id),
+        lambda db, user_id: get_food_entries_by_user(db, user_id, after_id=1, limit=10),
+        lambda db, user_id: get_meal_plans_by_user(db, user_id, after_id=1, limit=10),
+        lambda db, user_id: generate_user_report(db, user_id, date(2024, 1, 1), date(2024, 1, 31)),
+    ], ids=["food_entries", "goals", "meal_plans", "food_entries_page", "meal_plans_page", "report"])
+    def test_controller_queries_use_index(self, test_db, sample_user, operation):
+        engine = test_db.get_bind()
+        with captured_selects(engine) as statements:
+            operation(test_db, sample_user.id)
+
+        assert statements
+        for statement, parameters in statements:
+            plan = query_plan(engine, statement, parameters)
+            assert "USING" in plan and "INDEX" in plan, plan
+            assert "USE TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.integration
+class TestUpgradeSchema:
+    """Test cases for upgrading databases created before the indexes existed."""
+
+    def test_upgrade_adds_missing_indexes(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}", echo=False)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL UNIQUE)"))
+            conn.execute(text(
+                "CREATE TABLE food_entries (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+                "food VARCHAR NOT NULL, calories INTEGER NOT NULL, date DATE NOT NULL)"
+            ))
+            conn.execute(text("INSERT INTO users (id, name) VALUES (1, 'legacy')"))
+            conn.execute(text(
+                "INSERT INTO food_entries (user_id, food, calories, date) VALUES (1, 'Apple', 95, '2024-01-01')"
+            ))
+
+        created = upgrade_schema(engine)
+
+        assert "ix_food_entries_user_id_date" in created
+        assert {"goals", "meal_plans", "foods"} <= set(created)
+        index_names = {index["name"] for index in inspect(engine).get_indexes("food_entries")}
+        assert "ix_food_entries_user_id_date" in index_names
+        with engine.begin() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM food_entries")).scalar() == 1
+            # The new rollup is filled from existing rows and kept up to date
+            assert conn.execute(text("SELECT calories, entry_count FROM daily_totals")).one() == (95, 1)
+            conn.execute(text("INSERT INTO foods (name, normalized_name) VALUES ('Pear', 'pear')"))
+            conn.execute(text(
+                "INSERT INTO food_entries (user_id, food_id, calories, date) "
+                "SELECT 1, id, 5, '2024-01-01' FROM foods WHERE normalized_name = 'pear'"
+            ))
+            assert conn.execute(text("SELECT calories, entry_count FROM daily_totals")).one() == (100, 2)
+
+        # Running the upgrade again is a no-op
+        assert upgrade_schema(engine) == []
+        engine.dispose()
+
+    def test_upgrade_builds_food_search_index(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}", echo=False)
+        upgrade_schema(engine)
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO foods (name, normalized_name) VALUES ('Oatmeal', 'oatmeal')"))
+            # A database from before the search index existed
+            conn.execute(text("DROP TABLE foods_fts"))
+
+        assert upgrade_schema(engine) == ["foods_fts"]
+        with Session(engine) as db:
+            assert [food.name for food in search_foods(db, "oat")] == ["Oatmeal"]
+        engine.dispose()
+
+    def test_upgrade_adds_autoincrement(self, tmp_path):
+        """Test tables from before AUTOINCREMENT are rebuilt so ids are not reused."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'ids.db'}", echo=False)
+        upgrade_schema(engine)
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO users (id, name) VALUES (1, 'legacy')"))
+            conn.execute(text("INSERT INTO foods (id, name, normalized_name) VALUES (1, 'Apple', 'apple')"))
+            for table in ("food_entries", "goals"):
+                # As the tables were created before AUTOINCREMENT was declared
+                conn.execute(text(f"DROP TABLE {table}"))
+            conn.execute(text(
+                "CREATE TABLE food_entries (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES users (id), "
+                "food_id INTEGER NOT NULL REFERENCES foods (id), calories INTEGER NOT NULL, date DATE NOT NULL)"
+            ))
+            conn.execute(text(
+                "CREATE TABLE goals (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES users (id), "
+                "daily INTEGER NOT NULL, weekly INTEGER NOT NULL)"
+            ))
+            conn.execute(text("INSERT INTO food_entries (id, user_id, food_id, calories, date) VALUES (1, 1, 1, 95, '2024-01-01'), (2, 1, 1, 90, '2024-01-01')"))
+            conn.execute(text("INSERT INTO goals (id, user_id, daily, weekly) VALUES (7, 1, 2000, 14000)"))
+            conn.execute(text("DELETE FROM daily_totals"))
+            conn.execute(text("INSERT INTO daily_totals (user_id, date, calories, entry_count) VALUES (1, '2024-01-01', 185, 2)"))
+
+        created = upgrade_schema(engine)
+
+        assert {"food_entries", "goals"} <= set(created)
+        assert "ix_food_entries_food_id_date" in {index["name"] for index in inspect(engine).get_indexes("food_entries")}
+        with engine.begin() as conn:
+            assert conn.execute(text("SELECT id FROM goals")).scalars().all() == [7]
+            conn.execute(text("DELETE FROM food_entries WHERE id = 2"))
+            conn.execute(text("INSERT INTO food_entries (user_id, food_id, calories, date) VALUES (1, 1, 50, '2024-01-01')"))
+            assert conn.execute(text("SELECT MAX(id) FROM food_entries")).scalar() == 3
+            # The rollup triggers survive the rebuild
+            assert conn.execute(text("SELECT calories, entry_count FROM daily_totals")).one() == (145, 2)
+
+        assert upgrade_schema(engine) == []
+        engine.dispose()
+
+    def test_upgrade_moves_food_names_into_catalog(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'names.db'}", echo=False)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL UNIQUE)"))
+            conn.execute(text(
+                "CREATE TABLE food_entries (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+                "food VARCHAR NOT NULL, calories INTEGER NOT NULL, date DATE NOT NULL)"
+            ))
+            conn.execute(text("INSERT INTO users (id, name) VALUES (1, 'legacy')"))
+            conn.execute(text(
+                "INSERT INTO food_entries (id, user_id, food, calories, date) VALUES "
+                "(1, 1, 'Chicken breast', 160, '2024-01-01'), (2, 1, 'chicken  Breast', 170, '2024-01-01'), "
+                "(3, 1, 'Rice', 200, '2024-01-02'), (4, 1, 'CHICKEN BREAST', 180, '2024-01-02')"
+            ))
+
+        created = upgrade_schema(engine)
+
+        assert "foods" in created
+        with engine.begin() as conn:
+            assert conn.execute(text("SELECT name, default_calories FROM foods ORDER BY id")).all() == [
+                ("Chicken breast", 170), ("Rice", 200)
+            ]
+            assert conn.execute(text(
+                "SELECT e.id, f.name FROM food_entries e JOIN foods f ON f.id = e.food_id ORDER BY e.id"
+            )).all() == [(1, "Chicken breast"), (2, "Chicken breast"), (3, "Rice"), (4, "Chicken breast")]
+            columns = {column["name"] for column in inspect(conn).get_columns("food_entries")}
+            assert "food" not in columns
+            # The rollup triggers survive the table rebuild
+            conn.execute(text("INSERT INTO food_entries (user_id, food_id, calories, date) VALUES (1, 2, 50, '2024-01-02')"))
+            assert conn.execute(text("SELECT calories FROM daily_totals WHERE date = '2024-01-02'")).scalar() == 430
+        with Session(engine) as db:
+            assert check_daily_totals(db) == []
+
+        assert upgrade_schema(engine) == []
+        engine.dispose()
@@ -0,0 +1,118 @@
+"""
+Tests for the query instrumentation and the slow-query log.
+"""
+import json
+import logging
+import pytest
+from dataclasses import replace
+from datetime import date
+from sqlalchemy import text
+from myapp.db.config import PROFILES, load_config
+from myapp.db.database import create_engine_from_config
+from myapp.db.instrumentation import SLOW_QUERY_LOGGER, QueryInstrumentation
+from myapp.controllers.food_entry_controller import create_food_entry, get_food_entries_by_user
+
+
+@pytest.mark.integration
+class TestQueryInstrumentation:
+    """Test cases for recording statements issued on an engine."""
+
+    def test_records_caller_latency_and_rows(self, test_db, sample_user):
+        user_id = sample_user.id
+        instrumentation = QueryInstrumentation().install(test_db.get_bind())
+        try:
+            create_food_entry(test_db, user_id, "Apple", 95, date(2024, 1, 1))
+            get_food_entries_by_user(test_db, user_id)
+        finally:
+            instrumentation.remove()
+
+        inserts = [query for query in instrumentation.records if query.statement.startswith("INSERT INTO food_entries")]
+        assert len(inserts) == 1
+        assert inserts[0].rowcount == 1
+        assert inserts[0].caller == "food_entry_controller.create_food_entry"
+        assert inserts[0].duration > 0
+        assert {query.caller for query in instrumentation.records} == {
+            "food_entry_controller.create_food_entry", "food_entry_controller.get_food_entries_by_user"
+        }
+
+    def test_counts_rows_returned_by_selects(self, test_db, sample_user):
+        user_id = sample_user.id
+        for day in (1, 2):
+            create_food_entry(test_db, user_id, "Apple", 95, date(2024, 1, day))
+        instrumentation = QueryInstrumentation().install(test_db.get_bind())
+        try:
+            entries = get_food_entries_by_user(test_db, user_id)
+        finally:
+            instrumentation.remove()
+
+        assert len(entries) == 2
+        assert [query.rowcount for query in instrumentation.records] == [2]
+        assert instrumentation.summary()[0]["rows"] == 2
+        assert " 2  food_entry_controller.get_food_entries_by_user" in instrumentation.format_summary()
+
+    def test_summary_groups_statements(self, test_db, sample_user):
+        user_id = sample_user.id
+        instrumentation = QueryInstrumentation().install(test_db.get_bind())
+        try:
+            for _ in range(3):
+                get_food_entries_by_user(test_db, user_id)
+        finally:
+            instrumentation.remove()
+
+        summary = instrumentation.summary()
+        assert len(summary) == 1
+        assert summary[0]["calls"] == 3
+        assert summary[0]["caller"] == "food_entry_controller.get_food_entries_by_user"
+        assert "3 statements" in instrumentation.format_summary()
+
+    def test_remove_stops_recording(self, test_db):
+        instrumentation = QueryInstrumentation().install(test_db.get_bind())
+        instrumentation.remove()
+
+        test_db.execute(text("SELECT 1"))
+
+        assert instrumentation.records == []
+
+    def test_slow_statements_are_logged(self, test_db, caplog):
+        instrumentation = QueryInstrumentation(record=False, slow_threshold_ms=0).install(test_db.get_bind())
+        try:
+            with caplog.at_level(logging.WARNING, logger=SLOW_QUERY_LOGGER):
+                test_db.execute(text("SELECT   1"))
+        finally:
+            instrumentation.remove()
+
+        entry = json.loads(caplog.records[-1].getMessage())
+        assert entry["event"] == "slow_query"
+        assert entry["statement"] == "SELECT 1"
+        assert entry["duration_ms"] >= 0
+        assert instrumentation.records == []
+
+
+@pytest.mark.integration
+class TestSlowQueryConfig:
+    """Test cases for enabling the slow-query log from the configuration."""
+
+    def test_env_overrides(self):
+        config = load_config({"HEALTH_TRACKER_SLOW_QUERY_MS": "50", "HEALTH_TRACKER_SLOW_QUERY_LOG": "slow.log"})
+        assert config.slow_query_ms == 50.0
+        assert config.slow_query_log == "slow.log"
+        assert "slow_query_ms" not in config.engine_kwargs()
+
+    def test_engine_writes_slow_query_log(self, tmp_path):
+        log_path = tmp_path / "slow.log"
+        config = replace(
+            PROFILES["prod"], url=f"sqlite:///{tmp_path / 'slow.db'}", slow_query_ms=0, slow_query_log=str(log_path)
+        )
+        logger = logging.getLogger(SLOW_QUERY_LOGGER)
+        engine = create_engine_from_config(config)
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        finally:
+            engine.dispose()
+            for handler in list(logger.handlers):
+                handler.close()
+                logger.removeHandler(handler)
+
+        statements = [json.loads(line)["statement"] for line in log_path.read_text().splitlines()]
+        assert "SELECT 1" in statements
@@ -0,0 +1,243 @@
+"""
+Tests for the thread-scoped session provider, lock retries and concurrent use.
+"""
+import random
+import sqlite3
+import threading
+import pytest
+from dataclasses import replace
+from datetime import date, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from myapp.controllers.food_entry_controller import create_food_entry, get_food_entries_by_user
+from myapp.controllers.goal_controller import create_goal
+from myapp.controllers.report_controller import generate_user_report, top_foods
+from myapp.controllers.user_controller import create_user
+from myapp.db import database
+from myapp.db.config import PROFILES, load_config
+from myapp.db.database import SessionLocal, create_engine_from_config
+from myapp.db.db import UNIT_OF_WORK, is_lock_error, run_with_retry, session_scope
+from myapp.db.migrations import upgrade_schema
+from myapp.models.daily_total import DailyTotal
+from myapp.models.food_entry import FoodEntry
+
+THREADS = 32
+OPERATIONS = 40
+
+
+@pytest.fixture
+def threaded_db(tmp_path, monkeypatch):
+    """Point the session provider at a fresh file database with the prod profile."""
+    engine = create_engine_from_config(replace(PROFILES["prod"], url=f"sqlite:///{tmp_path / 'threads.db'}", pool_size=8, max_overflow=8))
+    upgrade_schema(engine)
+    previous_bind = SessionLocal.kw.get("bind")
+    monkeypatch.setattr(database, "_engine", engine)
+    SessionLocal.configure(bind=engine)
+    yield engine
+    SessionLocal.configure(bind=previous_bind)
+    engine.dispose()
+
+
+def lock_error():
+    return OperationalError("INSERT INTO food_entries", {}, sqlite3.OperationalError("database is locked"))
+
+
+@pytest.mark.unit
+class TestPoolConfig:
+    """Test cases for the pool and retry settings."""
+
+    def test_pool_class_from_env(self):
+        config = load_config({"HEALTH_TRACKER_DB_POOL_CLASS": "Singleton", "HEALTH_TRACKER_DB_LOCK_RETRIES": "5"})
+
+        assert config.engine_kwargs()["poolclass"].__name__ == "SingletonThreadPool"
+        assert config.lock_retries == 5
+
+    def test_unknown_pool_class(self):
+        with pytest.raises(ValueError, match="Unknown pool class"):
+            load_config({"HEALTH_TRACKER_DB_POOL_CLASS": "bucket"})
+
+    def test_busy_timeout_pragma(self, tmp_path):
+        engine = create_engine_from_config(replace(PROFILES["prod"], url=f"sqlite:///{tmp_path / 'busy.db'}"))
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        engine.dispose()
+
+
+@pytest.mark.integration
+class TestSessionScope:
+    """Test cases for session_scope."""
+
+    def test_nested_scopes_share_the_session(self, threaded_db):
+        with session_scope() as outer:
+            with session_scope() as inner:
+                assert inner is outer
+            # The inner scope must not close the outer one's session
+            assert outer.is_active
+        with session_scope() as later:
+            assert later is not outer
+
+    def test_threads_get_their_own_session(self, threaded_db):
+        sessions = []
+        barrier = threading.Barrier(2)
+
+        def work():
+            with session_scope() as db:
+                sessions.append(db)
+                barrier.wait()
+
+        threads = [threading.Thread(target=work) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sessions[0] is not sessions[1]
+
+    def test_unit_of_work_rolls_back(self, threaded_db):
+        with session_scope() as db:
+            user = create_user(db, "rollback")
+            user_id = user.id
+
+        with pytest.raises(RuntimeError):
+            with session_scope(unit_of_work=True) as db:
+                create_food_entry(db, user_id, "Apple", 95, date(2024, 1, 1))
+                with session_scope(unit_of_work=True) as nested:
+                    # Joins the outer unit of work rather than committing
+                    assert nested.info[UNIT_OF_WORK] is True
+                    create_food_entry(nested, user_id, "Pear", 80, date(2024, 1, 1))
+                raise RuntimeError("abort")
+
+        with session_scope() as db:
+            assert get_food_entries_by_user(db, user_id) == []
+
+
+@pytest.mark.integration
+class TestRunWithRetry:
+    """Test cases for re-running a unit of work on lock errors."""
+
+    def test_retries_lock_errors(self, threaded_db):
+        attempts = []
+
+        def work(db):
+            attempts.append(db)
+            if len(attempts) < 3:
+                raise lock_error()
+            return "done"
+
+        assert run_with_retry(work, retries=3, backoff=0) == "done"
+        assert len(attempts) == 3
+
+    def test_gives_up_after_retries(self, threaded_db):
+        attempts = []
+
+        def work(db):
+            attempts.append(db)
+            raise lock_error()
+
+        with pytest.raises(OperationalError) as excinfo:
+            run_with_retry(work, retries=2, backoff=0)
+        assert is_lock_error(excinfo.value)
+        assert len(attempts) == 3
+
+    def test_other_errors_are_not_retried(self, threaded_db):
+        attempts = []
+
+        def work(db):
+            attempts.append(db)
+            raise OperationalError("SELECT", {}, sqlite3.OperationalError("no such table: x"))
+
+        with pytest.raises(OperationalError):
+            run_with_retry(work, retries=3, backoff=0)
+        assert len(attempts) == 1
+
+    def test_not_retried_inside_unit_of_work(self, threaded_db):
+        attempts = []
+
+        def work(db):
+            attempts.append(db)
+            raise lock_error()
+
+        with pytest.raises(OperationalError):
+            with session_scope(unit_of_work=True):
+                run_with_retry(work, retries=3, backoff=0)
+        assert len(attempts) == 1
+
+    def test_waits_out_a_held_write_lock(self, threaded_db, tmp_path):
+        """Test a write that outlasts busy_timeout succeeds once the lock is released."""
+        with session_scope() as db:
+            user_id = create_user(db, "locked").id
+        holder = sqlite3.connect(tmp_path / "threads.db", isolation_level=None, check_same_thread=False)
+        holder.execute("BEGIN IMMEDIATE")
+        release = threading.Timer(0.3, holder.execute, args=("COMMIT",))
+        release.start()
+        attempts = []
+
+        def work(db):
+            attempts.append(db)
+            # Give up on the lock quickly so the retries, not the wait, get past it
+            db.connection().exec_driver_sql("PRAGMA busy_timeout = 20")
+            return create_food_entry(db, user_id, "Apple", 95, date(2024, 1, 1)).id
+
+        try:
+            entry_id = run_with_retry(work, retries=20, backoff=0.02)
+        finally:
+            release.join()
+            holder.close()
+
+        assert entry_id is not None
+        assert len(attempts) > 1
+
+
+@pytest.mark.integration
+class TestConcurrentUse:
+    """Stress test: many threads reading and writing through the provider."""
+
+    def test_mixed_reads_and_writes(self, threaded_db):
+        with session_scope(unit_of_work=True) as db:
+            user_ids = [create_user(db, f"worker_{i}").id for i in range(8)]
+
+        start = date(2024, 1, 1)
+        barrier = threading.Barrier(THREADS)
+        errors = []
+        written = [0] * THREADS
+
+        def worker(index: int):
+            rng = random.Random(index)
+            try:
+                barrier.wait()
+                for _ in range(OPERATIONS):
+                    user_id = rng.choice(user_ids)
+                    day = start + timedelta(days=rng.randrange(14))
+                    action = rng.random()
+                    if action < 0.45:
+                        calories = rng.randint(50, 900)
+                        run_with_retry(lambda db: create_food_entry(db, user_id, f"Food {rng.randrange(20)}", calories, day))
+                        written[index] += 1
+                    elif action < 0.5:
+                        run_with_retry(lambda db: create_goal(db, user_id, 2000, 14000))
+                    elif action < 0.75:
+                        with session_scope() as db:
+                            generate_user_report(db, user_id, start, start + timedelta(days=13))
+                    elif action < 0.9:
+                        with session_scope() as db:
+                            get_food_entries_by_user(db, user_id, limit=50)
+                    else:
+                        with session_scope() as db:
+                            top_foods(db, start, start + timedelta(days=13), limit=5)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        with session_scope() as db:
+            assert db.scalar(select(func.count(FoodEntry.id))) == sum(written)
+            # The rollup triggers kept up with every concurrent insert
+            assert db.scalar(select(func.sum(DailyTotal.entry_count))) == sum(written)
+            assert db.scalar(select(func.sum(DailyTotal.calories))) == db.scalar(select(func.sum(FoodEntry.calories)))
+        # Every thread gave its connection back
+        assert threaded_db.pool.checkedout() == 0